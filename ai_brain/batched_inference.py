@@ -0,0 +1,111 @@
+"""
+Batched Inference
+One forward pass per piece type for every piece brain of a turn
+
+PieceBrain used to encode the board and run its own network for each
+piece, so a turn cost up to 16 encodings and 16 forward passes.
+BatchedInference encodes the position once into the NN_INPUT_SIZE (768)
+one-hot features, groups the pieces by type and runs each NN_CONFIGS
+network once for its whole group. The networks score the 64 destination
+squares; each piece's row is masked to its own legal destinations and
+normalised into move probabilities, with the best probability as its
+confidence.
+
+Positions are encoded from the mover's side: for black, colors are
+swapped and the board is mirrored vertically, so one network per piece
+type serves both colors. Boards with an attached FeatureEncoder are not
+re-encoded at all. Networks come from the shared ModelRegistry.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import torch
+
+import config
+from ai_brain.model_registry import ModelRegistry, get_registry
+from chess_engine.encoder import FeatureEncoder
+
+Square = Tuple[int, int]
+
+
+def encode_position(board, color: str = 'white') -> torch.Tensor:
+    """
+    768 one-hot features of board from color's side (see chess_engine.encoder)
+
+    Boards with an attached FeatureEncoder return a zero-copy view of its
+    live buffer; others are encoded from scratch.
+    """
+    encoder = board.encoder or FeatureEncoder(board)
+    return encoder.tensor(color)
+
+
+class BatchedInference:
+    """Move probabilities for a turn's pieces, one forward pass per piece type"""
+
+    def __init__(self, registry: Optional[ModelRegistry] = None):
+        self.registry = registry or get_registry()
+        self.forward_passes = 0
+
+    def infer(self, board, pieces) -> Dict[Square, Dict]:
+        """
+        Move suggestion for each of pieces (all one color), keyed by (row, col)
+
+        Each value has the PieceBrain.suggest_move keys ('from', 'to',
+        'confidence', 'reasoning') plus 'probabilities', a dict of legal
+        destination -> probability. Pieces without legal moves or a
+        network for their type are left out.
+        """
+        if not pieces:
+            return {}
+        color = pieces[0].color
+        flip = 56 if color == 'black' else 0
+        legal = board.get_legal_moves(color)
+
+        groups: Dict[str, List] = {}
+        for piece in pieces:
+            if piece.piece_type in config.NN_CONFIGS and legal.mask_for(piece.row * 8 + piece.col):
+                groups.setdefault(piece.piece_type, []).append(piece)
+        if not groups:
+            return {}
+
+        features = encode_position(board, color).unsqueeze(0)
+        # Network output i scores board square i ^ flip
+        order = [i ^ flip for i in range(64)]
+        suggestions = {}
+        with torch.no_grad():
+            for piece_type, group in groups.items():
+                # Looked up per call so swapped checkpoints take effect next turn
+                logits = self.registry.get(piece_type)(features)[:, order]
+                self.forward_passes += 1
+
+                masks = torch.zeros((len(group), 64), dtype=torch.bool)
+                for row, piece in enumerate(group):
+                    bits = legal.mask_for(piece.row * 8 + piece.col)
+                    while bits:
+                        low = bits & -bits
+                        masks[row, low.bit_length() - 1] = True
+                        bits ^= low
+                probs = logits.expand(len(group), -1).masked_fill(~masks, float('-inf')).softmax(dim=1)
+
+                for row, piece in enumerate(group):
+                    confidence, best = probs[row].max(dim=0)
+                    squares = masks[row].nonzero().flatten().tolist()
+                    suggestions[(piece.row, piece.col)] = {
+                        'from': (piece.row, piece.col),
+                        'to': divmod(int(best), 8),
+                        'confidence': float(confidence),
+                        'probabilities': {divmod(sq, 8): float(probs[row, sq]) for sq in squares},
+                        'reasoning': f"{piece_type} network: {float(confidence):.0%} on its best move"
+                    }
+        return suggestions
+
+
+_shared: Optional[BatchedInference] = None
+
+
+def get_inference() -> BatchedInference:
+    """Process-wide BatchedInference over the shared ModelRegistry"""
+    global _shared
+    if _shared is None:
+        _shared = BatchedInference()
+    return _shared
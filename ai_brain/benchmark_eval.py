@@ -0,0 +1,117 @@
+"""
+Evaluation Benchmark
+Evaluations per second: handcrafted evaluators versus NNUE
+
+Every evaluator scores the same workload, shaped like a search: from
+each sampled position, make every legal move, evaluate, unmake, with
+the cost of a bare make/unmake subtracted. The handcrafted entries are
+MoveEvaluator.evaluate_board (the full positional evaluation, with its
+term caches cleared first) and MoveEvaluator.evaluate_static (the
+search-leaf evaluation). NNUE is
+timed twice: with its accumulator updated incrementally by make/unmake,
+and with every evaluation forced to rebuild the accumulators from
+scratch, which is roughly what a non-incremental network would cost.
+
+Usage:
+    python -m ai_brain.benchmark_eval                  # 50 sampled positions
+    python -m ai_brain.benchmark_eval --positions 200
+    python -m ai_brain.benchmark_eval --weights path/to/nnue.npz
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable, List
+
+import config
+from ai_brain.move_evaluator import MoveEvaluator
+from ai_brain.nnue import NNUEEvaluator, NNUENetwork
+from chess_engine.board import Board
+from chess_engine.perft import STANDARD_POSITIONS
+
+
+def sample_fens(count: int, seed: int = 0) -> List[str]:
+    """FENs reached by random play from the standard positions"""
+    rng = random.Random(seed)
+    board = Board()
+    fens = []
+    while len(fens) < count:
+        board.load_fen(rng.choice(STANDARD_POSITIONS)[1])
+        for _ in range(rng.randrange(0, 40)):
+            codes = board.get_legal_move_codes(board.side_to_move)
+            if not codes:
+                break
+            board.make_move(rng.choice(codes))
+        if board.get_legal_move_codes(board.side_to_move):
+            fens.append(board.to_fen())
+    return fens
+
+
+def _run(fens: List[str], evaluate: Callable, setup: Callable = None):
+    """(children evaluated, seconds) for make / evaluate / unmake over every child of fens"""
+    board = Board()
+    if setup is not None:
+        setup(board)
+    count = 0
+    start = time.perf_counter()
+    for fen in fens:
+        board.load_fen(fen)
+        for code in board.get_legal_move_codes(board.side_to_move):
+            undo = board.make_move(code)
+            evaluate(board)
+            board.unmake_move(undo)
+            count += 1
+    return count, time.perf_counter() - start
+
+
+def measure(fens: List[str], evaluate: Callable, setup: Callable = None) -> float:
+    """
+    Evaluations per second of evaluate(board) over every child of fens
+
+    The make/unmake time of a bare board is subtracted, so incremental
+    updates done inside make/unmake count towards the evaluator.
+    """
+    _, baseline = _run(fens, lambda board: None)
+    count, elapsed = _run(fens, evaluate, setup)
+    elapsed -= baseline
+    return count / elapsed if elapsed > 0 else 0.0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluations per second of the betaBot evaluators")
+    parser.add_argument('--positions', type=int, default=50, help="sampled positions (default 50)")
+    parser.add_argument('--weights', help="NNUE .npz weights (default config.NNUE_FILE or bootstrap)")
+    args = parser.parse_args(argv)
+
+    # Time the handcrafted terms even if NNUE is the configured evaluator
+    config.EVALUATOR = 'handcrafted'
+    fens = sample_fens(args.positions)
+    nnue = NNUEEvaluator(NNUENetwork.load(args.weights))
+
+    def handcrafted(board):
+        return MoveEvaluator.evaluate_board(board, board.side_to_move)
+
+    def clear_caches(board):
+        for cache in (MoveEvaluator.pawn_cache, MoveEvaluator.king_cache, MoveEvaluator.activity_cache):
+            cache.clear()
+
+    def nnue_refresh(board):
+        nnue.accumulator(board).clear()
+        return nnue.evaluate(board)
+
+    # The NNUE setup attaches the accumulator, so make/unmake keep it current
+    rows = [
+        ('evaluate_board', measure(fens, handcrafted, clear_caches)),
+        ('evaluate_static', measure(fens, MoveEvaluator.evaluate_static)),
+        ('nnue incremental', measure(fens, nnue.evaluate, nnue.accumulator)),
+        ('nnue refresh', measure(fens, nnue_refresh, nnue.accumulator)),
+    ]
+    print(f"{'evaluator':<18}{'evals/s':>12}")
+    for name, rate in rows:
+        print(f"{name:<18}{rate:>12,.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Inference Benchmark
+Float32 versus int8 dynamic-quantized piece models on CPU
+
+For every NN_CONFIGS piece type the same weights are frozen twice, once
+in float32 and once with int8 Linear layers (NeuralNetwork.freeze), and
+both run on positions reached by random play from the standard perft
+positions. The report gives per-call latency for a single position and
+for a batch, the speedup, and how far the int8 outputs drift: top-1
+agreement of the 64 destination scores and the mean absolute difference
+of their softmax probabilities.
+
+Usage:
+    python -m ai_brain.benchmark_inference                # all piece types
+    python -m ai_brain.benchmark_inference --positions 500 --batch 16
+    python -m ai_brain.benchmark_inference --types pawn knight
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+import torch
+
+import config
+from ai_brain.model_registry import build_model
+from chess_engine.board import Board
+from chess_engine.perft import STANDARD_POSITIONS
+
+
+def sample_positions(count: int, seed: int = 0) -> torch.Tensor:
+    """count encodings of positions reached by random play from the standard positions"""
+    rng = random.Random(seed)
+    board = Board()
+    encoder = board.attach_encoder()
+    samples = np.zeros((count, config.NN_INPUT_SIZE), dtype=np.float32)
+    for row in samples:
+        board.load_fen(rng.choice(STANDARD_POSITIONS)[1])
+        for _ in range(rng.randrange(0, 40)):
+            codes = board.get_legal_move_codes(board.side_to_move)
+            if not codes:
+                break
+            board.make_move(rng.choice(codes))
+        encoder.write_sample(row, board.side_to_move)
+    return torch.from_numpy(samples)
+
+
+def _latency(model, inputs: torch.Tensor, batch: int, repeats: int) -> float:
+    """Mean seconds per forward call over batches of inputs"""
+    batches = [inputs[i:i + batch] for i in range(0, len(inputs), batch)]
+    with torch.no_grad():
+        model(batches[0])                       # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for chunk in batches:
+                model(chunk)
+        return (time.perf_counter() - start) / (repeats * len(batches))
+
+
+def compare(piece_type: str, inputs: torch.Tensor, batch: int = 16, repeats: int = 3) -> Dict:
+    """Latency and accuracy of the int8 model against float32 for one piece type"""
+    reference = build_model(piece_type, quantize=False)
+    # Quantize a copy so both share the same (possibly untrained) weights
+    quantized = copy.deepcopy(reference).freeze(quantize=True)
+    with torch.no_grad():
+        expected = reference(inputs)
+        actual = quantized(inputs)
+
+    single_fp32 = _latency(reference, inputs, 1, repeats)
+    single_int8 = _latency(quantized, inputs, 1, repeats)
+    batch_fp32 = _latency(reference, inputs, batch, repeats)
+    batch_int8 = _latency(quantized, inputs, batch, repeats)
+    return {
+        'piece_type': piece_type,
+        'single_fp32_us': single_fp32 * 1e6,
+        'single_int8_us': single_int8 * 1e6,
+        'batch_fp32_us': batch_fp32 * 1e6,
+        'batch_int8_us': batch_int8 * 1e6,
+        'speedup': single_fp32 / single_int8 if single_int8 > 0 else 0.0,
+        'top1_agreement': (expected.argmax(dim=1) == actual.argmax(dim=1)).float().mean().item(),
+        'prob_mae': (expected.softmax(dim=1) - actual.softmax(dim=1)).abs().mean().item(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Float32 vs int8 latency and accuracy of the piece models")
+    parser.add_argument('--positions', type=int, default=200, help="positions to evaluate (default 200)")
+    parser.add_argument('--batch', type=int, default=16, help="batch size for the batched timing (default 16)")
+    parser.add_argument('--repeats', type=int, default=3, help="timing passes over the positions (default 3)")
+    parser.add_argument('--types', nargs='+', default=list(config.NN_CONFIGS), help="piece types to benchmark")
+    args = parser.parse_args(argv)
+
+    torch.set_num_threads(1)        # game servers give inference one core per game
+    inputs = sample_positions(args.positions)
+    results: List[Dict] = [compare(t, inputs, args.batch, args.repeats) for t in args.types]
+
+    print(f"{'type':<8}{'fp32 us':>10}{'int8 us':>10}{'speedup':>9}"
+          f"{f'fp32 x{args.batch}':>12}{f'int8 x{args.batch}':>12}{'top-1':>8}{'prob MAE':>10}")
+    for r in results:
+        print(f"{r['piece_type']:<8}{r['single_fp32_us']:>10.1f}{r['single_int8_us']:>10.1f}"
+              f"{r['speedup']:>8.2f}x{r['batch_fp32_us']:>12.1f}{r['batch_int8_us']:>12.1f}"
+              f"{r['top1_agreement']:>8.1%}{r['prob_mae']:>10.5f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
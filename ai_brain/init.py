@@ -1,4 +1,6 @@
 from .neural_network import NeuralNetwork
 from .piece_brain import PieceBrain
+from .batched_inference import BatchedInference
+from .model_registry import ModelRegistry
 from .decision_maker import DecisionMaker
 from .king_validator import KingValidator
\ No newline at end of file
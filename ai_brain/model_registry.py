@@ -0,0 +1,127 @@
+"""
+Model Registry
+One shared, read-only network per piece type
+
+Every PieceBrain and BatchedInference asks the registry for its piece
+type's network instead of building its own, so eight pawns of both
+colors share a single pawn network. Models are built from NN_CONFIGS on
+first use; trained weights come from MODELS_DIR/<type>_model.pth and are
+memory-mapped when the checkpoint format allows it, so the process only
+pages in the weights it touches. Shared models are frozen (eval mode,
+dropout removed, gradients off) and, with NN_QUANTIZE, int8 dynamic-
+quantized; nothing trains them in place.
+
+swap() loads a new checkpoint on a background thread and publishes it
+with a single dict assignment once it is ready: the game loop keeps using
+the old network until then and never waits for the load.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+import torch
+
+import config
+from ai_brain.neural_network import NeuralNetwork
+from utils.logger import log_info, log_warning
+
+
+def checkpoint_path(piece_type: str) -> str:
+    return os.path.join(config.MODELS_DIR, f"{piece_type}_model.pth")
+
+
+def _load_state(path: str) -> dict:
+    try:
+        return torch.load(path, map_location='cpu', weights_only=True, mmap=True)
+    except (RuntimeError, TypeError):
+        # Legacy (non-zip) checkpoints and older torch cannot be memory-mapped
+        return torch.load(path, map_location='cpu', weights_only=True)
+
+
+def build_model(piece_type: str, path: Optional[str] = None, load_weights: bool = True,
+                quantize: Optional[bool] = None) -> NeuralNetwork:
+    """
+    Frozen NN_CONFIGS network for piece_type with the weights at path
+
+    path defaults to the type's checkpoint, used if present. quantize
+    (default NN_QUANTIZE) converts the Linear layers to int8.
+    """
+    settings = config.NN_CONFIGS[piece_type]
+    model = NeuralNetwork(settings['layers'], settings['dropout'])
+    path = path or checkpoint_path(piece_type)
+    if load_weights and os.path.exists(path) and os.path.getsize(path) > 0:
+        model.load_state_dict(_load_state(path), assign=True)
+    return model.freeze(quantize=config.NN_QUANTIZE if quantize is None else quantize)
+
+
+class ModelRegistry:
+    """Lazily loaded, shared networks keyed by piece type"""
+
+    def __init__(self):
+        self._models: Dict[str, NeuralNetwork] = {}
+        self._lock = threading.Lock()
+        self.versions = {piece_type: 0 for piece_type in config.NN_CONFIGS}
+
+    def get(self, piece_type: str) -> Optional[NeuralNetwork]:
+        """Shared network for piece_type, loading it on first use (None for unknown types)"""
+        model = self._models.get(piece_type)
+        if model is not None or piece_type not in config.NN_CONFIGS:
+            return model
+        with self._lock:
+            model = self._models.get(piece_type)
+            if model is None:
+                try:
+                    model = build_model(piece_type)
+                except Exception as e:
+                    log_warning(f"Could not load {piece_type} model weights: {e}")
+                    model = build_model(piece_type, load_weights=False)
+                self._models[piece_type] = model
+        return model
+
+    def loaded(self) -> Dict[str, NeuralNetwork]:
+        """Networks loaded so far"""
+        return dict(self._models)
+
+    def swap(self, piece_type: str, path: Optional[str] = None, background: bool = True):
+        """
+        Replace piece_type's network with the checkpoint at path
+
+        With background=True the checkpoint loads on a daemon thread and
+        the thread is returned; callers keep getting the old network until
+        the new one is complete. A checkpoint that fails to load leaves
+        the old network in place.
+        """
+        def load():
+            try:
+                model = build_model(piece_type, path)
+            except Exception as e:
+                log_warning(f"Keeping current {piece_type} model, swap failed: {e}")
+                return
+            with self._lock:
+                self._models[piece_type] = model
+                self.versions[piece_type] += 1
+            log_info(f"Swapped {piece_type} model (version {self.versions[piece_type]})")
+
+        if not background:
+            load()
+            return None
+        worker = threading.Thread(target=load, daemon=True)
+        worker.start()
+        return worker
+
+    def clear(self):
+        """Drop every loaded network; the next get reloads from disk"""
+        with self._lock:
+            self._models.clear()
+
+
+_registry: Optional[ModelRegistry] = None
+
+
+def get_registry() -> ModelRegistry:
+    """Process-wide ModelRegistry"""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
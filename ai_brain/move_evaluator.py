@@ -1,14 +1,117 @@
 """
 Move Evaluator - Board Position Evaluation Utilities
 Provides evaluation functions for board positions and moves
+
+Material and the tapered piece-square tables are running totals kept by
+Board and updated on every make/unmake. The remaining terms are cached
+by what they depend on, so they are only recomputed when those pieces
+change:
+    pawn structure  both sides' pawn bitboards
+    king safety     king square, adjacent allies and opening/middlegame
+    piece activity  the full position (Zobrist key)
+
+config.EVALUATOR = 'nnue' swaps both entry points for the incrementally
+updated network of ai_brain.nnue.
 """
 
 import config
+from ai_brain.nnue import get_evaluator
+from chess_engine import bitboard as bb
+from chess_engine import psqt
+from chess_engine.attack_tables import KING_ATTACKS
+
+# Centre squares d5, e5, d4, e4 as a bitboard
+CENTER_MASK = (1 << 27) | (1 << 28) | (1 << 35) | (1 << 36)
+FILE_MASKS = [bb.FILE_A << f for f in range(8)]
+TERM_CACHE_SIZE = 4096
+
+
+class TermCache:
+    """Bounded memo of one evaluation term, keyed by the pieces it depends on"""
+
+    __slots__ = ('entries', 'hits', 'misses')
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute, *args):
+        """Cached value for key, calling compute(*args) on a miss"""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            if len(self.entries) >= TERM_CACHE_SIZE:
+                self.entries.clear()
+            value = compute(*args)
+            self.entries[key] = value
+        else:
+            self.hits += 1
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
 
 
 class MoveEvaluator:
     """Evaluates board positions and move quality"""
 
+    doubled_cache = TermCache()
+    pawn_cache = TermCache()
+    king_cache = TermCache()
+    activity_cache = TermCache()
+
+    @staticmethod
+    def evaluate_static(board) -> int:
+        """
+        Fast symmetric evaluation in centipawns, positive = good for white
+
+        Used at search leaves. Keeps the O(1) running terms (material and
+        tapered piece-square tables) plus bitboard versions of the cheap
+        positional terms below: centre occupancy (EnhancedMoveEvaluator's
+        +30), king shelter (+50 per adjacent ally, scaled by game phase
+        since shelter stops mattering once the king should centralise) and
+        doubled pawns (-50 per extra pawn, cached by pawn structure).
+        Mobility is left to the search itself.
+
+        With config.EVALUATOR = 'nnue' the NNUE network scores the
+        position instead.
+        """
+        if config.EVALUATOR == 'nnue':
+            return get_evaluator().evaluate_white(board)
+
+        score = (board.material[0] - board.material[1]) * 100
+        score += board.get_psqt_score('white') - board.get_psqt_score('black')
+
+        white_pawns = board.piece_bb[bb.PAWN]
+        black_pawns = board.piece_bb[6 + bb.PAWN]
+        score += MoveEvaluator.doubled_cache.get((white_pawns, black_pawns), MoveEvaluator._doubled_pawns,
+                                                 white_pawns, black_pawns)
+
+        phase = min(board.phase, psqt.MAX_PHASE)
+        for ci, sign in ((bb.WHITE, 1), (bb.BLACK, -1)):
+            own = board.color_bb[ci]
+            term = bb.popcount(own & CENTER_MASK) * 30
+
+            king_sq = board.king_square[ci]
+            if king_sq >= 0:
+                term += bb.popcount(KING_ATTACKS[king_sq] & own) * 50 * phase // psqt.MAX_PHASE
+
+            score += sign * term
+        return score
+
+    @staticmethod
+    def _doubled_pawns(white_pawns: int, black_pawns: int) -> int:
+        """Doubled-pawn term in centipawns, positive = good for white"""
+        score = 0
+        for pawns, sign in ((white_pawns, 1), (black_pawns, -1)):
+            for file_mask in FILE_MASKS:
+                count = bb.popcount(pawns & file_mask)
+                if count > 1:
+                    score -= sign * 50 * (count - 1)
+        return score
+
     @staticmethod
     def evaluate_board(board, color):
         """
@@ -21,15 +124,29 @@ class MoveEvaluator:
         Returns:
             float: Evaluation score (positive = good for color)
         """
+        if config.EVALUATOR == 'nnue':
+            score = get_evaluator().evaluate_white(board) / 100.0
+            return score if color == 'white' else -score
+
         score = 0.0
 
-        # Material count
+        # Material count and piece placement (running totals kept by Board)
         score += MoveEvaluator.calculate_material(board, color)
+        score += MoveEvaluator.calculate_piece_square(board, color)
+
+        # Positional factors, each recomputed only when its pieces change
+        ci = bb.COLOR_INDEX[color]
+        score += MoveEvaluator.activity_cache.get(
+            (board.zobrist_key, ci), MoveEvaluator.assess_piece_activity, board, color)
+
+        king_sq = board.king_square[ci]
+        shelter = KING_ATTACKS[king_sq] & board.color_bb[ci] if king_sq >= 0 else 0
+        score += MoveEvaluator.king_cache.get(
+            (ci, king_sq, shelter, board.move_count > 10), MoveEvaluator.assess_king_safety, board, color)
 
-        # Positional factors
-        score += MoveEvaluator.assess_piece_activity(board, color)
-        score += MoveEvaluator.assess_king_safety(board, color)
-        score += MoveEvaluator.assess_pawn_structure(board, color)
+        score += MoveEvaluator.pawn_cache.get(
+            (ci, board.piece_bb[bb.PAWN], board.piece_bb[6 + bb.PAWN]),
+            MoveEvaluator.assess_pawn_structure, board, color)
         score += MoveEvaluator.assess_center_control(board, color)
 
         return score
@@ -42,6 +159,12 @@ class MoveEvaluator:
         enemy_material = board.get_material_count(enemy_color)
         return own_material - enemy_material
 
+    @staticmethod
+    def calculate_piece_square(board, color):
+        """Tapered piece-square advantage in pawn units"""
+        enemy_color = 'black' if color == 'white' else 'white'
+        return (board.get_psqt_score(color) - board.get_psqt_score(enemy_color)) / 100.0
+
     @staticmethod
     def assess_piece_activity(board, color):
         """Assess how active pieces are"""
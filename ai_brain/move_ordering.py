@@ -0,0 +1,174 @@
+"""
+Move Ordering
+Staged, lazy move ordering for alpha-beta search
+
+Alpha-beta cuts off as soon as one move is good enough, so the earlier
+the refuting move is tried the less of the tree is searched. MoveOrdering
+hands out the legal moves of a node in stages:
+    1. hash move     best move stored for the position (TT or previous PV)
+    2. good captures MVV-LVA order, captures that do not lose material
+                     (static exchange evaluation) plus queen promotions
+    3. killers       quiet moves that cut off at the same ply elsewhere
+    4. countermove   quiet reply that last refuted the opponent's move
+    5. quiets        by butterfly history score
+    6. bad captures  captures that lose the exchange, then under-promotions
+
+The hash move is yielded before anything else is looked at, so a node
+refuted by it never touches the rest. The other moves are split into
+captures, under-promotions and quiets in one cheap pass; the exchange
+evaluation of a capture only runs when that capture's turn comes, and
+each later stage is only sorted once the earlier ones failed to cut off. The killer,
+history and countermove tables persist across the plies (and searches)
+of one searcher and are updated with record_cutoff.
+"""
+
+from typing import Iterator, List, Tuple
+
+from chess_engine.bitboard import PAWN, QUEEN, TYPE_INDEX
+from chess_engine.move import FLAG_EN_PASSANT, FLAG_PROMOTION, PROMOTION_CODES
+from chess_engine.see import SEE_VALUES, see
+
+MAX_PLY = 128
+HISTORY_MAX = 1 << 14
+
+_QUEEN_PROMOTION = PROMOTION_CODES['queen']
+
+
+class MoveOrdering:
+    """Killer, history and countermove tables plus the staged move generator"""
+
+    def __init__(self):
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        self.history = [0] * (2 * 64 * 64)      # [color][from][to]
+        self.countermoves = [0] * (64 * 64)     # [previous from][previous to]
+
+    # ==================== ORDERING ====================
+    def ordered(self, board, codes, ply: int, hash_move: int = 0,
+                prev_move: int = 0) -> Iterator[int]:
+        """Yield the packed legal moves in codes, most promising first"""
+        if hash_move and hash_move in codes:
+            yield hash_move
+
+        # One cheap pass splits the moves; SEE waits until a capture is reached
+        grid = board.grid
+        captures, bad, quiets = [], [], []
+        for code in codes:
+            if code == hash_move:
+                continue
+            to_sq = (code >> 6) & 63
+            victim = grid[to_sq >> 3][to_sq & 7]
+            flag = code >> 14
+            if victim is not None or flag == FLAG_EN_PASSANT:
+                from_sq = code & 63
+                victim_value = SEE_VALUES[TYPE_INDEX[victim.piece_type]] if victim else SEE_VALUES[PAWN]
+                attacker_value = SEE_VALUES[TYPE_INDEX[grid[from_sq >> 3][from_sq & 7].piece_type]]
+                captures.append((victim_value * 16 - attacker_value // 100,
+                                 victim_value >= attacker_value, code))
+            elif flag == FLAG_PROMOTION:
+                if (code >> 12) & 3 == _QUEEN_PROMOTION:
+                    captures.append((SEE_VALUES[QUEEN] * 16, True, code))
+                else:
+                    bad.append((-1, code))
+            else:
+                quiets.append(code)
+
+        captures.sort(reverse=True)
+        for order, winning, code in captures:
+            # Taking a cheaper piece is only good if the exchange says so
+            if winning or see(board, code) >= 0:
+                yield code
+            else:
+                bad.append((order, code))
+
+        # Killers and the countermove are only tried if still legal here
+        refutations = []
+        if ply < MAX_PLY:
+            refutations.extend(self.killers[ply])
+        if prev_move:
+            refutations.append(self.countermoves[prev_move & 0xFFF])
+        for code in refutations:
+            if code and code != hash_move and code in quiets:
+                quiets.remove(code)
+                yield code
+
+        color_base = 4096 if board.side_to_move == 'black' else 0
+        history = self.history
+        quiets.sort(key=lambda c: history[color_base + (c & 0xFFF)], reverse=True)
+        yield from quiets
+
+        bad.sort(reverse=True)
+        for _, code in bad:
+            yield code
+
+    @staticmethod
+    def captures(board, codes) -> List[Tuple[int, int]]:
+        """(victim value, code) of the captures and queen promotions in codes, MVV-LVA first"""
+        grid = board.grid
+        keyed = []
+        for code in codes:
+            to_sq = (code >> 6) & 63
+            victim = grid[to_sq >> 3][to_sq & 7]
+            flag = code >> 14
+            if flag == FLAG_PROMOTION:
+                if (code >> 12) & 3 != _QUEEN_PROMOTION:
+                    continue
+                value = SEE_VALUES[QUEEN] - SEE_VALUES[PAWN]
+                if victim is not None:
+                    value += SEE_VALUES[TYPE_INDEX[victim.piece_type]]
+            elif victim is not None:
+                value = SEE_VALUES[TYPE_INDEX[victim.piece_type]]
+            elif flag == FLAG_EN_PASSANT:
+                value = SEE_VALUES[PAWN]
+            else:
+                continue
+            from_sq = code & 63
+            attacker_value = SEE_VALUES[TYPE_INDEX[grid[from_sq >> 3][from_sq & 7].piece_type]]
+            keyed.append((value * 16 - attacker_value // 100, value, code))
+        keyed.sort(reverse=True)
+        return [(value, code) for _, value, code in keyed]
+
+    @staticmethod
+    def is_quiet(board, code: int) -> bool:
+        """True for moves that neither capture nor promote"""
+        to_sq = (code >> 6) & 63
+        return (board.grid[to_sq >> 3][to_sq & 7] is None and
+                code >> 14 not in (FLAG_PROMOTION, FLAG_EN_PASSANT))
+
+    # ==================== LEARNING ====================
+    def record_cutoff(self, color: str, code: int, depth: int, ply: int,
+                      prev_move: int = 0, tried: List[int] = ()):
+        """
+        Reward a quiet move that caused a beta cutoff
+
+        tried holds the quiet moves searched before it at this node; they
+        get the same amount taken off their history score.
+        """
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != code:
+                killers[1] = killers[0]
+                killers[0] = code
+        if prev_move:
+            self.countermoves[prev_move & 0xFFF] = code
+
+        base = 4096 if color == 'black' else 0
+        bonus = min(depth * depth, HISTORY_MAX)
+        self._update_history(base + (code & 0xFFF), bonus)
+        for other in tried:
+            self._update_history(base + (other & 0xFFF), -bonus)
+
+    def _update_history(self, index: int, bonus: int):
+        # Gravity: scores saturate towards +-HISTORY_MAX instead of growing without bound
+        value = self.history[index]
+        self.history[index] = value + bonus - value * abs(bonus) // HISTORY_MAX
+
+    def new_search(self):
+        """Forget killers and age history between searches"""
+        for killers in self.killers:
+            killers[0] = killers[1] = 0
+        self.history = [value // 2 for value in self.history]
+
+    def clear(self):
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        self.history = [0] * (2 * 64 * 64)
+        self.countermoves = [0] * (64 * 64)
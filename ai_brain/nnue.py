@@ -0,0 +1,222 @@
+"""
+NNUE Evaluator
+Efficiently updatable neural evaluation for search leaves
+
+A HalfKP-style network: the sparse first layer sees, for each side, the
+non-king pieces relative to that side's king, so every side keeps its own
+HIDDEN-wide accumulator (the first-layer output before activation). A
+move only adds and subtracts the weight rows of the two to four features
+it changes, so Board's bitboard mutators update the accumulator on
+make/unmake with a few vectorised NumPy row operations. A side's
+accumulator is rebuilt from scratch only when its king changes bucket.
+The dense head then reads both accumulators, side to move first:
+
+    features (KING_BUCKETS x 10 planes x 64) -> HIDDEN   per side, incremental
+    [stm, other] clipped ReLU               -> HEAD
+    clipped ReLU                            -> 1         centipawns
+
+Features are seen from each side with its own pieces first and, for
+black, the board mirrored vertically. Kings are not features; the king
+square only selects the bucket (home ranks or not, queen- or kingside).
+
+Trained weights are read from config.NNUE_FILE (NumPy .npz). Without one
+the network is bootstrapped so that it scores exactly material plus the
+middlegame piece-square tables (kings excluded), which keeps it a sound
+drop-in for MoveEvaluator until real weights are trained.
+"""
+
+import os
+from typing import List, Optional
+
+import numpy as np
+
+import config
+from chess_engine import psqt
+from chess_engine.bitboard import BLACK, COLOR_INDEX, KING, PIECE_TYPES, WHITE
+
+KING_BUCKETS = 4
+PLANES = 10                     # own pawn..queen, then the opponent's
+FEATURES = KING_BUCKETS * PLANES * 64
+HIDDEN = 128
+HEAD = 32
+SCALE = 10000.0                 # centipawns per output unit
+
+_WEIGHT_NAMES = ('ft_weight', 'ft_bias', 'head_weight', 'head_bias', 'out_weight', 'out_bias')
+
+
+def king_bucket(perspective: int, king_sq: int) -> int:
+    """Bucket of a side's king: (on its two home ranks) * 2 + (on the kingside)"""
+    if king_sq < 0:
+        return 0
+    if perspective == BLACK:
+        king_sq ^= 56
+    return (2 if king_sq >> 3 >= 6 else 0) + (1 if king_sq & 7 >= 4 else 0)
+
+
+def _feature_table() -> List:
+    """[perspective][bucket][piece index][square] -> feature, -1 for kings"""
+    table = np.full((2, KING_BUCKETS, 12, 64), -1, dtype=np.int64)
+    for perspective in (WHITE, BLACK):
+        flip = 56 if perspective == BLACK else 0
+        for bucket in range(KING_BUCKETS):
+            for index in range(12):
+                color, piece_type = divmod(index, 6)
+                if piece_type == KING:
+                    continue
+                plane = piece_type + (0 if color == perspective else 5)
+                for sq in range(64):
+                    table[perspective, bucket, index, sq] = (bucket * PLANES + plane) * 64 + (sq ^ flip)
+    # Nested lists: scalar lookups on the make/unmake path are faster than NumPy indexing
+    return table.tolist()
+
+
+FEATURE_TABLE = _feature_table()
+
+
+class NNUENetwork:
+    """Weights of the feature transformer and the dense head"""
+
+    def __init__(self, ft_weight, ft_bias, head_weight, head_bias, out_weight, out_bias):
+        self.ft_weight = np.ascontiguousarray(ft_weight, dtype=np.float32)     # FEATURES x HIDDEN
+        self.ft_bias = np.asarray(ft_bias, dtype=np.float32)                   # HIDDEN
+        self.head_weight = np.asarray(head_weight, dtype=np.float32)           # 2*HIDDEN x HEAD
+        self.head_bias = np.asarray(head_bias, dtype=np.float32)               # HEAD
+        self.out_weight = np.asarray(out_weight, dtype=np.float32)             # HEAD
+        self.out_bias = float(out_bias)
+
+    @classmethod
+    def bootstrap(cls) -> 'NNUENetwork':
+        """Weights that reproduce material plus middlegame piece-square tables"""
+        ft_weight = np.zeros((FEATURES, HIDDEN), dtype=np.float32)
+        ft_bias = np.zeros(HIDDEN, dtype=np.float32)
+        # Unit 0 sums the side's own pieces around 0.5, inside the clip range
+        ft_bias[0] = 0.5
+        for bucket in range(KING_BUCKETS):
+            for piece_type, name in enumerate(PIECE_TYPES[:KING]):
+                for sq in range(64):
+                    value = config.PIECE_VALUES[name] * 100 + psqt.PSQT_MG[WHITE][piece_type][sq]
+                    ft_weight[(bucket * PLANES + piece_type) * 64 + sq, 0] = value / SCALE
+
+        head_weight = np.zeros((2 * HIDDEN, HEAD), dtype=np.float32)
+        head_bias = np.zeros(HEAD, dtype=np.float32)
+        head_weight[0, 0] = 1.0                 # side to move
+        head_weight[HIDDEN, 0] = -1.0           # opponent
+        head_bias[0] = 0.5
+        out_weight = np.zeros(HEAD, dtype=np.float32)
+        out_weight[0] = SCALE
+        return cls(ft_weight, ft_bias, head_weight, head_bias, out_weight, -0.5 * SCALE)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'NNUENetwork':
+        """Weights from an .npz file (default config.NNUE_FILE), bootstrapped if it is missing"""
+        path = path or config.NNUE_FILE
+        if not os.path.exists(path):
+            return cls.bootstrap()
+        with np.load(path) as weights:
+            return cls(*(weights[name] for name in _WEIGHT_NAMES))
+
+    def save(self, path: str):
+        np.savez(path, **{name: getattr(self, name) for name in _WEIGHT_NAMES})
+
+
+class Accumulator:
+    """
+    Both sides' first-layer outputs for one board
+
+    Attached as Board.accumulator, which calls add/remove for every piece
+    placed or lifted and clear when the board is emptied.
+    """
+
+    __slots__ = ('network', 'board', 'values', 'buckets', 'valid')
+
+    def __init__(self, network: NNUENetwork, board):
+        self.network = network
+        self.board = board
+        self.values = np.zeros((2, HIDDEN), dtype=np.float32)
+        self.buckets = [0, 0]
+        self.valid = [False, False]
+
+    def refresh(self, perspective: int):
+        """Rebuild one side's accumulator from the board"""
+        bucket = king_bucket(perspective, self.board.king_square[perspective])
+        table = FEATURE_TABLE[perspective][bucket]
+        features = []
+        for index, bits in enumerate(self.board.piece_bb):
+            if index % 6 == KING:
+                continue
+            while bits:
+                low = bits & -bits
+                features.append(table[index][low.bit_length() - 1])
+                bits ^= low
+        values = self.values[perspective]
+        np.copyto(values, self.network.ft_bias)
+        if features:
+            values += self.network.ft_weight[features].sum(axis=0)
+        self.buckets[perspective] = bucket
+        self.valid[perspective] = True
+
+    def add(self, index: int, square: int):
+        if index % 6 != KING:
+            weight = self.network.ft_weight
+            values = self.values
+            values[0] += weight[FEATURE_TABLE[0][self.buckets[0]][index][square]]
+            values[1] += weight[FEATURE_TABLE[1][self.buckets[1]][index][square]]
+
+    def remove(self, index: int, square: int):
+        if index % 6 != KING:
+            weight = self.network.ft_weight
+            values = self.values
+            values[0] -= weight[FEATURE_TABLE[0][self.buckets[0]][index][square]]
+            values[1] -= weight[FEATURE_TABLE[1][self.buckets[1]][index][square]]
+
+    def clear(self):
+        self.valid[0] = self.valid[1] = False
+
+    def current(self) -> np.ndarray:
+        """Both accumulators, refreshing a side whose king left its bucket"""
+        king_square = self.board.king_square
+        for perspective in (WHITE, BLACK):
+            if (not self.valid[perspective] or
+                    king_bucket(perspective, king_square[perspective]) != self.buckets[perspective]):
+                self.refresh(perspective)
+        return self.values
+
+
+class NNUEEvaluator:
+    """Evaluates boards with an NNUENetwork, attaching an Accumulator to each"""
+
+    def __init__(self, network: Optional[NNUENetwork] = None):
+        self.network = network or NNUENetwork.load()
+
+    def accumulator(self, board) -> Accumulator:
+        accumulator = board.accumulator
+        if accumulator is None or accumulator.network is not self.network:
+            accumulator = board.accumulator = Accumulator(self.network, board)
+        return accumulator
+
+    def evaluate(self, board) -> int:
+        """Centipawns from the side to move's point of view"""
+        values = self.accumulator(board).current()
+        stm = COLOR_INDEX[board.side_to_move]
+        network = self.network
+        hidden = np.concatenate((values[stm], values[stm ^ 1]))
+        np.clip(hidden, 0.0, 1.0, out=hidden)
+        head = hidden @ network.head_weight + network.head_bias
+        np.clip(head, 0.0, 1.0, out=head)
+        return int(round(float(head @ network.out_weight) + network.out_bias))
+
+    def evaluate_white(self, board) -> int:
+        """Centipawns, positive = good for white (MoveEvaluator.evaluate_static's convention)"""
+        score = self.evaluate(board)
+        return score if board.side_to_move == 'white' else -score
+
+
+_shared: Optional[NNUEEvaluator] = None
+
+
+def get_evaluator() -> NNUEEvaluator:
+    """Process-wide NNUEEvaluator over config.NNUE_FILE"""
+    global _shared
+    if _shared is None:
+        _shared = NNUEEvaluator()
+    return _shared
@@ -0,0 +1,169 @@
+"""
+Parallel Search
+Lazy SMP: several processes search the same root and share one hash table
+
+The main search runs in the calling process; helper processes run the
+same iterative deepening on the same position, some starting one depth
+ahead so they are not in lock step. Nobody splits work explicitly: the
+helpers fill a TranspositionTable that lives in a
+multiprocessing.shared_memory block, and every process picks up the
+others' results through its own probes. The table needs no locks
+because each entry verifies itself (see ai_brain.transposition).
+
+When the main search finishes it raises a stop flag kept in the same
+block, the helpers return at their next clock check, and the answer is
+taken from the deepest completed iteration of any process.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+import config
+from ai_brain.search import AlphaBetaSearch, SearchResult
+from ai_brain.transposition import TranspositionTable, table_bytes
+from chess_engine.board import Board
+
+_FLAG_BYTES = 8
+
+
+class SharedFlag:
+    """Stop flag in a shared-memory word; quacks like a threading.Event"""
+
+    __slots__ = ('_word',)
+
+    def __init__(self, buffer, offset: int):
+        self._word = np.ndarray((1,), dtype=np.uint64, buffer=buffer, offset=offset)
+
+    def is_set(self) -> bool:
+        return bool(self._word[0])
+
+    def set(self):
+        self._word[0] = 1
+
+    def clear(self):
+        self._word[0] = 0
+
+
+class ParallelSearchResult(SearchResult):
+    """SearchResult with the per-process statistics of a parallel search"""
+
+    __slots__ = ('workers',)
+
+    def __init__(self, best: SearchResult, workers: List[Dict]):
+        super().__init__(best.best_move, best.score, best.depth, best.pv,
+                         sum(w['nodes'] for w in workers), max(w['elapsed'] for w in workers))
+        self.workers = workers          # one dict per process, main search first
+
+    def __repr__(self):
+        return super().__repr__()[:-1] + f", workers={len(self.workers)})"
+
+
+# Per-process helper state, keyed by shared block name
+_helpers = {}
+
+
+def _helper(name: str, size_mb: float):
+    state = _helpers.get(name)
+    if state is None:
+        # A new block means the previous ParallelSearch is gone
+        for old in _helpers.values():
+            old['searcher'].tt = old['searcher'].stop_signal = None
+            old['tt'] = old['flag'] = None
+            old['shm'].close()
+        _helpers.clear()
+        shm = shared_memory.SharedMemory(name=name)
+        nbytes = table_bytes(size_mb)
+        tt = TranspositionTable(size_mb, buffer=shm.buf[:nbytes])
+        flag = SharedFlag(shm.buf, nbytes)
+        state = {'shm': shm, 'tt': tt, 'flag': flag, 'board': Board(),
+                 'searcher': AlphaBetaSearch(tt=tt, stop_signal=flag)}
+        _helpers[name] = state
+    return state
+
+
+def _helper_search(index: int, name: str, size_mb: float, generation: int, fen: str,
+                   time_limit_ms: Optional[float], max_depth: Optional[int],
+                   history: List[int], start_depth: int) -> Dict:
+    state = _helper(name, size_mb)
+    state['tt'].generation = generation
+    board = state['board']
+    board.load_fen(fen)
+    result = state['searcher'].search(board, time_limit_ms, max_depth, history, start_depth)
+    return _worker_stats(index, result)
+
+
+def _worker_stats(index: int, result: SearchResult) -> Dict:
+    return {'worker': index, 'best_move': result.best_move, 'score': result.score,
+            'depth': result.depth, 'pv': list(result.pv), 'nodes': result.nodes,
+            'elapsed': result.elapsed, 'nps': result.nps}
+
+
+class ParallelSearch:
+    """Lazy SMP search over workers processes (the caller's process included)"""
+
+    def __init__(self, workers: Optional[int] = None, size_mb: Optional[float] = None):
+        self.workers = max(1, workers or config.SEARCH_WORKERS)
+        self.size_mb = config.TT_SIZE_MB if size_mb is None else size_mb
+        nbytes = table_bytes(self.size_mb)
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes + _FLAG_BYTES)
+        np.ndarray((nbytes + _FLAG_BYTES,), dtype=np.uint8, buffer=self._shm.buf).fill(0)
+        self.tt = TranspositionTable(self.size_mb, buffer=self._shm.buf[:nbytes])
+        self._flag = SharedFlag(self._shm.buf, nbytes)
+        self.searcher = AlphaBetaSearch(tt=self.tt, stop_signal=self._flag)
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers - 1)
+
+    def search(self, board, time_limit_ms: Optional[float] = None, max_depth: int = None,
+               history: Iterable[int] = ()) -> ParallelSearchResult:
+        """Same contract as AlphaBetaSearch.search, using every worker"""
+        history = list(history)
+        self._flag.clear()
+        # Helpers start from the current generation; every search (theirs
+        # included) bumps it once, so all processes store at the same one
+        generation = self.tt.generation
+
+        futures = []
+        if self._executor is not None:
+            fen = board.to_fen()
+            futures = [self._executor.submit(_helper_search, i, self._shm.name, self.size_mb,
+                                             generation, fen, time_limit_ms, max_depth,
+                                             history, 1 + i % 2)
+                       for i in range(1, self.workers)]
+
+        main = self.searcher.search(board, time_limit_ms, max_depth, history)
+        self._flag.set()
+        wait(futures)
+
+        workers = [_worker_stats(0, main)]
+        for future in futures:
+            try:
+                workers.append(future.result())
+            except Exception:
+                continue
+        best = main
+        deepest = max(workers, key=lambda w: (w['depth'], -w['worker']))
+        if deepest['depth'] > main.depth:
+            best = SearchResult(deepest['best_move'], deepest['score'], deepest['depth'],
+                                deepest['pv'], deepest['nodes'], deepest['elapsed'])
+        return ParallelSearchResult(best, workers)
+
+    def stop(self):
+        """Ask every process to return at its next clock check"""
+        self._flag.set()
+
+    def shutdown(self):
+        """Stop the helper processes and release the shared table"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._shm is not None:
+            # Views into the block must go before it can be closed
+            self.searcher.tt = self.searcher.stop_signal = None
+            self.tt = self._flag = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
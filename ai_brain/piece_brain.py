@@ -1,28 +1,20 @@
+from ai_brain.batched_inference import get_inference
+
+
 class PieceBrain:
-    def __init__(self, piece_type, iq):
+    def __init__(self, piece_type, iq, inference=None):
         self.piece_type = piece_type
         self.iq = iq
-        self.model = self._load_model()
+        # Networks are shared by every brain through the batched inference service
+        self.inference = inference or get_inference()
 
-    def _load_model(self):
-        # Load pre-trained model for this piece type
-        pass
+    @property
+    def model(self):
+        # Shared network for this piece type, loaded once per process by the
+        # registry; looked up each time so hot-swapped checkpoints are seen
+        return self.inference.registry.get(self.piece_type)
 
     def suggest_move(self, board, game_state, piece):
-        # Convert board to neural network input
-        board_tensor = self._board_to_tensor(board)
-
-        # Get move probabilities from model
-        with torch.no_grad():
-            move_probs = self.model(board_tensor)
-
-        # Select best legal move
-        legal_moves = piece.get_legal_moves(board, game_state)
-        # ... implement move selection logic
-
-        return {
-            'from': piece.get_position(),
-            'to': best_move,
-            'confidence': confidence,
-            'reasoning': self._generate_reasoning()
-        }
\ No newline at end of file
+        # Encode once and run this piece's network; callers with a whole
+        # side to move should use inference.infer(board, pieces) directly
+        return self.inference.infer(board, [piece]).get((piece.row, piece.col))
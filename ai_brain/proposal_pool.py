@@ -0,0 +1,97 @@
+"""
+Proposal Pool
+Per-piece move proposals computed in worker processes
+
+Each worker process keeps its own Board, GameState and
+SmartDecisionPipeline. A turn sends every worker the same compact
+snapshot (FEN plus move count) and a share of the moving pieces' squares;
+the worker loads the FEN, runs get_best_move_for_piece for its squares
+and sends back plain proposal dicts keyed by square. Agent state never
+crosses the process boundary: a piece's AGENTS id only means something
+in the process that created it, so the caller maps proposals back to its
+own pieces by square.
+"""
+
+import os
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+Square = Tuple[int, int]
+
+# Per-process worker state, set up by _init_worker
+_worker = {}
+
+
+def _init_worker():
+    from ai_brain.enhanced_strategy import SmartDecisionPipeline
+    from chess_engine.board import Board
+    from chess_engine.game_state import GameState
+
+    _worker['board'] = Board()
+    _worker['game_state'] = GameState()
+    _worker['pipeline'] = SmartDecisionPipeline()
+    _worker['fen'] = None
+
+
+def _propose(fen: str, move_count: int, squares: List[Square]) -> Dict[Square, dict]:
+    """Best move for the piece on each square of the snapshot"""
+    board = _worker['board']
+    if _worker['fen'] != fen:
+        board.load_fen(fen)
+        _worker['fen'] = fen
+    game_state = _worker['game_state']
+    game_state.current_player = board.side_to_move
+    game_state.move_count = move_count
+
+    proposals = {}
+    for row, col in squares:
+        piece = board.get_piece_at(row, col)
+        if piece is None:
+            continue
+        move_data = _worker['pipeline'].get_best_move_for_piece(piece, board, game_state)
+        if move_data:
+            proposals[(row, col)] = move_data
+    return proposals
+
+
+class ProposalPool:
+    """Farms SmartDecisionPipeline proposals out to a process pool"""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or config.PROPOSAL_WORKERS or os.cpu_count() or 1
+        self._executor = None
+
+    def propose(self, board, game_state, pieces, timeout: Optional[float] = None) -> Dict[Square, dict]:
+        """
+        Proposals for pieces, keyed by their (row, col)
+
+        Pieces whose worker has not answered within timeout seconds get no
+        proposal. Worker failures are raised to the caller.
+        """
+        squares = [(p.row, p.col) for p in pieces]
+        if not squares:
+            return {}
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+        fen = board.to_fen()
+        # Round-robin so each worker gets a mix of cheap and expensive pieces
+        shares = [squares[i::self.workers] for i in range(min(self.workers, len(squares)))]
+        futures = [self._executor.submit(_propose, fen, game_state.move_count, share)
+                   for share in shares]
+        done, late = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+
+        proposals = {}
+        for future in done:
+            proposals.update(future.result())
+        for future in late:
+            future.cancel()
+        return proposals
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,370 @@
+"""
+Alpha-Beta Search
+Negamax lookahead for the Queen's synthesis step
+
+Iterative deepening runs depth 1, 2, 3, ... until the time budget or the
+depth limit runs out; each finished iteration seeds the next one with its
+principal variation (searched first) and its score (the centre of the
+aspiration window). Positions are explored in place with
+Board.make_move/unmake_move. At the horizon a quiescence search plays
+out the captures that do not lose material (static exchange evaluation),
+with delta pruning, before scoring quiet positions with
+MoveEvaluator.evaluate_static. Interior results go to a
+TranspositionTable that lives as long as the searcher, so later searches
+in the same game start from what earlier ones found. Moves are tried in
+the staged order of MoveOrdering, whose killer/history/countermove tables
+learn from the cutoffs found along the way.
+"""
+
+import time
+from typing import Iterable, List, Optional
+
+import config
+from ai_brain.move_evaluator import MoveEvaluator
+from ai_brain.move_ordering import MoveOrdering
+from ai_brain.transposition import EXACT, LOWER, UPPER, TranspositionTable
+from chess_engine.attack_map import attackers_to
+from chess_engine.bitboard import COLOR_INDEX
+from chess_engine.move import move_to_san, move_to_uci
+from chess_engine.movegen import generate_legal_moves
+from chess_engine.see import see_ge
+
+MATE_SCORE = 30000
+MATE_BOUND = MATE_SCORE - 1000      # |score| above this means forced mate
+INFINITY = 32000
+
+# Nodes between two clock checks
+CHECK_INTERVAL = 1024
+
+# Quiescence: skip captures that cannot lift the score to alpha even with this spare
+DELTA_MARGIN = 200
+
+
+class SearchAborted(Exception):
+    """Raised inside the tree when the time budget runs out"""
+
+
+class SearchResult:
+    """Outcome of one search: best move, score and statistics"""
+
+    __slots__ = ('best_move', 'score', 'depth', 'pv', 'nodes', 'elapsed')
+
+    def __init__(self, best_move: int, score: int, depth: int, pv: List[int],
+                 nodes: int, elapsed: float):
+        self.best_move = best_move      # packed move (chess_engine.move), 0 if none
+        self.score = score              # centipawns from the side to move's view
+        self.depth = depth              # last fully completed iteration
+        self.pv = pv
+        self.nodes = nodes
+        self.elapsed = elapsed          # seconds
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+    @property
+    def is_mate(self) -> bool:
+        return abs(self.score) > MATE_BOUND
+
+    def pv_uci(self) -> List[str]:
+        return [move_to_uci(code) for code in self.pv]
+
+    def pv_san(self, board) -> List[str]:
+        """PV in SAN, replayed on board and taken back"""
+        sans, undos = [], []
+        for code in self.pv:
+            sans.append(move_to_san(board, code, suffix=False))
+            undos.append(board.make_move(code))
+        for undo in reversed(undos):
+            board.unmake_move(undo)
+        return sans
+
+    def __repr__(self):
+        return (f"SearchResult(move={move_to_uci(self.best_move) if self.best_move else None}, "
+                f"score={self.score}, depth={self.depth}, nodes={self.nodes}, nps={self.nps})")
+
+
+class AlphaBetaSearch:
+    """Negamax alpha-beta with iterative deepening and aspiration windows"""
+
+    def __init__(self, max_depth: int = None, aspiration_window: int = None,
+                 tt: Optional[TranspositionTable] = None, stop_signal=None):
+        self.max_depth = max_depth or config.SEARCH_MAX_DEPTH
+        self.aspiration_window = aspiration_window or config.ASPIRATION_WINDOW
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.ordering = MoveOrdering()
+        # Anything with is_set() (e.g. a multiprocessing.Event) that ends the search early
+        self.stop_signal = stop_signal
+        self.nodes = 0
+        self._start_time = 0.0
+        self._deadline = None
+        self._iteration = 0
+        self._stopped = False
+        self._path = []                 # position keys from the root to the current node
+        self._history = frozenset()     # position keys of the game so far
+        self._pv_table = []
+
+    # ==================== PUBLIC API ====================
+    def search(self, board, time_limit_ms: Optional[float] = None, max_depth: int = None,
+               history: Iterable[int] = (), start_depth: int = 1) -> SearchResult:
+        """
+        Best move for the side to move within time_limit_ms and/or max_depth
+
+        history holds position keys already played in the game; reaching
+        one of them again is scored as a draw. Iterations start at
+        start_depth (helpers of a parallel search skip ahead). The board is
+        left exactly as it was.
+        """
+        start = time.perf_counter()
+        max_depth = min(max_depth or self.max_depth, self.max_depth)
+        self._start_time = start
+        self._deadline = start + time_limit_ms / 1000.0 if time_limit_ms else None
+        self._stopped = False
+        self._history = frozenset(history)
+        self._path = []
+        self._pv_table = [[] for _ in range(max_depth + 64)]
+        self.nodes = 0
+        self.tt.new_search()
+        self.ordering.new_search()
+
+        root_moves = generate_legal_moves(board, COLOR_INDEX[board.side_to_move]).codes()
+        if not root_moves:
+            return SearchResult(0, self._terminal_score(board, 0), 0, [], 0, 0.0)
+
+        best = SearchResult(root_moves[0], 0, 0, [root_moves[0]], 0, 0.0)
+        score = 0
+        for depth in range(max(1, min(start_depth, max_depth)), max_depth + 1):
+            self._iteration = depth
+            try:
+                score = self._aspiration(board, depth, score, best.pv)
+            except SearchAborted:
+                break
+            pv = self._complete_pv(board, list(self._pv_table[0]) or [best.best_move], depth)
+            best = SearchResult(pv[0], score, depth, pv, self.nodes,
+                                time.perf_counter() - start)
+            if abs(score) > MATE_BOUND or len(root_moves) == 1:
+                break
+            if self._out_of_time(soft=True):
+                break
+
+        best.nodes = self.nodes
+        best.elapsed = time.perf_counter() - start
+        return best
+
+    def stop(self):
+        """Ask a running search to return at its next clock check"""
+        self._stopped = True
+
+    def evaluate(self, board) -> int:
+        """Static evaluation from the side to move's point of view"""
+        score = MoveEvaluator.evaluate_static(board)
+        return score if board.side_to_move == 'white' else -score
+
+    # ==================== TREE ====================
+    def _aspiration(self, board, depth: int, previous: int, pv: List[int]) -> int:
+        """Root search in a narrow window around the previous score, widening on failure"""
+        if depth < 3 or abs(previous) > MATE_BOUND:
+            return self._negamax(board, depth, -INFINITY, INFINITY, 0, pv)
+
+        window = self.aspiration_window
+        alpha, beta = previous - window, previous + window
+        while True:
+            score = self._negamax(board, depth, alpha, beta, 0, pv)
+            if score <= alpha:
+                alpha = max(-INFINITY, alpha - window)
+            elif score >= beta:
+                beta = min(INFINITY, beta + window)
+            else:
+                return score
+            window *= 2
+
+    def _negamax(self, board, depth: int, alpha: int, beta: int, ply: int,
+                 pv: List[int], prev_move: int = 0) -> int:
+        self.nodes += 1
+        # Depth 1 always completes so there is a move to return
+        if self.nodes % CHECK_INTERVAL == 0 and self._iteration > 1 and self._out_of_time():
+            raise SearchAborted()
+
+        pv_line = self._pv_table[ply]
+        pv_line.clear()
+        key = board.zobrist_key
+
+        if ply > 0:
+            # Repetition of a game or search-path position, or the 50-move rule
+            if key in self._history or key in self._path or board.halfmove_clock >= 100:
+                return 0
+            # Mate distance pruning
+            alpha = max(alpha, -MATE_SCORE + ply)
+            beta = min(beta, MATE_SCORE - ply - 1)
+            if alpha >= beta:
+                return alpha
+
+        if ply >= len(self._pv_table) - 1:
+            return self.evaluate(board)
+        if depth <= 0 and not self._in_check(board):
+            return self._quiescence(board, alpha, beta, ply)
+
+        hash_move = 0
+        entry = self.tt.probe(key)
+        if entry is not None:
+            hash_move, tt_score, tt_depth, bound = entry
+            if ply > 0 and tt_depth >= depth:
+                tt_score = _score_from_tt(tt_score, ply)
+                if (bound == EXACT or (bound == LOWER and tt_score >= beta) or
+                        (bound == UPPER and tt_score <= alpha)):
+                    return tt_score
+
+        legal = generate_legal_moves(board, COLOR_INDEX[board.side_to_move])
+        if not legal:
+            return self._terminal_score(board, ply, legal.in_check)
+        stored_depth = depth
+        if legal.in_check:
+            depth += 1                  # check extension
+
+        pv_move = pv[ply] if ply < len(pv) else 0
+        alpha_start = alpha
+        best_score = -INFINITY
+        best_move = 0
+        quiets_tried = []
+        self._path.append(key)
+        try:
+            for code in self.ordering.ordered(board, legal.codes(), ply, pv_move or hash_move,
+                                              prev_move):
+                quiet = self.ordering.is_quiet(board, code)
+                undo = board.make_move(code)
+                try:
+                    score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1,
+                                           pv if code == pv_move else (), code)
+                finally:
+                    board.unmake_move(undo)
+
+                if score > best_score:
+                    best_score = score
+                    best_move = code
+                    if score > alpha:
+                        alpha = score
+                        pv_line[:] = [code] + self._pv_table[ply + 1]
+                        if alpha >= beta:
+                            if quiet:
+                                self.ordering.record_cutoff(board.side_to_move, code, depth, ply,
+                                                            prev_move, quiets_tried)
+                            break
+                if quiet:
+                    quiets_tried.append(code)
+        finally:
+            self._path.pop()
+
+        if best_score >= beta:
+            bound = LOWER
+        elif best_score > alpha_start:
+            bound = EXACT
+        else:
+            bound = UPPER
+        self.tt.store(key, stored_depth, bound, _score_to_tt(best_score, ply), best_move)
+        return best_score
+
+    def _quiescence(self, board, alpha: int, beta: int, ply: int) -> int:
+        """Captures-only search below the horizon; all evasions when in check"""
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0 and self._iteration > 1 and self._out_of_time():
+            raise SearchAborted()
+
+        in_check = self._in_check(board)
+        if in_check:
+            best_score = -INFINITY
+        else:
+            # Stand pat: the side to move is not forced to capture
+            best_score = self.evaluate(board)
+            if best_score >= beta:
+                return best_score
+            alpha = max(alpha, best_score)
+        if ply >= len(self._pv_table) - 1:
+            return self.evaluate(board)
+
+        legal = generate_legal_moves(board, COLOR_INDEX[board.side_to_move])
+        if not legal:
+            return -MATE_SCORE + ply if in_check else best_score
+
+        if in_check:
+            moves = self.ordering.ordered(board, legal.codes(), ply)
+        else:
+            moves = []
+            for gain, code in self.ordering.captures(board, legal.codes()):
+                # Delta pruning, then drop captures that lose the exchange
+                if best_score + gain + DELTA_MARGIN <= alpha or not see_ge(board, code):
+                    continue
+                moves.append(code)
+
+        for code in moves:
+            undo = board.make_move(code)
+            try:
+                score = -self._quiescence(board, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move(undo)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def _complete_pv(self, board, pv: List[int], depth: int) -> List[int]:
+        """Extend a PV cut short by a hash hit with the table's best moves"""
+        undos = [board.make_move(code) for code in pv]
+        seen = set()
+        while len(pv) < depth:
+            key = board.zobrist_key
+            entry = self.tt.probe(key)
+            if entry is None or key in seen:
+                break
+            code = entry[0]
+            if not code or code not in generate_legal_moves(board, COLOR_INDEX[board.side_to_move]).codes():
+                break
+            seen.add(key)
+            pv.append(code)
+            undos.append(board.make_move(code))
+        for undo in reversed(undos):
+            board.unmake_move(undo)
+        return pv
+
+    @staticmethod
+    def _in_check(board) -> bool:
+        ci = COLOR_INDEX[board.side_to_move]
+        king_sq = board.king_square[ci]
+        return king_sq >= 0 and attackers_to(board.piece_bb, king_sq, board.occupied, ci ^ 1) != 0
+
+    def _terminal_score(self, board, ply: int, in_check: bool = None) -> int:
+        """Score of a position without legal moves: mated or stalemate"""
+        if in_check is None:
+            in_check = self._in_check(board)
+        return -MATE_SCORE + ply if in_check else 0
+
+    def _out_of_time(self, soft: bool = False) -> bool:
+        """Clock check; soft checks at iteration ends stop once half the budget is used"""
+        if self._stopped or (self.stop_signal is not None and self.stop_signal.is_set()):
+            return True
+        if self._deadline is None:
+            return False
+        now = time.perf_counter()
+        if soft:
+            # The next iteration usually costs more than all previous ones together
+            return now >= self._deadline - (self._deadline - self._start_time) / 2
+        return now >= self._deadline
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    """Mate scores are stored as distance from the node, not from the root"""
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
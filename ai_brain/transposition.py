@@ -0,0 +1,138 @@
+"""
+Transposition Table
+Fixed-size hash table of search results keyed by Zobrist position keys
+
+The table is two preallocated NumPy uint64 arrays sized from
+config.TT_SIZE_MB. Each bucket holds two 16-byte slots:
+    slot 0  depth-preferred: only replaced by a deeper (or equally deep)
+            result, by the same position, or once it is from an old search
+    slot 1  always-replace: takes everything slot 0 refuses
+
+An entry is its packed data word plus the position key XOR-ed with that
+word, so a slot whose two words were written by different stores never
+verifies as a hit. That makes the table safe to share between processes
+without locks: pass a shared buffer (e.g. multiprocessing.shared_memory)
+of table_bytes(size_mb) bytes and every process sees the same entries.
+
+Data word layout:
+    bits  0-15  best move (packed, see chess_engine.move)
+    bits 16-31  score + 32768
+    bits 32-39  depth
+    bits 40-41  bound (EXACT, LOWER, UPPER)
+    bits 42-47  search generation
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+import config
+
+EXACT = 1
+LOWER = 2       # fail high: score is at least this
+UPPER = 3       # fail low: score is at most this
+
+ENTRY_BYTES = 16
+SLOTS_PER_BUCKET = 2
+_SCORE_OFFSET = 1 << 15
+_GENERATION_MASK = 63
+
+
+def bucket_count_for(size_mb: float) -> int:
+    """Largest power-of-two bucket count that fits in size_mb"""
+    buckets = max(1, int(size_mb * (1 << 20)) // (ENTRY_BYTES * SLOTS_PER_BUCKET))
+    return 1 << (buckets.bit_length() - 1)
+
+
+def table_bytes(size_mb: float) -> int:
+    """Bytes of buffer a table of size_mb uses"""
+    return bucket_count_for(size_mb) * SLOTS_PER_BUCKET * ENTRY_BYTES
+
+
+class TranspositionTable:
+    """Bucketed transposition table with a fixed memory budget"""
+
+    def __init__(self, size_mb: Optional[float] = None, buffer=None):
+        self.size_mb = config.TT_SIZE_MB if size_mb is None else size_mb
+        # Power of two so a key maps to its bucket with a mask
+        self.bucket_count = bucket_count_for(self.size_mb)
+        self._mask = self.bucket_count - 1
+        slots = self.bucket_count * SLOTS_PER_BUCKET
+        if buffer is None:
+            self.keys = np.zeros(slots, dtype=np.uint64)
+            self.data = np.zeros(slots, dtype=np.uint64)
+        else:
+            # Entries live in someone else's memory, e.g. a shared-memory block
+            table = np.ndarray((2, slots), dtype=np.uint64, buffer=buffer)
+            self.keys, self.data = table[0], table[1]
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    # ==================== ACCESS ====================
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """(move, score, depth, bound) stored for key, or None"""
+        self.probes += 1
+        slot = (key & self._mask) << 1
+        for i in (slot, slot + 1):
+            data = int(self.data[i])
+            if data and int(self.keys[i]) ^ data == key:
+                self.hits += 1
+                return (data & 0xFFFF, ((data >> 16) & 0xFFFF) - _SCORE_OFFSET,
+                        (data >> 32) & 0xFF, (data >> 40) & 3)
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: int):
+        """Record a search result, following the bucket replacement policy"""
+        self.stores += 1
+        slot = (key & self._mask) << 1
+        data = (move | ((score + _SCORE_OFFSET) << 16) | (max(depth, 0) << 32) |
+                (bound << 40) | (self.generation << 42))
+
+        preferred = int(self.data[slot])
+        if (not preferred or int(self.keys[slot]) ^ preferred == key or
+                depth >= (preferred >> 32) & 0xFF or
+                (preferred >> 42) & _GENERATION_MASK != self.generation):
+            i = slot
+        else:
+            i = slot + 1
+        self.data[i] = data
+        self.keys[i] = key ^ data
+
+    # ==================== MAINTENANCE ====================
+    def new_search(self):
+        """Age existing entries so the next search may overwrite them"""
+        self.generation = (self.generation + 1) & _GENERATION_MASK
+
+    def clear(self):
+        """Drop all entries and statistics"""
+        self.keys.fill(0)
+        self.data.fill(0)
+        self.generation = 0
+        self.probes = self.hits = self.stores = 0
+
+    # ==================== STATISTICS ====================
+    @property
+    def hit_rate(self) -> float:
+        """Share of probes that found their position"""
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def fill_rate(self) -> float:
+        """Share of slots holding an entry"""
+        return int(np.count_nonzero(self.data)) / len(self.data)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'size_mb': self.size_mb,
+            'slots': len(self.data),
+            'probes': self.probes,
+            'hits': self.hits,
+            'stores': self.stores,
+            'hit_rate': self.hit_rate,
+            'fill_rate': self.fill_rate,
+        }
+
+    def __len__(self) -> int:
+        return len(self.data)
@@ -0,0 +1,147 @@
+"""
+Attack Maps
+Per-color attacked-square bitmaps computed once per position
+
+Board caches one AttackMaps per position key, so check detection, king
+threat checks and emotion threat levels all share the same computation.
+Attack maps include squares occupied by the attacker's own pieces
+(i.e. defended squares).
+
+AttackContext is one side's summary of a position for move scoring
+(checkers, check lines, attacked and defended squares), also
+cached per position by Board, so scoring every move of every piece
+reduces to mask lookups.
+"""
+
+from typing import List
+
+from chess_engine.bitboard import (
+    WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+    knight_attacks, king_attacks, pawn_attacks,
+)
+from chess_engine.attack_tables import (
+    BETWEEN, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS,
+    bishop_attacks, rook_attacks,
+)
+
+
+class AttackMaps:
+    """Attacked squares for both colors in one position"""
+
+    __slots__ = ('maps', 'piece_masks', '_counts')
+
+    def __init__(self, piece_bb: List[int], occupied: int):
+        self.maps = [0, 0]
+        # (square, attack mask) for every piece, per color
+        self.piece_masks = [[], []]
+        self._counts = [None, None]
+
+        for color in (WHITE, BLACK):
+            base = color * 6
+            masks = self.piece_masks[color]
+
+            pawns = piece_bb[base + PAWN]
+            knights = piece_bb[base + KNIGHT]
+            kings = piece_bb[base + KING]
+            attacked = (pawn_attacks(pawns, color) | knight_attacks(knights) |
+                        king_attacks(kings))
+
+            for piece_type, table in ((PAWN, PAWN_ATTACKS[color]),
+                                      (KNIGHT, KNIGHT_ATTACKS), (KING, KING_ATTACKS)):
+                bb = piece_bb[base + piece_type]
+                while bb:
+                    low = bb & -bb
+                    sq = low.bit_length() - 1
+                    masks.append((sq, table[sq]))
+                    bb ^= low
+
+            for piece_type, lookup in ((BISHOP, bishop_attacks), (ROOK, rook_attacks)):
+                bb = piece_bb[base + piece_type]
+                while bb:
+                    low = bb & -bb
+                    sq = low.bit_length() - 1
+                    mask = lookup(sq, occupied)
+                    masks.append((sq, mask))
+                    attacked |= mask
+                    bb ^= low
+
+            bb = piece_bb[base + QUEEN]
+            while bb:
+                low = bb & -bb
+                sq = low.bit_length() - 1
+                mask = bishop_attacks(sq, occupied) | rook_attacks(sq, occupied)
+                masks.append((sq, mask))
+                attacked |= mask
+                bb ^= low
+
+            self.maps[color] = attacked
+
+    def counts(self, color: int) -> List[int]:
+        """Number of pieces of color attacking each square (computed once)"""
+        counts = self._counts[color]
+        if counts is None:
+            counts = [0] * 64
+            for _, mask in self.piece_masks[color]:
+                while mask:
+                    low = mask & -mask
+                    counts[low.bit_length() - 1] += 1
+                    mask ^= low
+            self._counts[color] = counts
+        return counts
+
+
+def attackers_to(piece_bb: List[int], square: int, occupied: int, color: int) -> int:
+    """Mask of pieces of color attacking square, given the occupancy"""
+    base = color * 6
+    queens = piece_bb[base + QUEEN]
+    return ((PAWN_ATTACKS[color ^ 1][square] & piece_bb[base + PAWN]) |
+            (KNIGHT_ATTACKS[square] & piece_bb[base + KNIGHT]) |
+            (KING_ATTACKS[square] & piece_bb[base + KING]) |
+            (bishop_attacks(square, occupied) & (piece_bb[base + BISHOP] | queens)) |
+            (rook_attacks(square, occupied) & (piece_bb[base + ROOK] | queens)))
+
+
+class AttackContext:
+    """Attack and defense facts of one position from one color's side"""
+
+    __slots__ = ('color', 'king_sq', 'enemy_king_sq', 'checkers', 'check_lines',
+                 'attacked', 'defended', '_maps')
+
+    def __init__(self, maps: AttackMaps, piece_bb: List[int], occupied: int,
+                 color: int, king_square: List[int]):
+        enemy = color ^ 1
+        self.color = color
+        self.king_sq = king_square[color]           # -1 if the king is missing
+        self.enemy_king_sq = king_square[enemy]
+        self.attacked = maps.maps[enemy]            # squares the enemy attacks
+        self.defended = maps.maps[color]            # squares we attack or defend
+        self._maps = maps
+
+        self.checkers = 0
+        self.check_lines = 0                        # checkers plus squares that block them
+        if self.king_sq >= 0:
+            self.checkers = attackers_to(piece_bb, self.king_sq, occupied, enemy)
+            checkers = self.checkers
+            while checkers:
+                low = checkers & -checkers
+                self.check_lines |= low | BETWEEN[low.bit_length() - 1][self.king_sq]
+                checkers ^= low
+
+    @property
+    def in_check(self) -> bool:
+        return self.checkers != 0
+
+    @property
+    def defenders(self) -> List[int]:
+        """Number of our pieces covering each square"""
+        return self._maps.counts(self.color)
+
+    def is_attacked(self, square: int) -> bool:
+        return bool((self.attacked >> square) & 1)
+
+    def is_defended(self, square: int) -> bool:
+        return bool((self.defended >> square) & 1)
+
+    def blocks_check(self, square: int) -> bool:
+        """True if moving to square captures a checker or steps between it and the king"""
+        return bool((self.check_lines >> square) & 1)
@@ -0,0 +1,134 @@
+"""
+Precomputed Attack Tables
+Knight, king and pawn attack tables plus occupancy-indexed slider tables
+
+All tables are built once at import. Slider lookups are PEXT-style: the
+"relevant occupancy" (the blockers on a square's rays, edges excluded) is
+extracted with a single AND and used directly as the key of a per-square
+table holding every possible blocker subset. In pure Python this is a
+single dict probe, which is cheaper than the 64-bit multiply/shift of a
+classical magic index.
+"""
+
+from typing import Dict, List
+
+from chess_engine.bitboard import (
+    WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN,
+    FULL, ROOK_DIRECTIONS, BISHOP_DIRECTIONS,
+    knight_attacks, king_attacks, pawn_attacks, ray_attacks,
+)
+
+
+def _relevant_mask(square: int, directions) -> int:
+    """Squares on the rays from square whose occupancy can change attacks"""
+    row, col = square >> 3, square & 7
+    mask = 0
+    for dr, dc in directions:
+        r, c = row + dr, col + dc
+        # The last square of each ray never blocks anything behind it
+        while 0 <= r + dr < 8 and 0 <= c + dc < 8:
+            mask |= 1 << (r * 8 + c)
+            r += dr
+            c += dc
+    return mask
+
+
+def _build_slider_table(square: int, mask: int, directions) -> Dict[int, int]:
+    """Attack set for every blocker subset of mask (carry-rippler walk)"""
+    table = {}
+    subset = 0
+    while True:
+        table[subset] = ray_attacks(square, subset, directions)
+        subset = (subset - mask) & mask
+        if subset == 0:
+            break
+    return table
+
+
+# ==================== LEAPER TABLES ====================
+KNIGHT_ATTACKS: List[int] = [knight_attacks(1 << sq) for sq in range(64)]
+KING_ATTACKS: List[int] = [king_attacks(1 << sq) for sq in range(64)]
+PAWN_ATTACKS: List[List[int]] = [
+    [pawn_attacks(1 << sq, WHITE) for sq in range(64)],
+    [pawn_attacks(1 << sq, BLACK) for sq in range(64)],
+]
+
+# ==================== SLIDER TABLES ====================
+ROOK_MASKS: List[int] = [_relevant_mask(sq, ROOK_DIRECTIONS) for sq in range(64)]
+BISHOP_MASKS: List[int] = [_relevant_mask(sq, BISHOP_DIRECTIONS) for sq in range(64)]
+
+ROOK_TABLES: List[Dict[int, int]] = [
+    _build_slider_table(sq, ROOK_MASKS[sq], ROOK_DIRECTIONS) for sq in range(64)
+]
+BISHOP_TABLES: List[Dict[int, int]] = [
+    _build_slider_table(sq, BISHOP_MASKS[sq], BISHOP_DIRECTIONS) for sq in range(64)
+]
+
+# Empty-board rays, handy for pin and x-ray detection
+ROOK_RAYS: List[int] = [ROOK_TABLES[sq][0] for sq in range(64)]
+BISHOP_RAYS: List[int] = [BISHOP_TABLES[sq][0] for sq in range(64)]
+
+
+def _build_between() -> List[List[int]]:
+    """BETWEEN[a][b]: squares strictly between two aligned squares, else 0"""
+    between = [[0] * 64 for _ in range(64)]
+    for square in range(64):
+        row, col = square >> 3, square & 7
+        for dr, dc in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+            ray = 0
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                target = r * 8 + c
+                between[square][target] = ray
+                ray |= 1 << target
+                r += dr
+                c += dc
+    return between
+
+
+BETWEEN: List[List[int]] = _build_between()
+
+
+# ==================== LOOKUPS ====================
+def rook_attacks(square: int, occupied: int) -> int:
+    """Rook attacks from square given the full occupancy"""
+    return ROOK_TABLES[square][occupied & ROOK_MASKS[square]]
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    """Bishop attacks from square given the full occupancy"""
+    return BISHOP_TABLES[square][occupied & BISHOP_MASKS[square]]
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    """Queen attacks from square given the full occupancy"""
+    return (ROOK_TABLES[square][occupied & ROOK_MASKS[square]] |
+            BISHOP_TABLES[square][occupied & BISHOP_MASKS[square]])
+
+
+def piece_attacks(piece_type: int, color: int, square: int, occupied: int) -> int:
+    """Attack mask of a piece of the given type standing on square"""
+    if piece_type == PAWN:
+        return PAWN_ATTACKS[color][square]
+    if piece_type == KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    if piece_type == BISHOP:
+        return bishop_attacks(square, occupied)
+    if piece_type == ROOK:
+        return rook_attacks(square, occupied)
+    if piece_type == QUEEN:
+        return queen_attacks(square, occupied)
+    return KING_ATTACKS[square]
+
+
+def pawn_pushes(square: int, color: int, occupied: int) -> int:
+    """Single and double pawn pushes from square onto empty squares"""
+    empty = FULL ^ occupied
+    if color == WHITE:
+        single = (1 << square >> 8) & empty
+        # Double push only from the starting row (row 6 -> row 4)
+        double = (single >> 8) & empty if 48 <= square < 56 else 0
+    else:
+        single = (1 << square << 8) & empty & FULL
+        double = (single << 8) & empty if 8 <= square < 16 else 0
+    return single | double
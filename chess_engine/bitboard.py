@@ -0,0 +1,150 @@
+"""
+Bitboard Primitives
+64-bit occupancy masks and integer attack generation for the board
+
+Squares are indexed the same way as Board.grid: square = row * 8 + col,
+so bit 0 is a8, bit 7 is h8 and bit 63 is h1. "North" (towards rank 8)
+is therefore a right shift by 8.
+"""
+
+from typing import Iterator, Tuple
+
+# ==================== PIECE / COLOR INDEXING ====================
+COLORS = ('white', 'black')
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+
+WHITE = 0
+BLACK = 1
+
+COLOR_INDEX = {'white': WHITE, 'black': BLACK}
+TYPE_INDEX = {piece_type: i for i, piece_type in enumerate(PIECE_TYPES)}
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+# ==================== MASKS ====================
+FULL = 0xFFFF_FFFF_FFFF_FFFF
+EMPTY = 0
+
+FILE_A = 0x0101_0101_0101_0101
+FILE_B = FILE_A << 1
+FILE_G = FILE_A << 6
+FILE_H = FILE_A << 7
+
+NOT_A_FILE = FULL ^ FILE_A
+NOT_H_FILE = FULL ^ FILE_H
+NOT_AB_FILE = FULL ^ (FILE_A | FILE_B)
+NOT_GH_FILE = FULL ^ (FILE_G | FILE_H)
+
+RANK_8 = 0xFF          # row 0
+RANK_1 = 0xFF << 56    # row 7
+
+SQUARE_BB = [1 << sq for sq in range(64)]
+
+# ==================== CASTLING ====================
+CASTLE_WHITE_KINGSIDE = 1
+CASTLE_WHITE_QUEENSIDE = 2
+CASTLE_BLACK_KINGSIDE = 4
+CASTLE_BLACK_QUEENSIDE = 8
+CASTLE_ALL = 15
+
+# Rights that survive a move touching each square (king/rook home squares)
+CASTLING_MASK = [CASTLE_ALL] * 64
+CASTLING_MASK[0] = CASTLE_ALL ^ CASTLE_BLACK_QUEENSIDE                              # a8
+CASTLING_MASK[4] = CASTLE_ALL ^ (CASTLE_BLACK_KINGSIDE | CASTLE_BLACK_QUEENSIDE)    # e8
+CASTLING_MASK[7] = CASTLE_ALL ^ CASTLE_BLACK_KINGSIDE                               # h8
+CASTLING_MASK[56] = CASTLE_ALL ^ CASTLE_WHITE_QUEENSIDE                             # a1
+CASTLING_MASK[60] = CASTLE_ALL ^ (CASTLE_WHITE_KINGSIDE | CASTLE_WHITE_QUEENSIDE)   # e1
+CASTLING_MASK[63] = CASTLE_ALL ^ CASTLE_WHITE_KINGSIDE                              # h1
+
+
+# ==================== INDEX HELPERS ====================
+def piece_index(color: str, piece_type: str) -> int:
+    """Index (0-11) of the occupancy mask for a color/type pair"""
+    return COLOR_INDEX[color] * 6 + TYPE_INDEX[piece_type]
+
+
+def square_index(row: int, col: int) -> int:
+    """Convert (row, col) to a 0-63 square index"""
+    return row * 8 + col
+
+
+def square_coords(square: int) -> Tuple[int, int]:
+    """Convert a 0-63 square index to (row, col)"""
+    return square >> 3, square & 7
+
+
+def popcount(bb: int) -> int:
+    """Number of set bits in a mask"""
+    return bb.bit_count()
+
+
+def lsb(bb: int) -> int:
+    """Index of the lowest set bit (bb must be non-zero)"""
+    return (bb & -bb).bit_length() - 1
+
+
+def iter_squares(bb: int) -> Iterator[int]:
+    """Yield the square index of every set bit, lowest first"""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def to_coords(bb: int) -> list:
+    """Convert a mask to a list of (row, col) tuples"""
+    coords = []
+    while bb:
+        low = bb & -bb
+        sq = low.bit_length() - 1
+        coords.append((sq >> 3, sq & 7))
+        bb ^= low
+    return coords
+
+
+# ==================== SHIFT-BASED ATTACKS ====================
+def knight_attacks(bb: int) -> int:
+    """Squares attacked by every knight in bb"""
+    return (((bb << 17) & NOT_A_FILE) | ((bb << 15) & NOT_H_FILE) |
+            ((bb << 10) & NOT_AB_FILE) | ((bb << 6) & NOT_GH_FILE) |
+            ((bb >> 17) & NOT_H_FILE) | ((bb >> 15) & NOT_A_FILE) |
+            ((bb >> 10) & NOT_GH_FILE) | ((bb >> 6) & NOT_AB_FILE)) & FULL
+
+
+def king_attacks(bb: int) -> int:
+    """Squares attacked by every king in bb"""
+    sides = ((bb << 1) & NOT_A_FILE) | ((bb >> 1) & NOT_H_FILE)
+    row = bb | sides
+    return (sides | (row << 8) | (row >> 8)) & FULL
+
+
+def pawn_attacks(bb: int, color: int) -> int:
+    """Squares attacked by every pawn in bb (white moves towards row 0)"""
+    if color == WHITE:
+        return ((bb >> 9) & NOT_H_FILE) | ((bb >> 7) & NOT_A_FILE)
+    return (((bb << 7) & NOT_H_FILE) | ((bb << 9) & NOT_A_FILE)) & FULL
+
+
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def ray_attacks(square: int, occupied: int, directions) -> int:
+    """
+    Walk rays from square until the first blocker (blocker included)
+
+    Only used to build the slider tables; lookups go through
+    chess_engine.attack_tables.
+    """
+    row, col = square >> 3, square & 7
+    attacks = 0
+    for dr, dc in directions:
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            bit = 1 << (r * 8 + c)
+            attacks |= bit
+            if occupied & bit:
+                break
+            r += dr
+            c += dc
+    return attacks
@@ -4,8 +4,31 @@ Maintains the 8x8 grid and piece positions
 """
 
 import copy
+from array import array
 from typing import Optional, List, Tuple
 
+import config
+from chess_engine import bitboard as bb
+from chess_engine import attack_tables
+from chess_engine.attack_map import AttackContext, AttackMaps, attackers_to
+from chess_engine.encoder import FeatureEncoder
+from chess_engine.move import FLAG_PROMOTION, PROMOTION_PIECES, encode_move, flag_for
+from chess_engine.movegen import LegalMoves, generate_legal_moves
+from chess_engine import psqt
+from chess_engine import zobrist
+from pieces.factory import create_piece
+
+# Material value per bitboard.PIECE_TYPES index
+MATERIAL_BY_TYPE = [config.PIECE_VALUES.get(t, 0) for t in bb.PIECE_TYPES]
+
+# FEN piece letters and castling flags
+FEN_PIECE_TYPES = {'p': 'pawn', 'n': 'knight', 'b': 'bishop', 'r': 'rook', 'q': 'queen', 'k': 'king'}
+FEN_CASTLING = (('K', bb.CASTLE_WHITE_KINGSIDE), ('Q', bb.CASTLE_WHITE_QUEENSIDE),
+                ('k', bb.CASTLE_BLACK_KINGSIDE), ('q', bb.CASTLE_BLACK_QUEENSIDE))
+
+# Attack maps (and legal move sets) kept per board before the cache is flushed
+ATTACK_CACHE_SIZE = 4096
+
 
 class Board:
     """Represents an 8x8 chess board with piece management"""
@@ -15,14 +38,44 @@ class Board:
         # 8x8 grid: None for empty squares, Piece objects for occupied
         self.grid = [[None for _ in range(8)] for _ in range(8)]
 
-        # Lists to track pieces
-        self.white_pieces = []
-        self.black_pieces = []
+        # Pieces on the board per bitboard.piece_index(): square -> piece,
+        # plus a direct king-square slot per color (-1 when absent)
+        self.piece_index = [{} for _ in range(12)]
+        self.king_square = [-1, -1]
         self.captured_white = []
         self.captured_black = []
 
+        # Bitboards: one occupancy mask per (color, piece type), indexed by
+        # bitboard.piece_index(), plus per-color and all-piece masks.
+        # They mirror self.grid and are kept in sync by every mutator below.
+        self.piece_bb = [0] * 12
+        self.color_bb = [0, 0]
+        self.occupied = 0
+
+        # Running evaluation terms per color, updated with the bitboards:
+        # material in PIECE_VALUES units, piece-square sums in centipawns
+        self.material = [0, 0]
+        self.psqt_mg = [0, 0]
+        self.psqt_eg = [0, 0]
+        self.phase = 0                  # psqt.PHASE_WEIGHTS summed over the board
+
         # Board state
         self.move_count = 0
+        self.side_to_move = 'white'
+        self.castling_rights = bb.CASTLE_ALL
+        self.ep_square = None           # square index behind a double pawn push
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self._promotion_pool = {}       # (pawn, piece_type) -> promoted piece
+        self._attack_cache = {}         # zobrist_key -> AttackMaps
+        self._legal_cache = {}          # (zobrist_key, color index) -> LegalMoves
+        self._context_cache = {}        # (zobrist_key, color index) -> AttackContext
+        self.encoder = None             # FeatureEncoder kept in sync, see attach_encoder
+        self.accumulator = None         # evaluator state with add/remove/clear (ai_brain.nnue)
+
+        # Incremental Zobrist key (see chess_engine.zobrist)
+        self._ep_key = 0                # EP_FILE_KEYS entry currently mixed in, or 0
+        self.zobrist_key = zobrist.CASTLING_KEYS[self.castling_rights]
 
     def setup_initial_position(self):
         """Setup standard chess starting position"""
@@ -40,19 +93,19 @@ class Board:
         if not self.is_valid_position(row, col):
             return False
 
-        # Remove old piece from tracking if exists
+        # Remove old piece if exists
         old_piece = self.grid[row][col]
         if old_piece:
-            self._remove_from_tracking(old_piece)
+            self._clear_bits(old_piece, row * 8 + col)
 
         # Set new piece
         self.grid[row][col] = piece
 
-        # Update piece position and tracking if piece exists
+        # Update piece position and index if piece exists
         if piece:
             piece.row = row
             piece.col = col
-            self._add_to_tracking(piece)
+            self._set_bits(piece, row * 8 + col)
 
         return True
 
@@ -64,33 +117,74 @@ class Board:
             return False
 
         # Get piece to move
-        piece = self.get_piece_at(from_row, from_col)
-        if not piece:
+        if self.grid[from_row][from_col] is None:
             return False
 
-        # Handle capture
-        captured = self.get_piece_at(to_row, to_col)
-        if captured:
-            self.capture_piece(captured)
-
-        # Move piece
-        self.grid[from_row][from_col] = None
-        self.grid[to_row][to_col] = piece
-        piece.row = to_row
-        piece.col = to_col
-        piece.has_moved = True
-
-        self.move_count += 1
+        # Captures, castling, en passant and promotion are handled by _make
+        self._make(from_row * 8 + from_col, to_row * 8 + to_col, None)
         return True
 
+    def make_move(self, move) -> 'UndoInfo':
+        """
+        Play a move in place and return what is needed to take it back
+
+        Accepts a packed 16-bit move (see chess_engine.move) or a Move.
+        Handles captures, castling (king moves two files), en passant and
+        promotion (to the encoded piece, queen by default). Every call must
+        be paired with unmake_move(undo), which restores the exact previous
+        position, so search can run without cloning the board.
+        """
+        code = move if isinstance(move, int) else move.code
+        promotion = PROMOTION_PIECES[(code >> 12) & 3] if code >> 14 == FLAG_PROMOTION else None
+        return self._make(code & 63, (code >> 6) & 63, promotion)
+
+    def pack_move(self, from_row: int, from_col: int, to_row: int, to_col: int,
+                  promotion: Optional[str] = None) -> int:
+        """Packed 16-bit move for this position, with its special-move flag set"""
+        from_sq, to_sq = from_row * 8 + from_col, to_row * 8 + to_col
+        return encode_move(from_sq, to_sq, flag_for(self, from_sq, to_sq), promotion)
+
+    def unmake_move(self, undo: 'UndoInfo'):
+        """Take back the move described by undo (the result of make_move)"""
+        piece = undo.piece
+
+        if undo.promoted is not None:
+            self._remove_piece(undo.promoted, undo.to_sq)
+            self._put_piece(piece, undo.to_sq)
+
+        if undo.rook is not None:
+            self._relocate(undo.rook, undo.rook_to, undo.rook_from)
+            undo.rook.has_moved = undo.rook_had_moved
+
+        self._relocate(piece, undo.to_sq, undo.from_sq)
+        piece.has_moved = undo.had_moved
+
+        captured = undo.captured
+        if captured is not None:
+            if captured.color == 'white':
+                self.captured_white.pop()
+            else:
+                self.captured_black.pop()
+            captured.is_captured = False
+            self._put_piece(captured, undo.capture_sq)
+
+        self.castling_rights = undo.castling_rights
+        self.ep_square = undo.ep_square
+        self._ep_key = undo.ep_key
+        self.halfmove_clock = undo.halfmove_clock
+        self.fullmove_number = undo.fullmove_number
+        self.move_count = undo.move_count
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+        self.zobrist_key = undo.zobrist_key
+
     def capture_piece(self, piece: 'Piece'):
         """Remove a piece from the board (capture it)"""
         # Remove from board
         if self.grid[piece.row][piece.col] == piece:
             self.grid[piece.row][piece.col] = None
+            self._clear_bits(piece, piece.row * 8 + piece.col)
 
         # Move to captured list
-        self._remove_from_tracking(piece)
         if piece.color == 'white':
             self.captured_white.append(piece)
         else:
@@ -102,49 +196,68 @@ class Board:
         """Check if a square is empty"""
         if not self.is_valid_position(row, col):
             return False
-        return self.grid[row][col] is None
+        return not (self.occupied >> (row * 8 + col)) & 1
 
     def is_valid_position(self, row: int, col: int) -> bool:
         """Check if position is within board boundaries"""
         return 0 <= row < 8 and 0 <= col < 8
 
+    @property
+    def white_pieces(self) -> List['Piece']:
+        """White pieces on the board"""
+        return [p for index in self.piece_index[:6] for p in index.values()]
+
+    @property
+    def black_pieces(self) -> List['Piece']:
+        """Black pieces on the board"""
+        return [p for index in self.piece_index[6:] for p in index.values()]
+
     def get_piece_by_type_and_color(self, piece_type: str, color: str) -> List['Piece']:
         """Get all pieces of a specific type and color"""
-        pieces = self.white_pieces if color == 'white' else self.black_pieces
-        return [p for p in pieces if p.piece_type == piece_type]
+        return list(self.piece_index[bb.piece_index(color, piece_type)].values())
+
+    def find_piece(self, piece_type: str, color: str) -> Optional['Piece']:
+        """First piece of a type and color on the board, or None (O(1))"""
+        for piece in self.piece_index[bb.piece_index(color, piece_type)].values():
+            return piece
+        return None
 
     def get_all_pieces(self, color: Optional[str] = None) -> List['Piece']:
         """Get all pieces, optionally filtered by color"""
         if color == 'white':
-            return self.white_pieces[:]
+            return self.white_pieces
         elif color == 'black':
-            return self.black_pieces[:]
+            return self.black_pieces
         else:
-            return self.white_pieces + self.black_pieces
+            return [p for index in self.piece_index for p in index.values()]
 
     def find_king(self, color: str) -> Optional['Piece']:
-        """Find the king of specified color"""
-        kings = self.get_piece_by_type_and_color('king', color)
-        return kings[0] if kings else None
+        """Find the king of specified color (direct slot lookup)"""
+        square = self.king_square[bb.COLOR_INDEX[color]]
+        return self.grid[square >> 3][square & 7] if square >= 0 else None
 
     def get_board_state(self) -> List[List[Optional['Piece']]]:
         """Get a copy of the current board state"""
-        return copy.deepcopy(self.grid)
+        return [[p.copy() if p is not None else None for p in row] for row in self.grid]
 
     def count_pieces(self, color: Optional[str] = None) -> int:
         """Count pieces on board"""
-        if color == 'white':
-            return len(self.white_pieces)
-        elif color == 'black':
-            return len(self.black_pieces)
-        else:
-            return len(self.white_pieces) + len(self.black_pieces)
+        if color is None:
+            return bb.popcount(self.occupied)
+        return bb.popcount(self.color_bb[bb.COLOR_INDEX[color]])
 
     def get_material_count(self, color: str) -> int:
-        """Calculate total material value for a color"""
-        from config import PIECE_VALUES
-        pieces = self.white_pieces if color == 'white' else self.black_pieces
-        return sum(PIECE_VALUES.get(p.piece_type, 0) for p in pieces)
+        """Total material value for a color (running total, O(1))"""
+        return self.material[bb.COLOR_INDEX[color]]
+
+    def get_psqt_score(self, color: str) -> int:
+        """Tapered piece-square score for a color in centipawns (O(1))"""
+        ci = bb.COLOR_INDEX[color]
+        return psqt.taper(self.psqt_mg[ci], self.psqt_eg[ci], self.phase)
+
+    def get_game_phase(self) -> float:
+        """Game phase from 1.0 (all pieces on board) down to 0.0 (bare endgame)"""
+        return min(self.phase, psqt.MAX_PHASE) / psqt.MAX_PHASE
 
     def to_fen_position(self) -> str:
         """Convert board position to FEN notation (position part only)"""
@@ -167,6 +280,74 @@ class Board:
             fen_rows.append(fen_row)
         return '/'.join(fen_rows)
 
+    def load_fen(self, fen: str):
+        """
+        Replace the position with one given in Forsyth-Edwards Notation
+
+        Pieces are created with pieces.factory.create_piece. Missing trailing
+        fields default to '- - 0 1'. Raises ValueError on a malformed FEN.
+        """
+        fields = fen.split()
+        ranks = fields[0].split('/') if fields else []
+        if len(ranks) != 8:
+            raise ValueError(f"Invalid FEN (expected 8 ranks): {fen!r}")
+        fields += ['w', '-', '-', '0', '1'][len(fields) - 1:]
+
+        self.clear_board()
+        for row, rank in enumerate(ranks):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                    continue
+                piece_type = FEN_PIECE_TYPES.get(char.lower())
+                if piece_type is None or col > 7:
+                    raise ValueError(f"Invalid FEN rank {rank!r}: {fen!r}")
+                color = 'white' if char.isupper() else 'black'
+                self.set_piece_at(row, col, create_piece(piece_type, color, row, col))
+                col += 1
+            if col != 8:
+                raise ValueError(f"Invalid FEN rank {rank!r}: {fen!r}")
+
+        self.side_to_move = 'white' if fields[1] == 'w' else 'black'
+        self.castling_rights = 0
+        for char, right in FEN_CASTLING:
+            if char in fields[2]:
+                self.castling_rights |= right
+        if fields[3] != '-':
+            row, col = self.get_position_from_notation(fields[3])
+            if row < 0:
+                raise ValueError(f"Invalid FEN en-passant square: {fen!r}")
+            self.ep_square = row * 8 + col
+        self.halfmove_clock = int(fields[4])
+        self.fullmove_number = int(fields[5])
+
+        # has_moved mirrors castling rights for kings/rooks, pawns by start rank
+        for piece in self.white_pieces + self.black_pieces:
+            piece.has_moved = not self._on_home_square(piece)
+
+        mover = bb.COLOR_INDEX[self.side_to_move] ^ 1
+        self._ep_key = self._ep_key_for(self.ep_square, mover) if self.ep_square is not None else 0
+        self.zobrist_key = self.compute_zobrist_key()
+
+    def _on_home_square(self, piece: 'Piece') -> bool:
+        """Whether a piece still looks unmoved in a loaded position"""
+        square = piece.row * 8 + piece.col
+        if piece.piece_type == 'pawn':
+            return piece.row == (6 if piece.color == 'white' else 1)
+        if piece.piece_type in ('king', 'rook'):
+            # Any castling right that still involves this square
+            return (self.castling_rights & ~bb.CASTLING_MASK[square]) != 0
+        return False
+
+    def to_fen(self) -> str:
+        """Full FEN of the current position"""
+        castling = ''.join(char for char, right in FEN_CASTLING if self.castling_rights & right)
+        ep = '-' if self.ep_square is None else self.get_square_name(self.ep_square >> 3,
+                                                                     self.ep_square & 7)
+        return (f"{self.to_fen_position()} {self.side_to_move[0]} {castling or '-'} {ep} "
+                f"{self.halfmove_clock} {self.fullmove_number}")
+
     def print_board(self):
         """Print ASCII representation of the board (for debugging)"""
         print("\n  a b c d e f g h")
@@ -209,52 +390,432 @@ class Board:
     def clear_board(self):
         """Remove all pieces from the board"""
         self.grid = [[None for _ in range(8)] for _ in range(8)]
-        self.white_pieces.clear()
-        self.black_pieces.clear()
+        self.piece_index = [{} for _ in range(12)]
+        self.king_square = [-1, -1]
         self.captured_white.clear()
         self.captured_black.clear()
+        self.piece_bb = [0] * 12
+        self.color_bb = [0, 0]
+        self.occupied = 0
+        self.material = [0, 0]
+        self.psqt_mg = [0, 0]
+        self.psqt_eg = [0, 0]
+        self.phase = 0
         self.move_count = 0
+        self.side_to_move = 'white'
+        self.castling_rights = bb.CASTLE_ALL
+        self.ep_square = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self._promotion_pool.clear()
+        self._attack_cache.clear()
+        self._legal_cache.clear()
+        self._context_cache.clear()
+        if self.encoder is not None:
+            self.encoder.clear()
+        if self.accumulator is not None:
+            self.accumulator.clear()
+        self._ep_key = 0
+        self.zobrist_key = zobrist.CASTLING_KEYS[self.castling_rights]
 
     def clone(self) -> 'Board':
-        """Create a deep copy of this board"""
-        return copy.deepcopy(self)
+        """
+        Create an independent copy of this board
+
+        Pieces are copied as their slot cores and keep sharing agent state
+        with the originals, so cloning never copies IQ, personality,
+        emotion or message data. Caches start empty and no FeatureEncoder
+        or accumulator is attached.
+        """
+        copies = {}
+
+        def dup(piece):
+            twin_piece = copies.get(id(piece))
+            if twin_piece is None:
+                twin_piece = copies[id(piece)] = piece.copy()
+            return twin_piece
+
+        twin = copy.copy(self)
+        twin.grid = [[dup(p) if p is not None else None for p in row] for row in self.grid]
+        twin.piece_index = [{sq: dup(p) for sq, p in index.items()} for index in self.piece_index]
+        twin.king_square = self.king_square[:]
+        twin.captured_white = [dup(p) for p in self.captured_white]
+        twin.captured_black = [dup(p) for p in self.captured_black]
+        twin.piece_bb = self.piece_bb[:]
+        twin.color_bb = self.color_bb[:]
+        twin.material = self.material[:]
+        twin.psqt_mg = self.psqt_mg[:]
+        twin.psqt_eg = self.psqt_eg[:]
+        twin._promotion_pool = {(dup(pawn), piece_type): dup(promoted)
+                                for (pawn, piece_type), promoted in self._promotion_pool.items()}
+        twin._attack_cache = {}
+        twin._legal_cache = {}
+        twin._context_cache = {}
+        twin.encoder = twin.accumulator = None
+        return twin
+
+    # ==================== BITBOARD FAST PATH ====================
+    def is_occupied(self, row: int, col: int) -> bool:
+        """Check if a square holds any piece (integer test, no grid lookup)"""
+        return bool((self.occupied >> (row * 8 + col)) & 1)
+
+    def get_color_mask(self, color: str) -> int:
+        """Occupancy mask of all pieces of a color"""
+        return self.color_bb[bb.COLOR_INDEX[color]]
+
+    def get_piece_mask(self, piece_type: str, color: str) -> int:
+        """Occupancy mask of all pieces of a given type and color"""
+        return self.piece_bb[bb.piece_index(color, piece_type)]
+
+    def get_attack_mask(self, row: int, col: int) -> int:
+        """Mask of squares attacked by the piece on (row, col), 0 if empty"""
+        piece = self.grid[row][col]
+        if piece is None:
+            return 0
+        return attack_tables.piece_attacks(bb.TYPE_INDEX[piece.piece_type],
+                                           bb.COLOR_INDEX[piece.color],
+                                           row * 8 + col, self.occupied)
+
+    def get_move_mask(self, row: int, col: int) -> int:
+        """Pseudo-legal destination mask of the piece on (row, col), 0 if empty"""
+        piece = self.grid[row][col]
+        if piece is None:
+            return 0
+        return piece.get_move_mask(self)
+
+    # ==================== MOVE EXECUTION ====================
+    def classify_move(self, from_sq: int, to_sq: int) -> Optional[str]:
+        """Return 'castle', 'en_passant', 'promotion' or None for a move"""
+        piece = self.grid[from_sq >> 3][from_sq & 7]
+        if piece is None:
+            return None
+        if piece.piece_type == 'king':
+            if to_sq - from_sq in (2, -2):
+                return 'castle'
+        elif piece.piece_type == 'pawn':
+            if to_sq < 8 or to_sq >= 56:
+                return 'promotion'
+            if to_sq == self.ep_square and (to_sq & 7) != (from_sq & 7):
+                return 'en_passant'
+        return None
+
+    def _make(self, from_sq: int, to_sq: int, promotion: Optional[str]) -> 'UndoInfo':
+        """Core of make_move/move_piece working on square indices"""
+        piece = self.grid[from_sq >> 3][from_sq & 7]
+        special = self.classify_move(from_sq, to_sq)
+        undo = UndoInfo(self, piece, from_sq, to_sq)
+
+        # Capture (an en-passant victim sits beside the destination square)
+        capture_sq = to_sq
+        if special == 'en_passant':
+            capture_sq = (from_sq & ~7) | (to_sq & 7)
+        captured = self.grid[capture_sq >> 3][capture_sq & 7]
+        if captured is not None:
+            self.capture_piece(captured)
+            undo.captured = captured
+            undo.capture_sq = capture_sq
 
-    # Private helper methods
-    def _add_to_tracking(self, piece: 'Piece'):
-        """Add piece to appropriate tracking list"""
-        if piece.color == 'white':
-            if piece not in self.white_pieces:
-                self.white_pieces.append(piece)
-        else:
-            if piece not in self.black_pieces:
-                self.black_pieces.append(piece)
+        self._relocate(piece, from_sq, to_sq)
+        piece.has_moved = True
 
-    def _remove_from_tracking(self, piece: 'Piece'):
-        """Remove piece from tracking list"""
-        if piece.color == 'white':
-            if piece in self.white_pieces:
-                self.white_pieces.remove(piece)
-        else:
-            if piece in self.black_pieces:
-                self.black_pieces.remove(piece)
+        if special == 'castle':
+            if to_sq > from_sq:
+                rook_from, rook_to = from_sq + 3, from_sq + 1
+            else:
+                rook_from, rook_to = from_sq - 4, from_sq - 1
+            rook = self.grid[rook_from >> 3][rook_from & 7]
+            if rook is not None:
+                undo.rook = rook
+                undo.rook_from = rook_from
+                undo.rook_to = rook_to
+                undo.rook_had_moved = rook.has_moved
+                self._relocate(rook, rook_from, rook_to)
+                rook.has_moved = True
+        elif special == 'promotion':
+            promoted = self._promotion_piece(piece, promotion or 'queen')
+            promoted.has_moved = True
+            self._remove_piece(piece, to_sq)
+            self._put_piece(promoted, to_sq)
+            undo.promoted = promoted
+
+        # Castling rights, en passant and side to move (with their hash keys)
+        key = self.zobrist_key ^ self._ep_key ^ zobrist.SIDE_KEY
+        rights = self.castling_rights & bb.CASTLING_MASK[from_sq] & bb.CASTLING_MASK[to_sq]
+        key ^= zobrist.CASTLING_KEYS[self.castling_rights] ^ zobrist.CASTLING_KEYS[rights]
+        self.castling_rights = rights
+
+        self.ep_square = None
+        self._ep_key = 0
+        is_pawn = piece.piece_type == 'pawn'
+        if is_pawn and to_sq - from_sq in (16, -16):
+            self.ep_square = (from_sq + to_sq) >> 1
+            self._ep_key = self._ep_key_for(self.ep_square, bb.COLOR_INDEX[piece.color])
+            key ^= self._ep_key
+
+        # Move counters
+        self.halfmove_clock = 0 if is_pawn or captured is not None else self.halfmove_clock + 1
+        if self.side_to_move == 'black':
+            self.fullmove_number += 1
+        self.side_to_move = 'black' if self.side_to_move == 'white' else 'white'
+        self.zobrist_key = key
+        self.move_count += 1
+        return undo
+
+    def _promotion_piece(self, pawn: 'Piece', piece_type: str) -> 'Piece':
+        """Promoted piece for pawn, reused if that promotion was played before"""
+        pool_key = (pawn, piece_type)
+        promoted = self._promotion_pool.get(pool_key)
+        if promoted is None:
+            promoted = create_piece(piece_type, pawn.color, pawn.row, pawn.col)
+            self._promotion_pool[pool_key] = promoted
+        promoted.is_captured = False
+        return promoted
+
+    def _relocate(self, piece: 'Piece', from_sq: int, to_sq: int):
+        """Move a piece between two squares (destination must be empty)"""
+        self.grid[from_sq >> 3][from_sq & 7] = None
+        self.grid[to_sq >> 3][to_sq & 7] = piece
+        self._clear_bits(piece, from_sq)
+        self._set_bits(piece, to_sq)
+        piece.row = to_sq >> 3
+        piece.col = to_sq & 7
+
+    def _put_piece(self, piece: 'Piece', square: int):
+        """Place a piece on an empty square"""
+        self.grid[square >> 3][square & 7] = piece
+        piece.row = square >> 3
+        piece.col = square & 7
+        self._set_bits(piece, square)
+
+    def _remove_piece(self, piece: 'Piece', square: int):
+        """Take a piece off the board without marking it captured"""
+        self.grid[square >> 3][square & 7] = None
+        self._clear_bits(piece, square)
+
+    # ==================== ZOBRIST HASHING ====================
+    def key_after_move(self, from_row: int, from_col: int, to_row: int, to_col: int) -> int:
+        """
+        Position key that move_piece(from, to) would produce, without moving
+
+        Computed as an XOR delta on the current key, so candidate moves can
+        be checked against the repetition history in O(1). Promotions are
+        assumed to be to a queen, as in move_piece.
+        """
+        piece = self.grid[from_row][from_col]
+        if piece is None:
+            return self.zobrist_key
+
+        from_sq = from_row * 8 + from_col
+        to_sq = to_row * 8 + to_col
+        index = bb.piece_index(piece.color, piece.piece_type)
+        key = (self.zobrist_key ^ self._ep_key ^ zobrist.SIDE_KEY ^
+               zobrist.PIECE_KEYS[index][from_sq] ^ zobrist.PIECE_KEYS[index][to_sq])
+
+        special = self.classify_move(from_sq, to_sq)
+        capture_sq = to_sq
+        if special == 'en_passant':
+            capture_sq = (from_sq & ~7) | (to_sq & 7)
+        target = self.grid[capture_sq >> 3][capture_sq & 7]
+        if target is not None:
+            key ^= zobrist.PIECE_KEYS[bb.piece_index(target.color, target.piece_type)][capture_sq]
+
+        if special == 'castle':
+            rook_from, rook_to = ((from_sq + 3, from_sq + 1) if to_sq > from_sq
+                                  else (from_sq - 4, from_sq - 1))
+            rook = self.grid[rook_from >> 3][rook_from & 7]
+            if rook is not None:
+                rook_keys = zobrist.PIECE_KEYS[bb.piece_index(rook.color, rook.piece_type)]
+                key ^= rook_keys[rook_from] ^ rook_keys[rook_to]
+        elif special == 'promotion':
+            key ^= (zobrist.PIECE_KEYS[index][to_sq] ^
+                    zobrist.PIECE_KEYS[bb.piece_index(piece.color, 'queen')][to_sq])
+
+        rights = self.castling_rights & bb.CASTLING_MASK[from_sq] & bb.CASTLING_MASK[to_sq]
+        key ^= zobrist.CASTLING_KEYS[self.castling_rights] ^ zobrist.CASTLING_KEYS[rights]
+
+        if piece.piece_type == 'pawn' and abs(to_sq - from_sq) == 16:
+            key ^= self._ep_key_for((from_sq + to_sq) >> 1, bb.COLOR_INDEX[piece.color])
+        return key
+
+    def compute_zobrist_key(self) -> int:
+        """Compute the position key from scratch (for verification and resync)"""
+        key = zobrist.CASTLING_KEYS[self.castling_rights] ^ self._ep_key
+        if self.side_to_move == 'black':
+            key ^= zobrist.SIDE_KEY
+        for index, mask in enumerate(self.piece_bb):
+            keys = zobrist.PIECE_KEYS[index]
+            for square in bb.iter_squares(mask):
+                key ^= keys[square]
+        return key
+
+    def _ep_key_for(self, ep_square: int, mover: int) -> int:
+        """En-passant file key, only if an enemy pawn can actually capture"""
+        enemy_pawns = self.piece_bb[(mover ^ 1) * 6 + bb.PAWN]
+        if attack_tables.PAWN_ATTACKS[mover][ep_square] & enemy_pawns:
+            return zobrist.EP_FILE_KEYS[ep_square & 7]
+        return 0
+
+    # Private helper methods
+    def _set_bits(self, piece: 'Piece', square: int):
+        """Add a piece to the bitboards, position key and running scores"""
+        bit = 1 << square
+        ci = bb.COLOR_INDEX[piece.color]
+        ti = bb.TYPE_INDEX[piece.piece_type]
+        index = ci * 6 + ti
+        self.piece_bb[index] |= bit
+        self.piece_index[index][square] = piece
+        if ti == bb.KING:
+            self.king_square[ci] = square
+        self.color_bb[ci] |= bit
+        self.occupied |= bit
+        self.zobrist_key ^= zobrist.PIECE_KEYS[index][square]
+        self.material[ci] += MATERIAL_BY_TYPE[ti]
+        self.psqt_mg[ci] += psqt.PSQT_MG[ci][ti][square]
+        self.psqt_eg[ci] += psqt.PSQT_EG[ci][ti][square]
+        self.phase += psqt.PHASE_BY_TYPE[ti]
+        if self.encoder is not None:
+            self.encoder.add(index, square)
+        if self.accumulator is not None:
+            self.accumulator.add(index, square)
+
+    def _clear_bits(self, piece: 'Piece', square: int):
+        """Remove a piece from the bitboards, position key and running scores"""
+        mask = ~(1 << square)
+        ci = bb.COLOR_INDEX[piece.color]
+        ti = bb.TYPE_INDEX[piece.piece_type]
+        index = ci * 6 + ti
+        self.piece_bb[index] &= mask
+        pieces = self.piece_index[index]
+        pieces.pop(square, None)
+        if ti == bb.KING and self.king_square[ci] == square:
+            self.king_square[ci] = next(iter(pieces), -1)
+        self.color_bb[ci] &= mask
+        self.occupied &= mask
+        self.zobrist_key ^= zobrist.PIECE_KEYS[index][square]
+        self.material[ci] -= MATERIAL_BY_TYPE[ti]
+        self.psqt_mg[ci] -= psqt.PSQT_MG[ci][ti][square]
+        self.psqt_eg[ci] -= psqt.PSQT_EG[ci][ti][square]
+        self.phase -= psqt.PHASE_BY_TYPE[ti]
+        if self.encoder is not None:
+            self.encoder.remove(index, square)
+        if self.accumulator is not None:
+            self.accumulator.remove(index, square)
+
+    # ==================== NETWORK FEATURES ====================
+    def attach_encoder(self) -> FeatureEncoder:
+        """Keep a FeatureEncoder in sync with this board from now on (idempotent)"""
+        if self.encoder is None:
+            self.encoder = FeatureEncoder(self)
+        return self.encoder
+
+    # ==================== ATTACK MAPS ====================
+    def get_attack_maps(self) -> AttackMaps:
+        """Attack maps for the current position (computed once per position)"""
+        maps = self._attack_cache.get(self.zobrist_key)
+        if maps is None:
+            if len(self._attack_cache) >= ATTACK_CACHE_SIZE:
+                self._attack_cache.clear()
+            maps = AttackMaps(self.piece_bb, self.occupied)
+            self._attack_cache[self.zobrist_key] = maps
+        return maps
+
+    def get_attack_map(self, color: str) -> int:
+        """Mask of all squares attacked by a color"""
+        return self.get_attack_maps().maps[bb.COLOR_INDEX[color]]
+
+    def get_attack_counts(self, color: str) -> List[int]:
+        """Number of attackers of a color on each square (indexed row * 8 + col)"""
+        return self.get_attack_maps().counts(bb.COLOR_INDEX[color])
 
     def get_attacked_squares(self, color: str) -> set:
         """Get all squares attacked by pieces of a color"""
-        attacked = set()
-        pieces = self.white_pieces if color == 'white' else self.black_pieces
-
-        for piece in pieces:
-            # This will be implemented when we have piece move logic
-            # For now, return empty set
-            pass
-
-        return attacked
+        return set(bb.to_coords(self.get_attack_map(color)))
 
     def is_square_attacked(self, row: int, col: int, by_color: str) -> bool:
         """Check if a square is under attack by a specific color"""
-        # This will be implemented with proper move generation
-        return False
+        return bool((self.get_attack_map(by_color) >> (row * 8 + col)) & 1)
+
+    def get_attackers_mask(self, row: int, col: int, color: str) -> int:
+        """Mask of the pieces of a color attacking (row, col)"""
+        square = row * 8 + col
+        ci = bb.COLOR_INDEX[color]
+        # The cached map rejects unattacked squares without any table probes
+        if not (self.get_attack_maps().maps[ci] >> square) & 1:
+            return 0
+        return attackers_to(self.piece_bb, square, self.occupied, ci)
+
+    def get_attackers(self, row: int, col: int, color: str) -> List['Piece']:
+        """Pieces of a color attacking (row, col)"""
+        return [self.grid[r][c] for r, c in bb.to_coords(self.get_attackers_mask(row, col, color))]
+
+    def get_attack_context(self, color: str) -> AttackContext:
+        """Checkers, check lines and attacked/defended squares from color's side (computed once per position)"""
+        cache_key = (self.zobrist_key, bb.COLOR_INDEX[color])
+        context = self._context_cache.get(cache_key)
+        if context is None:
+            if len(self._context_cache) >= ATTACK_CACHE_SIZE:
+                self._context_cache.clear()
+            context = AttackContext(self.get_attack_maps(), self.piece_bb, self.occupied,
+                                    cache_key[1], self.king_square)
+            self._context_cache[cache_key] = context
+        return context
+
+    # ==================== LEGAL MOVES ====================
+    def get_legal_moves(self, color: str) -> LegalMoves:
+        """Legal moves of a color in the current position (computed once per position)"""
+        cache_key = (self.zobrist_key, bb.COLOR_INDEX[color])
+        legal = self._legal_cache.get(cache_key)
+        if legal is None:
+            if len(self._legal_cache) >= ATTACK_CACHE_SIZE:
+                self._legal_cache.clear()
+            legal = generate_legal_moves(self, cache_key[1])
+            self._legal_cache[cache_key] = legal
+        return legal
+
+    def get_legal_move_codes(self, color: str) -> array:
+        """Legal moves of a color as packed 16-bit moves in an array('H')"""
+        return self.get_legal_moves(color).codes()
+
+    def get_legal_move_mask(self, row: int, col: int) -> int:
+        """Legal destination mask of the piece on (row, col), 0 if empty"""
+        piece = self.grid[row][col]
+        if piece is None:
+            return 0
+        return self.get_legal_moves(piece.color).mask_for(row * 8 + col)
+
+    def has_legal_moves(self, color: str) -> bool:
+        """Whether a color has at least one legal move"""
+        return bool(self.get_legal_moves(color))
 
     def __repr__(self):
         """String representation"""
-        return f"Board(white_pieces={len(self.white_pieces)}, black_pieces={len(self.black_pieces)}, moves={self.move_count})"
\ No newline at end of file
+        return f"Board(white_pieces={self.count_pieces('white')}, black_pieces={self.count_pieces('black')}, moves={self.move_count})"
+
+
+class UndoInfo:
+    """Everything Board.unmake_move needs to restore the position before a move"""
+
+    __slots__ = ('piece', 'from_sq', 'to_sq', 'had_moved',
+                 'captured', 'capture_sq', 'promoted',
+                 'rook', 'rook_from', 'rook_to', 'rook_had_moved',
+                 'castling_rights', 'ep_square', 'ep_key', 'zobrist_key',
+                 'halfmove_clock', 'fullmove_number', 'move_count')
+
+    def __init__(self, board: Board, piece: 'Piece', from_sq: int, to_sq: int):
+        self.piece = piece
+        self.from_sq = from_sq
+        self.to_sq = to_sq
+        self.had_moved = piece.has_moved
+        self.captured = None
+        self.capture_sq = to_sq
+        self.promoted = None
+        self.rook = None
+        self.rook_from = self.rook_to = -1
+        self.rook_had_moved = False
+        self.castling_rights = board.castling_rights
+        self.ep_square = board.ep_square
+        self.ep_key = board._ep_key
+        self.zobrist_key = board.zobrist_key
+        self.halfmove_clock = board.halfmove_clock
+        self.fullmove_number = board.fullmove_number
+        self.move_count = board.move_count
@@ -0,0 +1,76 @@
+"""
+Feature Encoder
+The 768-feature network input, kept up to date move by move
+
+The piece networks (config.NN_CONFIGS) read 12 planes x 64 squares of
+one-hot features from the mover's side: planes 0-5 hold the mover's
+pawn..king, planes 6-11 the opponent's, and black's view is mirrored
+vertically. FeatureEncoder holds both views in one preallocated float32
+buffer. Once attached with Board.attach_encoder, the board's bitboard
+mutators set and clear the features of every piece they add or remove,
+so a move touches two to four features per view instead of rebuilding
+the input from Board.grid.
+
+array() and tensor() are views of the live buffer, not copies: they
+change with the board. Copy them (or use write_sample) to keep a
+position.
+"""
+
+from typing import List
+
+import numpy as np
+
+import config
+from chess_engine.bitboard import COLOR_INDEX
+
+# Feature of (piece index, square) in white's and black's view
+_WHITE_VIEW: List[List[int]] = [[index * 64 + sq for sq in range(64)] for index in range(12)]
+_BLACK_VIEW: List[List[int]] = [[((index + 6) % 12) * 64 + (sq ^ 56) for sq in range(64)]
+                                for index in range(12)]
+
+
+class FeatureEncoder:
+    """Both colors' 768-feature views of one board in a reusable buffer"""
+
+    __slots__ = ('buffer',)
+
+    def __init__(self, board=None):
+        self.buffer = np.zeros((2, config.NN_INPUT_SIZE), dtype=np.float32)
+        if board is not None:
+            self.sync(board)
+
+    def sync(self, board):
+        """Rebuild both views from board's bitboards"""
+        self.buffer.fill(0.0)
+        for index, bits in enumerate(board.piece_bb):
+            while bits:
+                low = bits & -bits
+                self.add(index, low.bit_length() - 1)
+                bits ^= low
+
+    def clear(self):
+        self.buffer.fill(0.0)
+
+    def add(self, index: int, square: int):
+        """Set the features of the piece with bitboard index on square"""
+        self.buffer[0, _WHITE_VIEW[index][square]] = 1.0
+        self.buffer[1, _BLACK_VIEW[index][square]] = 1.0
+
+    def remove(self, index: int, square: int):
+        self.buffer[0, _WHITE_VIEW[index][square]] = 0.0
+        self.buffer[1, _BLACK_VIEW[index][square]] = 0.0
+
+    def array(self, color: str) -> np.ndarray:
+        """Read-only NumPy view of color's features"""
+        view = self.buffer[COLOR_INDEX[color]].view()
+        view.flags.writeable = False
+        return view
+
+    def tensor(self, color: str):
+        """torch tensor sharing memory with color's features"""
+        import torch
+        return torch.from_numpy(self.buffer[COLOR_INDEX[color]])
+
+    def write_sample(self, out: np.ndarray, color: str):
+        """Copy color's features into out, e.g. one row of a training batch"""
+        np.copyto(out, self.buffer[COLOR_INDEX[color]])
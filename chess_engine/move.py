@@ -1,15 +1,226 @@
+"""
+Move Representation
+Moves packed into 16-bit integers, with a small __slots__ wrapper
+
+Layout (Stockfish-style):
+    bits  0-5   from square (row * 8 + col)
+    bits  6-11  to square
+    bits 12-13  promotion piece (0 knight, 1 bishop, 2 rook, 3 queen)
+    bits 14-15  flag (0 normal, 1 promotion, 2 en passant, 3 castle)
+
+Packed moves fit array('H') buffers, compare and hash as plain ints and
+are accepted directly by Board.make_move. Move wraps one code for code
+that wants attribute access.
+"""
+
+from array import array
+from typing import Optional, Tuple
+
+FLAG_NORMAL = 0
+FLAG_PROMOTION = 1
+FLAG_EN_PASSANT = 2
+FLAG_CASTLE = 3
+
+# Move.special_flag strings by flag value
+SPECIAL_FLAGS = (None, 'promotion', 'en_passant', 'castle')
+PROMOTION_PIECES = ('knight', 'bishop', 'rook', 'queen')
+PROMOTION_CODES = {piece_type: i for i, piece_type in enumerate(PROMOTION_PIECES)}
+
+NULL_MOVE = 0
+
+FILES = 'abcdefgh'
+RANKS = '87654321'
+SQUARE_NAMES = tuple(FILES[sq & 7] + RANKS[sq >> 3] for sq in range(64))
+SAN_LETTERS = {'knight': 'N', 'bishop': 'B', 'rook': 'R', 'queen': 'Q', 'king': 'K'}
+UCI_PROMOTIONS = {'n': 'knight', 'b': 'bishop', 'r': 'rook', 'q': 'queen'}
+
+
+def encode_move(from_sq: int, to_sq: int, flag: int = FLAG_NORMAL,
+                promotion: Optional[str] = None) -> int:
+    """Pack a move into 16 bits (promotion defaults to queen for promotion flags)"""
+    if promotion:
+        flag = FLAG_PROMOTION
+        promo = PROMOTION_CODES[promotion]
+    else:
+        promo = 3 if flag == FLAG_PROMOTION else 0
+    return from_sq | (to_sq << 6) | (promo << 12) | (flag << 14)
+
+
+def decode_move(code: int) -> Tuple[int, int, int, Optional[str]]:
+    """(from_sq, to_sq, flag, promotion piece type or None)"""
+    flag = code >> 14
+    promotion = PROMOTION_PIECES[(code >> 12) & 3] if flag == FLAG_PROMOTION else None
+    return code & 63, (code >> 6) & 63, flag, promotion
+
+
+def move_list() -> array:
+    """Empty packed move buffer"""
+    return array('H')
+
+
+def flag_for(board, from_sq: int, to_sq: int) -> int:
+    """Flag for a move on board, from Board.classify_move"""
+    return SPECIAL_FLAGS.index(board.classify_move(from_sq, to_sq))
+
+
+# ==================== UCI ====================
+def move_to_uci(code: int) -> str:
+    """Long algebraic text such as 'e2e4' or 'e7e8q'"""
+    text = SQUARE_NAMES[code & 63] + SQUARE_NAMES[(code >> 6) & 63]
+    if code >> 14 == FLAG_PROMOTION:
+        text += 'nbrq'[(code >> 12) & 3]
+    return text
+
+
+def move_from_uci(text: str, board=None) -> int:
+    """
+    Parse UCI text into a packed move
+
+    With a board, the castle/en-passant/promotion flag is filled in from the
+    position. Raises ValueError on malformed text.
+    """
+    text = text.strip().lower()
+    if len(text) not in (4, 5) or text[:2] not in SQUARE_NAMES or text[2:4] not in SQUARE_NAMES:
+        raise ValueError(f"Invalid UCI move: {text!r}")
+    from_sq = SQUARE_NAMES.index(text[:2])
+    to_sq = SQUARE_NAMES.index(text[2:4])
+    promotion = None
+    if len(text) == 5:
+        promotion = UCI_PROMOTIONS.get(text[4])
+        if promotion is None:
+            raise ValueError(f"Invalid UCI promotion: {text!r}")
+    if board is not None:
+        flag = flag_for(board, from_sq, to_sq)
+    else:
+        flag = FLAG_PROMOTION if promotion else FLAG_NORMAL
+    return encode_move(from_sq, to_sq, flag, promotion)
+
+
+# ==================== SAN ====================
+def move_to_san(board, code: int, suffix: bool = True) -> str:
+    """
+    Standard algebraic notation ('Nf3', 'exd5', 'O-O', 'e8=Q+') of a legal move
+
+    The move is played and taken back on board to add the check/mate
+    suffix; pass suffix=False to skip that.
+    """
+    from_sq, to_sq, _, promotion = decode_move(code)
+    piece = board.grid[from_sq >> 3][from_sq & 7]
+    special = board.classify_move(from_sq, to_sq)
+
+    if special == 'castle':
+        san = 'O-O' if to_sq > from_sq else 'O-O-O'
+    else:
+        capture = board.grid[to_sq >> 3][to_sq & 7] is not None or special == 'en_passant'
+        target = SQUARE_NAMES[to_sq]
+        if piece.piece_type == 'pawn':
+            san = (FILES[from_sq & 7] + 'x' if capture else '') + target
+            if special == 'promotion':
+                san += '=' + SAN_LETTERS[promotion or 'queen']
+        else:
+            san = (SAN_LETTERS[piece.piece_type] + _disambiguation(board, piece, from_sq, to_sq) +
+                   ('x' if capture else '') + target)
+
+    if suffix:
+        undo = board.make_move(code)
+        reply = board.get_legal_moves(board.side_to_move)
+        if reply.in_check:
+            san += '+' if reply else '#'
+        board.unmake_move(undo)
+    return san
+
+
+def _disambiguation(board, piece, from_sq: int, to_sq: int) -> str:
+    """File, rank or square needed to tell piece apart from its twins"""
+    legal = board.get_legal_moves(piece.color)
+    twins = board.get_piece_mask(piece.piece_type, piece.color) & ~(1 << from_sq)
+    rivals = [sq for sq in legal.targets if (twins >> sq) & 1 and (legal.targets[sq] >> to_sq) & 1]
+    if not rivals:
+        return ''
+    if all((sq & 7) != (from_sq & 7) for sq in rivals):
+        return FILES[from_sq & 7]
+    if all((sq >> 3) != (from_sq >> 3) for sq in rivals):
+        return RANKS[from_sq >> 3]
+    return SQUARE_NAMES[from_sq]
+
+
+def move_from_san(text: str, board) -> int:
+    """Parse SAN for the side to move on board; raises ValueError if no legal move matches"""
+    wanted = text.strip().rstrip('+#!?')
+    wanted = wanted.replace('0-0-0', 'O-O-O').replace('0-0', 'O-O')
+    for code in board.get_legal_move_codes(board.side_to_move):
+        if move_to_san(board, code, suffix=False) == wanted:
+            return code
+    raise ValueError(f"Illegal or malformed SAN move: {text!r}")
+
+
 class Move:
-    def __init__(self, from_pos, to_pos, piece_type, special_flag=None):
-        self.from_pos = from_pos  # (row, col)
-        self.to_pos = to_pos
+    """A packed move plus the context the game log keeps with it"""
+
+    __slots__ = ('code', 'piece_type', 'captured_piece', 'timestamp')
+
+    def __init__(self, from_pos, to_pos, piece_type, special_flag=None, promotion=None):
+        flag = SPECIAL_FLAGS.index(special_flag) if special_flag else FLAG_NORMAL
+        self.code = encode_move(from_pos[0] * 8 + from_pos[1], to_pos[0] * 8 + to_pos[1],
+                                flag, promotion)
         self.piece_type = piece_type
-        self.special_flag = special_flag  # 'castle', 'en_passant', 'promotion'
         self.captured_piece = None
         self.timestamp = None
 
-    def to_algebraic(self):
-        # Convert to notation like "e2e4" or "Nf3"
-        pass
+    @classmethod
+    def from_code(cls, code: int, piece_type: Optional[str] = None) -> 'Move':
+        """Wrap an already packed move"""
+        move = cls.__new__(cls)
+        move.code = code
+        move.piece_type = piece_type
+        move.captured_piece = None
+        move.timestamp = None
+        return move
+
+    @property
+    def from_sq(self) -> int:
+        return self.code & 63
+
+    @property
+    def to_sq(self) -> int:
+        return (self.code >> 6) & 63
+
+    @property
+    def from_pos(self) -> Tuple[int, int]:
+        return (self.code & 63) >> 3, self.code & 7
+
+    @property
+    def to_pos(self) -> Tuple[int, int]:
+        return (self.code >> 9) & 7, (self.code >> 6) & 7
+
+    @property
+    def special_flag(self) -> Optional[str]:
+        return SPECIAL_FLAGS[self.code >> 14]
+
+    @property
+    def promotion(self) -> Optional[str]:
+        return decode_move(self.code)[3]
+
+    def to_uci(self) -> str:
+        return move_to_uci(self.code)
+
+    def to_algebraic(self, board=None):
+        # Convert to notation like "e2e4" or "Nf3" (SAN needs the position before the move)
+        if board is None:
+            return move_to_uci(self.code)
+        return move_to_san(board, self.code)
 
     def is_capture(self):
-        return self.captured_piece is not None
\ No newline at end of file
+        return self.captured_piece is not None
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and other.code == self.code
+
+    def __hash__(self):
+        return self.code
+
+    def __int__(self):
+        return self.code
+
+    def __repr__(self):
+        return f"Move({move_to_uci(self.code)})"
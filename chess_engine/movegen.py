@@ -0,0 +1,264 @@
+"""
+Legal Move Generation
+Fully legal moves for one side, without make/test/unmake per move
+
+Checkers, pinned pieces (with the ray each is allowed to move along) and
+the check-evasion mask are computed once per position. Each piece's
+pseudo-legal table lookup is then ANDed with those masks, so a whole
+side's legal moves cost one pass over its pieces. King moves are tested
+against the enemy attack set computed with our king lifted off the board,
+which also rules out stepping back along a checking ray. En passant gets
+an explicit test since it removes two pieces from one rank.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+from chess_engine.bitboard import (
+    PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, FULL, RANK_8, RANK_1, COLOR_INDEX,
+    CASTLE_WHITE_KINGSIDE, CASTLE_WHITE_QUEENSIDE,
+    CASTLE_BLACK_KINGSIDE, CASTLE_BLACK_QUEENSIDE,
+    knight_attacks, king_attacks, pawn_attacks,
+)
+from chess_engine.attack_map import attackers_to
+from chess_engine.move import FLAG_PROMOTION, FLAG_EN_PASSANT, FLAG_CASTLE
+from chess_engine.attack_tables import (
+    KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, ROOK_RAYS, BISHOP_RAYS, BETWEEN,
+    bishop_attacks, rook_attacks, pawn_pushes,
+)
+
+# (right, king from, king to, rook from, squares that must be empty,
+#  squares the king crosses that must not be attacked), per color
+CASTLING_PATHS = (
+    ((CASTLE_WHITE_KINGSIDE, 60, 62, 63, (1 << 61) | (1 << 62), (1 << 61) | (1 << 62)),
+     (CASTLE_WHITE_QUEENSIDE, 60, 58, 56, (1 << 57) | (1 << 58) | (1 << 59),
+      (1 << 58) | (1 << 59))),
+    ((CASTLE_BLACK_KINGSIDE, 4, 6, 7, (1 << 5) | (1 << 6), (1 << 5) | (1 << 6)),
+     (CASTLE_BLACK_QUEENSIDE, 4, 2, 0, (1 << 1) | (1 << 2) | (1 << 3),
+      (1 << 2) | (1 << 3))),
+)
+
+PROMOTION_RANKS = RANK_8 | RANK_1
+PROMOTION_TYPES = ('queen', 'rook', 'bishop', 'knight')
+
+# Packed promotion codes, queen first (see chess_engine.move)
+_PROMOTION_BITS = tuple((promo << 12) | (FLAG_PROMOTION << 14) for promo in (3, 2, 1, 0))
+
+
+class LegalMoves:
+    """All legal moves of one color in one position, as per-square target masks"""
+
+    __slots__ = ('color', 'checkers', 'targets', 'pawns', 'king_sq', 'ep_square')
+
+    def __init__(self, color: int, checkers: int, targets: Dict[int, int],
+                 pawns: int = 0, king_sq: int = -1, ep_square=None):
+        self.color = color
+        self.checkers = checkers
+        # from square -> mask of legal destination squares (empty masks omitted)
+        self.targets = targets
+        self.pawns = pawns
+        self.king_sq = king_sq
+        self.ep_square = ep_square
+
+    @property
+    def in_check(self) -> bool:
+        return self.checkers != 0
+
+    def mask_for(self, square: int) -> int:
+        """Legal destination mask of the piece on square"""
+        return self.targets.get(square, 0)
+
+    def __bool__(self) -> bool:
+        return bool(self.targets)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Yield (from_sq, to_sq) pairs; promotions appear once per square pair"""
+        for from_sq, mask in self.targets.items():
+            while mask:
+                low = mask & -mask
+                yield from_sq, low.bit_length() - 1
+                mask ^= low
+
+    def count(self) -> int:
+        """Number of legal moves, counting each promotion once per piece type"""
+        total = 0
+        pawns = self.pawns
+        for from_sq, mask in self.targets.items():
+            n = bin(mask).count('1')
+            if (pawns >> from_sq) & 1:
+                n += 3 * bin(mask & PROMOTION_RANKS).count('1')
+            total += n
+        return total
+
+    def codes(self) -> array:
+        """Packed 16-bit moves (chess_engine.move layout), one per promotion piece"""
+        moves = array('H')
+        append = moves.append
+        pawns, king_sq, ep_square = self.pawns, self.king_sq, self.ep_square
+        for from_sq, mask in self.targets.items():
+            is_pawn = (pawns >> from_sq) & 1
+            while mask:
+                low = mask & -mask
+                to_sq = low.bit_length() - 1
+                code = from_sq | (to_sq << 6)
+                if is_pawn:
+                    if low & PROMOTION_RANKS:
+                        for bits in _PROMOTION_BITS:
+                            append(code | bits)
+                    elif to_sq == ep_square:
+                        append(code | (FLAG_EN_PASSANT << 14))
+                    else:
+                        append(code)
+                elif from_sq == king_sq and to_sq - from_sq in (2, -2):
+                    append(code | (FLAG_CASTLE << 14))
+                else:
+                    append(code)
+                mask ^= low
+        return moves
+
+
+def _danger_squares(piece_bb: List[int], them: int, occupied: int) -> int:
+    """Squares attacked by them, with sliders seeing through our king"""
+    base = them * 6
+    danger = (pawn_attacks(piece_bb[base + PAWN], them) |
+              knight_attacks(piece_bb[base + KNIGHT]) |
+              king_attacks(piece_bb[base + KING]))
+    queens = piece_bb[base + QUEEN]
+    diagonal = piece_bb[base + BISHOP] | queens
+    while diagonal:
+        low = diagonal & -diagonal
+        danger |= bishop_attacks(low.bit_length() - 1, occupied)
+        diagonal ^= low
+    straight = piece_bb[base + ROOK] | queens
+    while straight:
+        low = straight & -straight
+        danger |= rook_attacks(low.bit_length() - 1, occupied)
+        straight ^= low
+    return danger
+
+
+def generate_legal_moves(board, color: int) -> LegalMoves:
+    """
+    Compute every legal move of color (0 = white, 1 = black) on board
+
+    En passant is only generated for the side to move. Positions without a
+    king of color (test setups) fall back to pseudo-legal moves.
+    """
+    piece_bb = board.piece_bb
+    occupied = board.occupied
+    us, them = color, color ^ 1
+    own = board.color_bb[us]
+    enemy = board.color_bb[them]
+    base, enemy_base = us * 6, them * 6
+    targets = {}
+
+    kings = piece_bb[base + KING]
+    if kings:
+        king_sq = (kings & -kings).bit_length() - 1
+        checkers = attackers_to(piece_bb, king_sq, occupied, them)
+    else:
+        king_sq = -1
+        checkers = 0
+
+    # Pinned pieces: our single blocker between the king and an enemy slider
+    pins = {}
+    if king_sq >= 0:
+        enemy_queens = piece_bb[enemy_base + QUEEN]
+        snipers = ((ROOK_RAYS[king_sq] & (piece_bb[enemy_base + ROOK] | enemy_queens)) |
+                   (BISHOP_RAYS[king_sq] & (piece_bb[enemy_base + BISHOP] | enemy_queens)))
+        while snipers:
+            low = snipers & -snipers
+            between = BETWEEN[king_sq][low.bit_length() - 1]
+            blockers = between & occupied
+            if blockers and blockers & (blockers - 1) == 0 and blockers & own:
+                pins[blockers.bit_length() - 1] = between | low
+            snipers ^= low
+
+    # King moves (the only moves out of a double check)
+    if king_sq >= 0:
+        danger = _danger_squares(piece_bb, them, occupied ^ kings)
+        mask = KING_ATTACKS[king_sq] & ~own & ~danger
+        if not checkers:
+            for right, k_from, k_to, r_from, empty, safe in CASTLING_PATHS[us]:
+                if (board.castling_rights & right and king_sq == k_from and
+                        (piece_bb[base + ROOK] >> r_from) & 1 and
+                        not occupied & empty and not danger & safe):
+                    mask |= 1 << k_to
+        if mask:
+            targets[king_sq] = mask
+        if checkers & (checkers - 1):
+            return LegalMoves(us, checkers, targets, 0, king_sq)
+
+    # Single check: capture the checker or block its ray
+    if checkers:
+        checker_sq = checkers.bit_length() - 1
+        evasion = checkers | BETWEEN[king_sq][checker_sq]
+    else:
+        evasion = FULL
+
+    target_mask = ~own & evasion
+
+    # Pawns
+    pawns = piece_bb[base + PAWN]
+    ep_square = board.ep_square if COLOR_INDEX[board.side_to_move] == us else None
+    remaining = pawns
+    while remaining:
+        low = remaining & -remaining
+        sq = low.bit_length() - 1
+        mask = (pawn_pushes(sq, us, occupied) | (PAWN_ATTACKS[us][sq] & enemy)) & target_mask
+        if sq in pins:
+            mask &= pins[sq]
+        if ep_square is not None and (PAWN_ATTACKS[us][sq] >> ep_square) & 1:
+            if _ep_is_legal(piece_bb, occupied, us, sq, ep_square, king_sq, checkers):
+                mask |= 1 << ep_square
+        if mask:
+            targets[sq] = mask
+        remaining ^= low
+
+    # Knights (a pinned knight can never move)
+    remaining = piece_bb[base + KNIGHT]
+    while remaining:
+        low = remaining & -remaining
+        sq = low.bit_length() - 1
+        if sq not in pins:
+            mask = KNIGHT_ATTACKS[sq] & target_mask
+            if mask:
+                targets[sq] = mask
+        remaining ^= low
+
+    # Sliders
+    queens = piece_bb[base + QUEEN]
+    for sliders, lookup in ((piece_bb[base + BISHOP] | queens, bishop_attacks),
+                            (piece_bb[base + ROOK] | queens, rook_attacks)):
+        remaining = sliders
+        while remaining:
+            low = remaining & -remaining
+            sq = low.bit_length() - 1
+            mask = lookup(sq, occupied) & target_mask
+            if sq in pins:
+                mask &= pins[sq]
+            if mask:
+                targets[sq] = targets.get(sq, 0) | mask
+            remaining ^= low
+
+    return LegalMoves(us, checkers, targets, pawns, king_sq, ep_square)
+
+
+def _ep_is_legal(piece_bb: List[int], occupied: int, us: int, from_sq: int,
+                 ep_square: int, king_sq: int, checkers: int) -> bool:
+    """Whether capturing en passant is possible and leaves our king safe"""
+    enemy_base = (us ^ 1) * 6
+    victim_bit = 1 << ((from_sq & ~7) | (ep_square & 7))
+    if not piece_bb[enemy_base + PAWN] & victim_bit:
+        return False
+    queens = piece_bb[enemy_base + QUEEN]
+    diagonal = piece_bb[enemy_base + BISHOP] | queens
+    straight = piece_bb[enemy_base + ROOK] | queens
+    # Any checker other than the captured pawn must be a slider we now block
+    if checkers & ~victim_bit & ~(diagonal | straight):
+        return False
+    if king_sq < 0:
+        return True
+    after = occupied ^ (1 << from_sq) ^ victim_bit ^ (1 << ep_square)
+    return not ((rook_attacks(king_sq, after) & straight) |
+                (bishop_attacks(king_sq, after) & diagonal))
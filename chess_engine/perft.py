@@ -0,0 +1,138 @@
+"""
+Perft
+Move-generation correctness and throughput check
+
+perft(board, depth) counts the leaf nodes of the legal move tree; the
+counts for the standard positions below are published and any mismatch
+points at a move-generation bug. The legal move cache is bypassed so the
+timings measure generation and make/unmake, not cache hits.
+
+Usage:
+    python -m chess_engine.perft                    # run the standard suite
+    python -m chess_engine.perft 4                  # the suite up to depth 4
+    python -m chess_engine.perft "<fen>" 4          # divide for one position
+    python -m chess_engine.perft startpos 5 --no-divide
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from chess_engine.bitboard import COLOR_INDEX
+from chess_engine.board import Board
+from chess_engine.move import move_to_uci
+from chess_engine.movegen import generate_legal_moves
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# (name, FEN, expected node counts for depth 1, 2, ...)
+STANDARD_POSITIONS: List[Tuple[str, str, List[int]]] = [
+    ("startpos", START_FEN,
+     [20, 400, 8902, 197281, 4865609]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862, 4085603]),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238, 674624]),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467, 422333]),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379, 2103487]),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890, 3894594]),
+]
+
+
+def perft(board: Board, depth: int) -> int:
+    """Number of leaf nodes depth plies below the current position"""
+    if depth <= 0:
+        return 1
+    moves = generate_legal_moves(board, COLOR_INDEX[board.side_to_move])
+    if depth == 1:
+        # Bulk count: no need to play the last ply
+        return moves.count()
+
+    nodes = 0
+    for code in moves.codes():
+        undo = board.make_move(code)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+
+def divide(board: Board, depth: int) -> Dict[str, int]:
+    """Leaf counts per root move, keyed by UCI text (e.g. 'e2e4', 'a7a8q')"""
+    counts = {}
+    for code in generate_legal_moves(board, COLOR_INDEX[board.side_to_move]).codes():
+        undo = board.make_move(code)
+        counts[move_to_uci(code)] = perft(board, depth - 1)
+        board.unmake_move(undo)
+    return counts
+
+
+def run_suite(max_depth: int = 3, out=sys.stdout) -> bool:
+    """Check every standard position up to max_depth; returns True if all match"""
+    all_ok = True
+    total_nodes = 0
+    total_time = 0.0
+    board = Board()
+    for name, fen, expected in STANDARD_POSITIONS:
+        board.load_fen(fen)
+        for depth, want in enumerate(expected[:max_depth], start=1):
+            start = time.perf_counter()
+            got = perft(board, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += got
+            total_time += elapsed
+            ok = got == want
+            all_ok &= ok
+            print(f"{name:<10} depth {depth}: {got:>9} (expected {want:>9}) "
+                  f"{'OK  ' if ok else 'FAIL'} {_rate(got, elapsed)}", file=out)
+    print(f"Total: {total_nodes} nodes in {total_time:.2f}s ({_rate(total_nodes, total_time)})",
+          file=out)
+    return all_ok
+
+
+def _rate(nodes: int, seconds: float) -> str:
+    return f"{nodes / seconds:,.0f} nps" if seconds > 0 else "- nps"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Perft node counts for the betaBot move generator")
+    parser.add_argument('fen', nargs='?',
+                        help="FEN string or 'startpos' (omit, or give only a depth, to run the suite)")
+    parser.add_argument('depth', nargs='?', type=int, help="search depth (default 3)")
+    parser.add_argument('--no-divide', action='store_true', help="only print the total")
+    args = parser.parse_args(argv)
+
+    # A lone integer is the suite depth, not a FEN
+    if args.fen is not None and args.fen.isdigit():
+        if args.depth is not None:
+            parser.error(f"expected a FEN or 'startpos' before the depth, got {args.fen!r}")
+        args.fen, args.depth = None, int(args.fen)
+    if args.depth is None:
+        args.depth = 3
+
+    if args.fen is None:
+        return 0 if run_suite(args.depth) else 1
+
+    board = Board()
+    try:
+        board.load_fen(START_FEN if args.fen == 'startpos' else args.fen)
+    except ValueError as e:
+        parser.error(str(e))
+    start = time.perf_counter()
+    if args.no_divide:
+        nodes = perft(board, args.depth)
+    else:
+        counts = divide(board, args.depth)
+        for text in sorted(counts):
+            print(f"{text}: {counts[text]}")
+        nodes = sum(counts.values())
+    elapsed = time.perf_counter() - start
+    print(f"\nNodes: {nodes}\nTime: {elapsed:.3f}s\nSpeed: {_rate(nodes, elapsed)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
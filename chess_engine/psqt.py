@@ -0,0 +1,136 @@
+"""
+Piece-Square Tables
+Middlegame/endgame positional bonuses for all six piece types
+
+Tables are written from white's point of view in Board.grid orientation
+(row 0 = rank 8), in centipawns. Black uses the vertically mirrored
+square. The tapered score blends the two phases by GAME_PHASE, which is
+derived from the non-pawn material still on the board.
+"""
+
+from typing import List
+
+from chess_engine.bitboard import PIECE_TYPES
+
+# ==================== MIDDLEGAME TABLES ====================
+PAWN_MG = [
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [50, 50, 50, 50, 50, 50, 50, 50],
+    [10, 10, 20, 30, 30, 20, 10, 10],
+    [5, 5, 10, 25, 25, 10, 5, 5],
+    [0, 0, 0, 20, 20, 0, 0, 0],
+    [5, -5, -10, 0, 0, -10, -5, 5],
+    [5, 10, 10, -20, -20, 10, 10, 5],
+    [0, 0, 0, 0, 0, 0, 0, 0]
+]
+
+KNIGHT_MG = [
+    [-50, -40, -30, -30, -30, -30, -40, -50],
+    [-40, -20, 0, 0, 0, 0, -20, -40],
+    [-30, 0, 10, 15, 15, 10, 0, -30],
+    [-30, 5, 15, 20, 20, 15, 5, -30],
+    [-30, 0, 15, 20, 20, 15, 0, -30],
+    [-30, 5, 10, 15, 15, 10, 5, -30],
+    [-40, -20, 0, 5, 5, 0, -20, -40],
+    [-50, -40, -30, -30, -30, -30, -40, -50]
+]
+
+BISHOP_MG = [
+    [-20, -10, -10, -10, -10, -10, -10, -20],
+    [-10, 0, 0, 0, 0, 0, 0, -10],
+    [-10, 0, 5, 10, 10, 5, 0, -10],
+    [-10, 5, 5, 10, 10, 5, 5, -10],
+    [-10, 0, 10, 10, 10, 10, 0, -10],
+    [-10, 10, 10, 10, 10, 10, 10, -10],
+    [-10, 5, 0, 0, 0, 0, 5, -10],
+    [-20, -10, -10, -10, -10, -10, -10, -20]
+]
+
+ROOK_MG = [
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [5, 10, 10, 10, 10, 10, 10, 5],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [-5, 0, 0, 0, 0, 0, 0, -5],
+    [0, 0, 0, 5, 5, 0, 0, 0]
+]
+
+QUEEN_MG = [
+    [-20, -10, -10, -5, -5, -10, -10, -20],
+    [-10, 0, 0, 0, 0, 0, 0, -10],
+    [-10, 0, 5, 5, 5, 5, 0, -10],
+    [-5, 0, 5, 5, 5, 5, 0, -5],
+    [0, 0, 5, 5, 5, 5, 0, -5],
+    [-10, 5, 5, 5, 5, 5, 0, -10],
+    [-10, 0, 5, 0, 0, 0, 0, -10],
+    [-20, -10, -10, -5, -5, -10, -10, -20]
+]
+
+KING_MG = [
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-20, -30, -30, -40, -40, -30, -30, -20],
+    [-10, -20, -20, -20, -20, -20, -20, -10],
+    [20, 20, 0, 0, 0, 0, 20, 20],
+    [20, 30, 10, 0, 0, 10, 30, 20]
+]
+
+# ==================== ENDGAME TABLES ====================
+PAWN_EG = [
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [80, 80, 80, 80, 80, 80, 80, 80],
+    [50, 50, 50, 50, 50, 50, 50, 50],
+    [30, 30, 30, 30, 30, 30, 30, 30],
+    [20, 20, 20, 20, 20, 20, 20, 20],
+    [10, 10, 10, 10, 10, 10, 10, 10],
+    [0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0]
+]
+
+KING_EG = [
+    [-50, -40, -30, -20, -20, -30, -40, -50],
+    [-30, -20, -10, 0, 0, -10, -20, -30],
+    [-30, -10, 20, 30, 30, 20, -10, -30],
+    [-30, -10, 30, 40, 40, 30, -10, -30],
+    [-30, -10, 30, 40, 40, 30, -10, -30],
+    [-30, -10, 20, 30, 30, 20, -10, -30],
+    [-30, -30, 0, 0, 0, 0, -30, -30],
+    [-50, -30, -30, -30, -30, -30, -30, -50]
+]
+
+# Minor and major pieces keep the same placement preferences in the endgame
+MG_TABLES = {
+    'pawn': PAWN_MG, 'knight': KNIGHT_MG, 'bishop': BISHOP_MG,
+    'rook': ROOK_MG, 'queen': QUEEN_MG, 'king': KING_MG
+}
+EG_TABLES = {
+    'pawn': PAWN_EG, 'knight': KNIGHT_MG, 'bishop': BISHOP_MG,
+    'rook': ROOK_MG, 'queen': QUEEN_MG, 'king': KING_EG
+}
+
+# ==================== GAME PHASE ====================
+PHASE_WEIGHTS = {'pawn': 0, 'knight': 1, 'bishop': 1, 'rook': 2, 'queen': 4, 'king': 0}
+MAX_PHASE = 24  # all minor and major pieces on the board
+
+
+def _flatten(tables: dict) -> List[List[List[int]]]:
+    """[color][piece type index][square] lookup, black mirrored vertically"""
+    white = [[tables[t][sq >> 3][sq & 7] for sq in range(64)] for t in PIECE_TYPES]
+    black = [[row[sq ^ 56] for sq in range(64)] for row in white]
+    return [white, black]
+
+
+# Flat lookups used by Board's incremental accumulators
+PSQT_MG: List[List[List[int]]] = _flatten(MG_TABLES)
+PSQT_EG: List[List[List[int]]] = _flatten(EG_TABLES)
+PHASE_BY_TYPE: List[int] = [PHASE_WEIGHTS[t] for t in PIECE_TYPES]
+
+
+def taper(mg: int, eg: int, phase: int) -> int:
+    """Blend middlegame and endgame scores by phase (MAX_PHASE = pure middlegame)"""
+    phase = min(phase, MAX_PHASE)
+    return (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
@@ -1,3 +1,6 @@
+from chess_engine.bitboard import to_coords
+
+
 class Rules:
     @staticmethod
     def is_in_check(board, color):
@@ -11,14 +14,16 @@ class Rules:
     @staticmethod
     def is_checkmate(board, game_state, color):
         # Check if in check with no legal moves
-        pass
+        legal = board.get_legal_moves(color)
+        return legal.in_check and not legal
 
     @staticmethod
     def is_stalemate(board, game_state, color):
         # Check if no legal moves but not in check
-        pass
+        legal = board.get_legal_moves(color)
+        return not legal.in_check and not legal
 
     @staticmethod
     def get_legal_moves_for_piece(piece, board, game_state):
         # Generate all legal moves for a piece
-        pass
\ No newline at end of file
+        return to_coords(board.get_legal_moves(piece.color).mask_for(piece.row * 8 + piece.col))
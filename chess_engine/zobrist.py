@@ -0,0 +1,82 @@
+"""
+Zobrist Hashing
+64-bit position keys and a counted repetition history
+
+A position key is the XOR of one random number per (piece, square), one
+per castling-rights combination, one per en-passant file (only while an
+en-passant capture is actually available) and a side-to-move key when
+black is to move. Board keeps its key up to date incrementally.
+"""
+
+import random
+from collections import deque
+from itertools import islice
+from typing import Iterator, List, Optional
+
+# Fixed seed so keys (and therefore saved hashes) are stable across runs
+_rng = random.Random(0x5EED_BE7A_B07)
+
+PIECE_KEYS: List[List[int]] = [[_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+CASTLING_KEYS: List[int] = [_rng.getrandbits(64) for _ in range(16)]
+EP_FILE_KEYS: List[int] = [_rng.getrandbits(64) for _ in range(8)]
+SIDE_KEY: int = _rng.getrandbits(64)
+
+del _rng
+
+
+class RepetitionTable:
+    """
+    Position-key history with O(1) occurrence counts
+
+    Keeps the keys in play order (bounded by max_size, oldest evicted
+    first) next to a key -> count map, so repetition checks never scan
+    the history.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size
+        self.history = deque()
+        self.counts = {}
+
+    def append(self, key: int):
+        """Record a position key"""
+        self.history.append(key)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if self.max_size is not None and len(self.history) > self.max_size:
+            self._discard(self.history.popleft())
+
+    def pop(self) -> int:
+        """Remove and return the most recent key"""
+        key = self.history.pop()
+        self._discard(key)
+        return key
+
+    def count(self, key: int) -> int:
+        """Number of times key occurs in the history"""
+        return self.counts.get(key, 0)
+
+    def in_recent(self, key: int, n: int) -> bool:
+        """Check whether key is among the last n recorded keys"""
+        return key in islice(reversed(self.history), n)
+
+    def clear(self):
+        """Forget all keys"""
+        self.history.clear()
+        self.counts.clear()
+
+    def _discard(self, key: int):
+        """Decrement the count of key, dropping it at zero"""
+        remaining = self.counts[key] - 1
+        if remaining:
+            self.counts[key] = remaining
+        else:
+            del self.counts[key]
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.counts
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.history)
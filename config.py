@@ -142,9 +142,11 @@ NN_CONFIGS = {
 }
 
 NN_INPUT_SIZE = 768
+NN_QUANTIZE = False             # Serve piece models with int8 dynamic-quantized Linear layers (CPU)
 
 # ==================== GAME RULES ====================
 KING_MAX_VETOES = 3
+MAX_GAME_MOVES = 300            # Game is drawn beyond this many moves
 CASTLING_ENABLED = True
 EN_PASSANT_ENABLED = True
 PAWN_PROMOTION_ENABLED = True
@@ -217,10 +219,25 @@ MAX_PIECE_THINK_TIME = 2.0
 MAX_QUEEN_SYNTHESIS_TIME = 5.0
 MAX_KING_VALIDATION_TIME = 3.0
 
+PARALLEL_PROPOSALS = False      # Compute per-piece proposals in worker processes
+PROPOSAL_WORKERS = 0            # Worker processes (0 = one per CPU core)
+
 MOVE_ANIMATION_DURATION = 0.5
 CAPTURE_ANIMATION_DURATION = 0.3
 EMOTION_ANIMATION_DURATION = 0.2
 
+# ==================== SEARCH SETTINGS ====================
+SEARCH_ENABLED = False          # Queen adds an alpha-beta lookahead proposal
+SEARCH_TIME_MS = 1000           # Default budget for one search
+SEARCH_MAX_DEPTH = 64
+ASPIRATION_WINDOW = 50          # Centipawns either side of the previous score
+TT_SIZE_MB = 16                 # Transposition table memory budget
+SEARCH_SYNTHESIS_SHARE = 0.5    # Part of the Queen's synthesis budget the search may use
+SEARCH_PROPOSAL_MARGIN = 10     # Heuristic points the search move is put above the best proposal
+SEARCH_WORKERS = 1              # Lazy SMP processes (1 = search in the game process only)
+EVALUATOR = 'handcrafted'       # Position evaluator: 'handcrafted' or 'nnue' (ai_brain.nnue)
+NNUE_FILE = os.path.join(MODELS_DIR, 'nnue.npz')   # Trained NNUE weights (bootstrapped if missing)
+
 # ==================== FONT SETTINGS ====================
 FONT_TITLE = 'Arial'
 FONT_TITLE_SIZE = 36
@@ -92,30 +92,12 @@ class EmotionEngine:
 
     def _get_attackers(self, piece, board) -> list:
         """Get enemy pieces attacking this piece"""
-        attackers = []
         enemy_color = 'black' if piece.color == 'white' else 'white'
-        enemy_pieces = board.get_all_pieces(enemy_color)
-
-        for enemy in enemy_pieces:
-            possible_moves = enemy.get_possible_moves(board)
-            if (piece.row, piece.col) in possible_moves:
-                attackers.append(enemy)
-
-        return attackers
+        return board.get_attackers(piece.row, piece.col, enemy_color)
 
     def _get_defenders(self, piece, board) -> list:
         """Get friendly pieces defending this piece"""
-        defenders = []
-        friendly_pieces = board.get_all_pieces(piece.color)
-
-        for ally in friendly_pieces:
-            if ally == piece:
-                continue
-            possible_moves = ally.get_possible_moves(board)
-            if (piece.row, piece.col) in possible_moves:
-                defenders.append(ally)
-
-        return defenders
+        return board.get_attackers(piece.row, piece.col, piece.color)
 
     def _count_nearby_allies(self, piece, board, radius: int = 2) -> int:
         """Count friendly pieces within radius"""
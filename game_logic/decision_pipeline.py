@@ -0,0 +1,35 @@
+"""
+Decision Pipeline
+Ranking the Queen's proposals once the pieces and the search have spoken
+
+Piece proposals are scored by the heuristic move evaluator, one ply deep.
+The search proposal looked further ahead than any of them, so it is not
+just another heuristic score: unless a check vetoes it (for instance, it
+would repeat the position), it is lifted SEARCH_PROPOSAL_MARGIN above
+the best piece proposal and wins the selection. A vetoed search move
+stays in the list at its own heuristic score as one alternative among
+the others.
+"""
+
+from typing import Dict, List, Optional
+
+import config
+
+
+def rank_proposals(suggestions: List[Dict], searched: Optional[Dict] = None,
+                   vetoed: bool = False) -> List[Dict]:
+    """
+    suggestions best first, with the search proposal merged in
+
+    A piece proposal of the same move as searched is replaced by it.
+    """
+    ranked = list(suggestions)
+    if searched:
+        move = (searched['from'], searched['to'])
+        ranked = [s for s in ranked if (s['from'], s['to']) != move]
+        if not vetoed:
+            best = max((s['score'] for s in ranked), default=searched['score'])
+            searched = dict(searched, score=max(searched['score'], best) + config.SEARCH_PROPOSAL_MARGIN)
+        ranked.append(searched)
+    ranked.sort(key=lambda x: x['score'], reverse=True)
+    return ranked
@@ -8,12 +8,16 @@ Key fixes:
 
 from chess_engine.board import Board
 from chess_engine.game_state import GameState
+from chess_engine.move import move_to_san
+from chess_engine.zobrist import RepetitionTable
+from game_logic.time_manager import TimeManager
 from pieces.pawn import Pawn
 from pieces.knight import Knight
 from pieces.bishop import Bishop
 from pieces.rook import Rook
 from pieces.queen import Queen
 from pieces.king import King
+from pieces.factory import sync_promotion
 import config
 import random
 import time
@@ -35,7 +39,7 @@ class GameManager:
 
         # ✅ FIX: Enhanced repetition tracking
         self.recent_moves = []          # List of (piece_id, from_pos, to_pos) tuples
-        self.position_hashes = []       # Full board position hashes
+        self.position_hashes = RepetitionTable(max_size=50)  # Zobrist keys with counts
         self.piece_last_positions = {}  # piece_id -> list of recent positions
 
         self.ai_mode = True
@@ -44,6 +48,7 @@ class GameManager:
         self.ai_think_delay = 2.0
         self.current_ai_decision = None
         self.move_count = 0
+        self.time_manager = TimeManager()
 
     def initialize_game(self):
         self._setup_pieces()
@@ -52,6 +57,7 @@ class GameManager:
         print("✅ Game initialized with all pieces")
 
     def _setup_pieces(self):
+        self._release_agents()
         self.pieces.clear()
         self.board.clear_board()
 
@@ -83,8 +89,16 @@ class GameManager:
             self.pieces.append(piece)
             self.board.set_piece_at(piece.row, piece.col, piece)
 
+        # The game's own pieces are the agents; register them up front
+        for piece in self.pieces:
+            piece.ensure_agent()
         print(f"Created {len(self.pieces)} pieces")
 
+    def _release_agents(self):
+        """Drop the agent records of this game's pieces (new game or shutdown)"""
+        for piece in self.pieces:
+            piece.release_agent()
+
     def toggle_ai_mode(self):
         self.ai_mode = not self.ai_mode
         print(f"🤖 AI Mode: {'ON' if self.ai_mode else 'OFF'}")
@@ -107,7 +121,9 @@ class GameManager:
                 self._force_varied_move(current_color)
                 return
 
-            proposals = self._collect_piece_proposals(current_color)
+            deadline = self.time_manager.start('proposals', self.board, self.move_count)
+            proposals = self._collect_piece_proposals(current_color, deadline)
+            self.time_manager.finish(deadline)
             if not proposals:
                 print(f"No legal moves for {current_color}!")
                 return
@@ -142,9 +158,7 @@ class GameManager:
         """
         if len(self.position_hashes) < 5:
             return False
-        current_hash = self._get_position_hash()
-        count = self.position_hashes.count(current_hash)
-        return count >= 3
+        return self.position_hashes.count(self._get_position_hash()) >= 3
 
     def _force_varied_move(self, color):
         """
@@ -161,7 +175,7 @@ class GameManager:
         random.shuffle(candidates)
 
         for piece in candidates:
-            moves = piece.get_possible_moves(self.board)
+            moves = piece.get_legal_moves(self.board, self.game_state)
             if moves:
                 # Pick a move that leads to a NEW position
                 for move in moves:
@@ -184,7 +198,7 @@ class GameManager:
 
         # Absolute fallback: just make any legal move
         for piece in pieces:
-            moves = piece.get_possible_moves(self.board)
+            moves = piece.get_legal_moves(self.board, self.game_state)
             if moves:
                 proposal = {
                     'piece': piece,
@@ -195,20 +209,11 @@ class GameManager:
                 self._execute_proposal(proposal)
                 return
 
-    def _simulate_position_hash(self, piece, move) -> str:
-        """Quick hash simulation without actually moving"""
-        positions = []
-        for p in self.pieces:
-            if p.is_captured:
-                continue
-            if p == piece:
-                # Use the simulated new position
-                positions.append(f"{p.id}:{move[0]},{move[1]}")
-            else:
-                positions.append(f"{p.id}:{p.row},{p.col}")
-        return "|".join(sorted(positions))
+    def _simulate_position_hash(self, piece, move) -> int:
+        """Quick hash simulation without actually moving (Zobrist XOR delta)"""
+        return self.board.key_after_move(piece.row, piece.col, move[0], move[1])
 
-    def _collect_piece_proposals(self, color):
+    def _collect_piece_proposals(self, color, deadline=None):
         proposals = []
         pieces = [p for p in self.pieces if p.color == color and not p.is_captured]
 
@@ -218,7 +223,10 @@ class GameManager:
             type_pieces = [p for p in pieces if p.piece_type == piece_type]
 
             for piece in type_pieces:
-                legal_moves = piece.get_possible_moves(self.board)
+                # Out of time: the higher-priority pieces have already proposed
+                if deadline is not None and proposals and deadline.expired():
+                    return proposals
+                legal_moves = piece.get_legal_moves(self.board, self.game_state)
                 if not legal_moves:
                     continue
 
@@ -258,8 +266,7 @@ class GameManager:
             candidate_hash = self._simulate_position_hash(piece, move)
 
             # Block if this position appeared in last 6 positions
-            recent_hashes = self.position_hashes[-6:]
-            if candidate_hash in recent_hashes:
+            if self.position_hashes.in_recent(candidate_hash, 6):
                 continue  # Skip - would cause repetition
 
             # Also block direct back-and-forth for this piece
@@ -333,10 +340,7 @@ class GameManager:
         return score
 
     def _find_piece(self, piece_type, color):
-        for piece in self.pieces:
-            if piece.piece_type == piece_type and piece.color == color and not piece.is_captured:
-                return piece
-        return None
+        return self.board.find_piece(piece_type, color)
 
     def _queen_synthesize(self, queen, proposals):
         best_proposal = max(proposals, key=lambda p: p.get('score', 0))
@@ -369,10 +373,12 @@ class GameManager:
 
         target = self.board.get_piece_at(to_row, to_col)
         is_capture = target is not None
+        move_notation = move_to_san(self.board, self.board.pack_move(from_row, from_col, to_row, to_col))
 
         success = self.board.move_piece(from_row, from_col, to_row, to_col)
         if success:
             piece.mark_moved()
+            piece = sync_promotion(self.board, self.pieces, piece, to_row, to_col)
 
             # ✅ FIX: Record detailed move history
             self.recent_moves.append((piece.id, from_pos, to_pos))
@@ -387,17 +393,10 @@ class GameManager:
                 self.piece_last_positions[piece.id].pop(0)
 
             # ✅ FIX: Record full board position hash
-            pos_hash = self._get_position_hash()
-            self.position_hashes.append(pos_hash)
-            if len(self.position_hashes) > 50:
-                self.position_hashes.pop(0)
+            self.position_hashes.append(self._get_position_hash())
 
             self.move_count += 1
 
-            move_notation = f"{piece.get_symbol()}{self.board.get_square_name(to_row, to_col)}"
-            if is_capture:
-                move_notation = f"{piece.get_symbol()}x{self.board.get_square_name(to_row, to_col)}"
-
             self.last_move = {
                 'from': from_pos,
                 'to': to_pos,
@@ -418,12 +417,8 @@ class GameManager:
             self.game_state.switch_turn()
             print(f"➡️  Turn: {self.game_state.current_player}")
 
-    def _get_position_hash(self):
-        positions = []
-        for piece in self.pieces:
-            if not piece.is_captured:
-                positions.append(f"{piece.id}:{piece.row},{piece.col}")
-        return "|".join(sorted(positions))
+    def _get_position_hash(self) -> int:
+        return self.board.zobrist_key
 
     def handle_mouse_click(self, pos):
         if self.ai_mode:
@@ -457,7 +452,7 @@ class GameManager:
         if piece and piece.color == self.game_state.current_player:
             self.selected_piece = piece
             self.selected_position = (row, col)
-            self.legal_moves = piece.get_possible_moves(self.board)
+            self.legal_moves = piece.get_legal_moves(self.board, self.game_state)
         else:
             self._deselect_piece()
 
@@ -473,12 +468,11 @@ class GameManager:
         piece = self.selected_piece
         target = self.board.get_piece_at(to_row, to_col)
         is_capture = target is not None
+        move_notation = move_to_san(self.board, self.board.pack_move(from_row, from_col, to_row, to_col))
         success = self.board.move_piece(from_row, from_col, to_row, to_col)
         if success:
             piece.mark_moved()
-            move_notation = f"{piece.get_symbol()}{self.board.get_square_name(to_row, to_col)}"
-            if is_capture:
-                move_notation = f"{piece.get_symbol()}x{self.board.get_square_name(to_row, to_col)}"
+            piece = sync_promotion(self.board, self.pieces, piece, to_row, to_col)
             self.last_move = {
                 'from': (from_row, from_col),
                 'to': (to_row, to_col),
@@ -522,4 +516,4 @@ class GameManager:
         print("Game reset!")
 
     def cleanup(self):
-        pass
\ No newline at end of file
+        self._release_agents()
\ No newline at end of file
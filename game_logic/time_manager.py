@@ -0,0 +1,133 @@
+"""
+Time Manager
+Per-stage deadlines for the AI turn pipeline
+
+A turn runs three stages, each capped by its config limit:
+    proposals   pieces suggest moves            MAX_PIECE_THINK_TIME
+    synthesis   Queen search + LLM synthesis    MAX_QUEEN_SYNTHESIS_TIME
+    validation  King approval                   MAX_KING_VALIDATION_TIME
+
+The cap is scaled down by game phase (full budget in the middlegame,
+less with the board still full or nearly empty) and by the headroom left
+before the MAX_GAME_MOVES draw. It is never scaled below
+MIN_BUDGET_FRACTION of the cap.
+
+Stages that can check the clock themselves (the proposal loop, the
+alpha-beta search) poll their Deadline and keep the best result so far.
+Calls that cannot, such as LLM requests, go through TimeManager.call,
+which runs them on a daemon thread and returns a default once the
+deadline passes. A late call keeps running after the game has moved on,
+so it must only read what it is given: pass it snapshots (a cloned
+board, copied suggestion dicts), never the live board or chat history,
+and apply its result on the calling thread. Late results are dropped.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import config
+from utils.logger import log_warning
+
+STAGES = ('proposals', 'synthesis', 'validation')
+
+# Share of the cap still granted at the extremes of phase / headroom
+MIN_BUDGET_FRACTION = 0.25
+# Moves before the move cap below which budgets start to shrink
+HEADROOM_MOVES = 40
+
+
+class Deadline:
+    """Time limit of one stage"""
+
+    __slots__ = ('stage', 'budget', 'start', 'end')
+
+    def __init__(self, stage: str, budget: float):
+        self.stage = stage
+        self.budget = budget                # seconds
+        self.start = time.perf_counter()
+        self.end = self.start + budget
+
+    def remaining(self) -> float:
+        """Seconds left (0 once expired)"""
+        return max(0.0, self.end - time.perf_counter())
+
+    def remaining_ms(self) -> float:
+        return self.remaining() * 1000.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.end
+
+    def __repr__(self):
+        return f"Deadline({self.stage}, {self.remaining():.2f}s of {self.budget:.2f}s left)"
+
+
+class TimeManager:
+    """Hands out stage deadlines and enforces them on blocking calls"""
+
+    def __init__(self, move_cap: Optional[int] = None):
+        self.move_cap = move_cap or config.MAX_GAME_MOVES
+        self.limits = {
+            'proposals': config.MAX_PIECE_THINK_TIME,
+            'synthesis': config.MAX_QUEEN_SYNTHESIS_TIME,
+            'validation': config.MAX_KING_VALIDATION_TIME,
+        }
+        self.last_elapsed: Dict[str, float] = {}
+        self.overruns = {stage: 0 for stage in STAGES}
+
+    def budget(self, stage: str, board=None, move_number: int = 0) -> float:
+        """Seconds granted to stage in the current position"""
+        limit = self.limits[stage]
+        factor = 1.0
+        if board is not None:
+            # 0.75 with the board full or bare, 1.0 at phase 0.5
+            phase = board.get_game_phase()
+            factor *= 0.75 + phase * (1.0 - phase)
+        moves_left = self.move_cap - move_number
+        if moves_left < HEADROOM_MOVES:
+            factor *= max(moves_left, 0) / HEADROOM_MOVES
+        return limit * max(factor, MIN_BUDGET_FRACTION)
+
+    def start(self, stage: str, board=None, move_number: int = 0) -> Deadline:
+        """Open the deadline for a stage"""
+        return Deadline(stage, self.budget(stage, board, move_number))
+
+    def finish(self, deadline: Deadline):
+        """Record how long a stage took, counting it as an overrun if it ran past its deadline"""
+        self.last_elapsed[deadline.stage] = deadline.elapsed()
+        if deadline.expired():
+            self.overruns[deadline.stage] += 1
+
+    def call(self, deadline: Deadline, func: Callable, *args, default: Any = None, **kwargs) -> Any:
+        """
+        func(*args, **kwargs), or default if it does not return before the deadline
+
+        The call runs on a daemon thread and hands its result back through
+        a queue only this method reads; a late call is abandoned, not
+        interrupted, and its result is dropped with the queue. func must
+        not mutate state shared with the caller (see the module notes).
+        Exceptions also yield default.
+        """
+        if deadline.expired():
+            return default
+
+        results = queue.Queue(maxsize=1)
+
+        def run():
+            try:
+                results.put((True, func(*args, **kwargs)))
+            except Exception as e:
+                log_warning(f"{deadline.stage} call failed: {e}")
+                results.put((False, None))
+
+        threading.Thread(target=run, daemon=True).start()
+        try:
+            ok, value = results.get(timeout=deadline.remaining())
+        except queue.Empty:
+            log_warning(f"{deadline.stage} call exceeded its {deadline.budget:.2f}s budget")
+            return default
+        return value if ok else default
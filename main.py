@@ -20,13 +20,18 @@ from datetime import datetime
 import config
 from chess_engine.board import Board
 from chess_engine.game_state import GameState
+from chess_engine.rules import Rules
+from chess_engine.zobrist import RepetitionTable
 from pieces.pawn import Pawn
 from pieces.knight import Knight
 from pieces.bishop import Bishop
 from pieces.rook import Rook
 from pieces.queen import Queen
 from pieces.king import King
+from pieces.factory import sync_promotion
 from emotion.emotion_engine import EmotionEngine
+from game_logic.decision_pipeline import rank_proposals
+from game_logic.time_manager import TimeManager
 from utils.logger import setup_logger, log_info, log_error
 
 
@@ -316,7 +321,7 @@ class IntegratedGameManager:
 
         # anti-repetition
         self.recent_moves          = []
-        self.position_hashes       = []
+        self.position_hashes       = RepetitionTable(max_size=60)
         self.piece_last_positions  = {}
 
         # game state
@@ -344,6 +349,24 @@ class IntegratedGameManager:
             self.proximity_chat  = None
             self.has_llm = False
 
+        # Per-stage deadlines for the AI turn
+        self.time_manager = TimeManager()
+
+        # Per-piece proposals in worker processes (enhanced AI only)
+        self.proposal_pool = None
+        if config.PARALLEL_PROPOSALS and self.has_enhanced_ai:
+            from ai_brain.proposal_pool import ProposalPool
+            self.proposal_pool = ProposalPool()
+
+        # Queen's lookahead: alpha-beta search over the whole position
+        self.searcher = None
+        if config.SEARCH_ENABLED and config.SEARCH_WORKERS > 1:
+            from ai_brain.parallel_search import ParallelSearch
+            self.searcher = ParallelSearch()
+        elif config.SEARCH_ENABLED:
+            from ai_brain.search import AlphaBetaSearch
+            self.searcher = AlphaBetaSearch()
+
         try:
             self.emotion_engine = EmotionEngine()
         except:
@@ -364,6 +387,7 @@ class IntegratedGameManager:
         print("✅ Game initialized successfully")
 
     def _setup_pieces(self):
+        self._release_agents()
         self.pieces.clear()
         self.board.clear_board()
 
@@ -385,8 +409,16 @@ class IntegratedGameManager:
                       Bishop('black',0,5), Knight('black',0,6), Rook('black',0,7)]:
             self.pieces.append(piece); self.board.set_piece_at(piece.row, piece.col, piece)
 
+        # The game's own pieces are the agents; register them up front
+        for piece in self.pieces:
+            piece.ensure_agent()
         print(f"  Created {len(self.pieces)} pieces")
 
+    def _release_agents(self):
+        """Drop the agent records of this game's pieces (new game or shutdown)"""
+        for piece in self.pieces:
+            piece.release_agent()
+
     # ── Main update ────────────────────────────────────────────────────────────
 
     def update(self):
@@ -408,11 +440,12 @@ class IntegratedGameManager:
         if b_king is None or b_king.is_captured:
             return True, 'white', 'Black king captured — Checkmate!'
 
-        # Stalemate: current player has no legal moves
-        cur = self.game_state.current_player
-        active = [p for p in self.pieces if p.color == cur and not p.is_captured]
-        any_moves = any(p.get_possible_moves(self.board) for p in active)
-        if not any_moves:
+        # Checkmate / stalemate for the side that moves next
+        to_move = self.board.side_to_move
+        if Rules.is_checkmate(self.board, self.game_state, to_move):
+            winner = 'black' if to_move == 'white' else 'white'
+            return True, winner, f'{to_move.capitalize()} king checkmated — Checkmate!'
+        if Rules.is_stalemate(self.board, self.game_state, to_move):
             return True, 'draw', 'Stalemate — No legal moves!'
 
         # 50-move rule (simplified: 150 half-moves without capture)
@@ -420,8 +453,8 @@ class IntegratedGameManager:
             pass  # skip for now, just use move limit below
 
         # Hard cap: very long game → draw
-        if self.game_state.move_count > 300:
-            return True, 'draw', 'Draw — Game too long (300 moves)'
+        if self.game_state.move_count > config.MAX_GAME_MOVES:
+            return True, 'draw', f'Draw — Game too long ({config.MAX_GAME_MOVES} moves)'
 
         return False, None, ''
 
@@ -449,43 +482,65 @@ class IntegratedGameManager:
             if not active_pieces:
                 return
 
-            suggestions = self._collect_suggestions(active_pieces, current_color)
+            deadline = self.time_manager.start('proposals', self.board, self.total_moves)
+            suggestions = self._collect_suggestions(active_pieces, current_color, deadline)
+            self.time_manager.finish(deadline)
             if not suggestions:
                 self._add_chat_message("System", f"{current_color} has no legal moves!", "SAD")
                 return
 
             suggestions.sort(key=lambda x: x['score'], reverse=True)
 
-            # LLM chatter (best-effort)
+            deadline = self.time_manager.start('synthesis', self.board, self.total_moves)
+
+            # The search line is adopted unless it would repeat the position
+            searched = self._search_suggestion(deadline)
+            if searched:
+                vetoed = self._would_cause_repetition(searched['piece'], searched['to'])
+                suggestions = rank_proposals(suggestions, searched, vetoed)
+
+            # LLM chatter (best-effort, dropped once the synthesis budget is spent).
+            # Late calls outlive the turn, so they only see a snapshot; agent
+            # records are registered first so the snapshot's pieces share them.
+            snapshot = None
+            if self.has_llm:
+                for piece in active_pieces:
+                    piece.ensure_agent()
+                snapshot = self.board.clone()
             if self.has_llm and self.proximity_chat:
-                self._trigger_proximity_chats(active_pieces)
+                chats = self.time_manager.call(
+                    deadline, self._proximity_chats, snapshot,
+                    [snapshot.get_piece_at(p.row, p.col) for p in active_pieces], default=[])
+                self.chat_history.extend(chats)
             if self.has_llm and self.dialogue_system:
-                queen = self._find_piece_by_type(active_pieces, 'queen')
+                queen = snapshot.find_piece('queen', current_color)
                 if queen:
-                    try:
-                        msg = self.dialogue_system.generate_queen_synthesis(
-                            queen, suggestions[:5], self._calculate_board_evaluation())
+                    msg = self.time_manager.call(
+                        deadline, self.dialogue_system.generate_queen_synthesis,
+                        queen, self._snapshot_suggestions(snapshot, suggestions[:5]),
+                        self._calculate_board_evaluation())
+                    if msg:
                         self._add_chat_message(queen.id, msg, queen.current_emotion)
-                    except:
-                        pass
+            self.time_manager.finish(deadline)
 
             best_move = suggestions[0]
 
-            # King veto
+            # King veto (no answer in time counts as approval)
             if self.has_llm and self.dialogue_system:
-                king = self._find_piece_by_type(active_pieces, 'king')
+                king = snapshot.find_piece('king', current_color)
                 if king:
-                    try:
-                        risk = self._assess_move_risk(best_move)
-                        kd = self.dialogue_system.generate_king_approval(
-                            king, f"Move {best_move['piece'].piece_type} to {best_move['to']}", risk)
+                    deadline = self.time_manager.start('validation', self.board, self.total_moves)
+                    risk = self._assess_move_risk(best_move)
+                    kd = self.time_manager.call(
+                        deadline, self.dialogue_system.generate_king_approval,
+                        king, f"Move {best_move['piece'].piece_type} to {best_move['to']}", risk)
+                    self.time_manager.finish(deadline)
+                    if kd:
                         self._add_chat_message(king.id, kd['message'], king.current_emotion)
                         if not kd['approved'] and hasattr(king, 'veto_count') and king.veto_count < 3:
                             king.veto_count += 1
                             if len(suggestions) > 1:
                                 best_move = suggestions[1]
-                    except:
-                        pass
 
             self._execute_move(best_move)
 
@@ -512,10 +567,16 @@ class IntegratedGameManager:
 
     # ── Suggestion collection ──────────────────────────────────────────────────
 
-    def _collect_suggestions(self, active_pieces, color):
+    def _collect_suggestions(self, active_pieces, color, deadline=None):
         suggestions = []
+        pooled = self._pooled_proposals(active_pieces, deadline)
         for piece in active_pieces:
-            if self.has_enhanced_ai:
+            # Out of time: go with the proposals gathered so far
+            if deadline is not None and suggestions and deadline.expired():
+                break
+            if pooled is not None:
+                move_data = pooled.get((piece.row, piece.col))
+            elif self.has_enhanced_ai:
                 try:
                     move_data = self.decision_pipeline.get_best_move_for_piece(
                         piece, self.board, self.game_state)
@@ -547,9 +608,62 @@ class IntegratedGameManager:
             })
         return suggestions
 
+    def _pooled_proposals(self, active_pieces, deadline=None):
+        """Proposals by square from the worker pool, or None to compute them here"""
+        if self.proposal_pool is None:
+            return None
+        try:
+            return self.proposal_pool.propose(self.board, self.game_state, active_pieces,
+                                              deadline.remaining() if deadline else None)
+        except Exception as e:
+            log_error(f"Proposal pool failed, falling back to serial: {e}")
+            self.proposal_pool.shutdown()
+            self.proposal_pool = None
+            return None
+
+    def search_best_move(self, time_limit_ms=None):
+        """Alpha-beta search from the current position (SearchResult, or None if disabled)"""
+        if self.searcher is None:
+            return None
+        return self.searcher.search(self.board, time_limit_ms or config.SEARCH_TIME_MS,
+                                    history=self.position_hashes.counts)
+
+    def _search_suggestion(self, deadline=None):
+        time_limit_ms = config.SEARCH_TIME_MS
+        if deadline is not None:
+            time_limit_ms = max(1.0, min(time_limit_ms,
+                                         deadline.remaining_ms() * config.SEARCH_SYNTHESIS_SHARE))
+        result = self.search_best_move(time_limit_ms)
+        if result is None or not result.best_move:
+            return None
+        from_sq, to_sq = result.best_move & 63, (result.best_move >> 6) & 63
+        piece = self.board.get_piece_at(from_sq >> 3, from_sq & 7)
+        to_pos = (to_sq >> 3, to_sq & 7)
+        line = ' '.join(result.pv_san(self.board))
+        return {
+            'piece':      piece,
+            'from':       (from_sq >> 3, from_sq & 7),
+            'to':         to_pos,
+            'score':      self._proposal_score(piece, to_pos),
+            'confidence': 1.0 if result.is_mate else 0.9,
+            'reasoning':  f"depth {result.depth} search ({result.score:+d}cp): {line}",
+            'pv':         result.pv,
+            'nodes':      result.nodes,
+        }
+
+    def _proposal_score(self, piece, to_pos) -> float:
+        """Heuristic score of a move on the piece proposals' scale (used as is if vetoed)"""
+        if self.has_enhanced_ai:
+            try:
+                return self.decision_pipeline.evaluator.evaluate_move(
+                    self.board, piece, to_pos, self.game_state)
+            except Exception:
+                pass
+        return self._score_move(piece, to_pos)
+
     def _would_cause_repetition(self, piece, to_pos) -> bool:
         h = self._simulate_position_hash(piece, to_pos)
-        if h in self.position_hashes[-6:]:
+        if self.position_hashes.in_recent(h, 6):
             return True
         hist = self.piece_last_positions.get(piece.id, [])
         if to_pos in hist[-2:]:
@@ -557,7 +671,7 @@ class IntegratedGameManager:
         return False
 
     def _find_non_repeating_move(self, piece):
-        moves = piece.get_possible_moves(self.board)
+        moves = piece.get_legal_moves(self.board, self.game_state)
         random.shuffle(moves)
         for mv in moves:
             if not self._would_cause_repetition(piece, mv):
@@ -593,7 +707,7 @@ class IntegratedGameManager:
         random.shuffle(candidates)
 
         for piece in candidates:
-            moves = piece.get_possible_moves(self.board)
+            moves = piece.get_legal_moves(self.board, self.game_state)
             random.shuffle(moves)
             for mv in moves:
                 if self._simulate_position_hash(piece, mv) not in self.position_hashes:
@@ -614,7 +728,7 @@ class IntegratedGameManager:
 
         # absolute fallback
         for piece in pieces:
-            moves = piece.get_possible_moves(self.board)
+            moves = piece.get_legal_moves(self.board, self.game_state)
             if moves:
                 self._execute_move({'piece': piece, 'from': (piece.row, piece.col),
                                     'to': random.choice(moves), 'score': 0.0})
@@ -623,18 +737,11 @@ class IntegratedGameManager:
                 self.last_move_time = time.time()
                 return
 
-    def _simulate_position_hash(self, piece, move) -> str:
-        positions = []
-        for p in self.pieces:
-            if p.is_captured:
-                continue
-            positions.append(f"{p.id}:{move[0]},{move[1]}" if p == piece
-                             else f"{p.id}:{p.row},{p.col}")
-        return "|".join(sorted(positions))
+    def _simulate_position_hash(self, piece, move) -> int:
+        return self.board.key_after_move(piece.row, piece.col, move[0], move[1])
 
-    def _get_position_hash(self) -> str:
-        return "|".join(sorted(
-            f"{p.id}:{p.row},{p.col}" for p in self.pieces if not p.is_captured))
+    def _get_position_hash(self) -> int:
+        return self.board.zobrist_key
 
     # ── Execute move (records history) ────────────────────────────────────────
 
@@ -650,6 +757,7 @@ class IntegratedGameManager:
 
         self.board.move_piece(from_row, from_col, to_row, to_col)
         piece.mark_moved()
+        piece = sync_promotion(self.board, self.pieces, piece, to_row, to_col)
 
         from_pos = (from_row, from_col)
         to_pos   = (to_row,   to_col)
@@ -664,10 +772,7 @@ class IntegratedGameManager:
         if len(self.piece_last_positions[piece.id]) > 6:
             self.piece_last_positions[piece.id].pop(0)
 
-        ph = self._get_position_hash()
-        self.position_hashes.append(ph)
-        if len(self.position_hashes) > 60:
-            self.position_hashes.pop(0)
+        self.position_hashes.append(self._get_position_hash())
 
         from_sq = self.board.get_square_name(from_row, from_col)
         to_sq   = self.board.get_square_name(to_row,   to_col)
@@ -675,20 +780,25 @@ class IntegratedGameManager:
 
     # ── Utilities ──────────────────────────────────────────────────────────────
 
-    def _trigger_proximity_chats(self, active_pieces):
+    def _proximity_chats(self, board, active_pieces):
+        """Chat messages between nearby pieces of a board snapshot (the caller records them)"""
+        messages = []
         for piece in active_pieces[:3]:
             nearby = [o for o in active_pieces if o != piece
                       and abs(piece.row-o.row)+abs(piece.col-o.col) <= 2]
             if nearby and self.proximity_chat:
                 try:
-                    msg = self.proximity_chat.trigger_proximity_chat(piece, nearby, self.board)
+                    msg = self.proximity_chat.trigger_proximity_chat(piece, nearby, board)
                     if msg:
-                        self.chat_history.append(msg)
+                        messages.append(msg)
                 except:
                     pass
+        return messages
 
-    def _find_piece_by_type(self, pieces, pt):
-        return next((p for p in pieces if p.piece_type == pt), None)
+    @staticmethod
+    def _snapshot_suggestions(snapshot, suggestions):
+        """Copies of suggestions pointing at the snapshot's pieces"""
+        return [dict(s, piece=snapshot.get_piece_at(*s['from'])) for s in suggestions]
 
     def _calculate_board_evaluation(self):
         color = self.game_state.current_player
@@ -734,7 +844,11 @@ class IntegratedGameManager:
         pass
 
     def cleanup(self):
-        pass
+        self._release_agents()
+        if self.proposal_pool is not None:
+            self.proposal_pool.shutdown()
+        if hasattr(self.searcher, 'shutdown'):
+            self.searcher.shutdown()
 
 
 # ─── Main loop ────────────────────────────────────────────────────────────────
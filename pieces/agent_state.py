@@ -0,0 +1,64 @@
+"""
+Agent State
+Per-piece AI agent data, kept apart from the engine's piece records
+
+Engine pieces are small __slots__ records (color, type, square, movement
+flags). Everything the multi-agent layer attaches to a piece - IQ,
+personality, emotion, brain, messages, display id - lives in an
+AgentState held by the AGENTS registry under a small integer id. Copies
+of a piece (e.g. in Board.clone) copy only that integer, so look-ahead
+never duplicates agent data. Records are created on first use
+(BasePiece.ensure_agent): pieces built for FEN setup, search, perft or
+benchmarks never register one. The game managers release their pieces'
+records when they set up a new game or shut down, so the registry holds
+only the agents of the games in progress.
+"""
+
+from typing import Dict
+
+
+class AgentState:
+    """AI agent data for one piece"""
+
+    __slots__ = ('agent_id', 'id', 'iq', 'personality', 'current_emotion',
+                 'brain', 'message_queue', 'veto_count')
+
+    def __init__(self, agent_id: int, name: str, iq: float, personality: Dict[str, float]):
+        self.agent_id = agent_id
+        self.id = name                  # display id, e.g. "white_knight_7_1"
+        self.iq = iq
+        self.personality = personality
+        self.current_emotion = 'NEUTRAL'
+        self.brain = None
+        self.message_queue = []
+        self.veto_count = 0             # used by kings only
+
+
+class AgentRegistry:
+    """AgentState records indexed by integer agent id"""
+
+    def __init__(self):
+        self._states: Dict[int, AgentState] = {}
+        self._next_id = 0
+
+    def create(self, name: str, iq: float, personality: Dict[str, float]) -> int:
+        """Register a new agent and return its id"""
+        agent_id = self._next_id
+        self._next_id += 1
+        self._states[agent_id] = AgentState(agent_id, name, iq, personality)
+        return agent_id
+
+    def get(self, agent_id: int) -> AgentState:
+        """AgentState for an id"""
+        return self._states[agent_id]
+
+    def release(self, agent_id: int):
+        """Forget an agent; its id is never handed out again"""
+        self._states.pop(agent_id, None)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+# Process-wide registry shared by all pieces
+AGENTS = AgentRegistry()
@@ -7,11 +7,17 @@ from abc import ABC, abstractmethod
 from typing import List, Tuple, Optional, Dict
 import random
 import config
+from chess_engine.bitboard import to_coords
+from pieces.agent_state import AGENTS, AgentState
 
 
 class BasePiece(ABC):
     """Abstract base class for all chess pieces"""
 
+    # Engine core only; AI agent data lives in pieces.agent_state.AGENTS
+    __slots__ = ('color', 'piece_type', 'row', 'col', 'has_moved', 'move_count',
+                 'is_captured', 'is_selected', 'start_square', 'agent_id')
+
     def __init__(self, color: str, row: int, col: int, piece_type: str, iq: float = None):
         """
         Initialize a chess piece
@@ -28,12 +34,6 @@ class BasePiece(ABC):
         self.col = col
         self.piece_type = piece_type
 
-        # Assign IQ based on piece type
-        if iq is None:
-            self.iq = config.get_piece_iq(piece_type, randomize=True)
-        else:
-            self.iq = iq
-
         # Movement tracking
         self.has_moved = False
         self.move_count = 0
@@ -42,18 +42,33 @@ class BasePiece(ABC):
         self.is_captured = False
         self.is_selected = False
 
-        # Emotion and personality
-        self.current_emotion = 'NEUTRAL'
-        self.personality = self._load_personality()
-
-        # AI brain (will be initialized by game manager)
-        self.brain = None
-
-        # Communication
-        self.message_queue = []
-
-        # Unique identifier
-        self.id = f"{color}_{piece_type}_{row}_{col}"
+        # The display id names the square the piece was created on, even if
+        # its agent record is only registered after it has moved
+        self.start_square = row * 8 + col
+
+        # IQ, emotion, personality, brain (set by game manager), messages and
+        # the unique identifier are kept in the agent registry. The record is
+        # created on first use, so FEN, search and benchmark pieces that never
+        # touch agent data never register one.
+        self.agent_id = None
+        if iq is not None:
+            self.ensure_agent(iq)
+
+    def ensure_agent(self, iq: float = None) -> AgentState:
+        """Agent record for this piece, registering it (IQ by piece type if None) if missing"""
+        if self.agent_id is None:
+            if iq is None:
+                iq = config.get_piece_iq(self.piece_type, randomize=True)
+            row, col = divmod(self.start_square, 8)
+            self.agent_id = AGENTS.create(f"{self.color}_{self.piece_type}_{row}_{col}", iq,
+                                          self._load_personality())
+        return AGENTS.get(self.agent_id)
+
+    def release_agent(self):
+        """Drop this piece's agent record (copies sharing it must not use it afterwards)"""
+        if self.agent_id is not None:
+            AGENTS.release(self.agent_id)
+            self.agent_id = None
 
     def _load_personality(self) -> Dict[str, float]:
         """Load personality traits from config"""
@@ -65,39 +80,107 @@ class BasePiece(ABC):
             'loyalty': 0.5
         })
 
+    # ==================== AGENT STATE ====================
+    @property
+    def agent(self) -> AgentState:
+        """AI agent record for this piece, created on first access"""
+        if self.agent_id is None:
+            return self.ensure_agent()
+        return AGENTS.get(self.agent_id)
+
+    @property
+    def id(self) -> str:
+        return self.agent.id
+
+    @property
+    def iq(self) -> float:
+        return self.agent.iq
+
+    @iq.setter
+    def iq(self, value: float):
+        self.agent.iq = value
+
+    @property
+    def personality(self) -> Dict[str, float]:
+        return self.agent.personality
+
+    @personality.setter
+    def personality(self, value: Dict[str, float]):
+        self.agent.personality = value
+
+    @property
+    def current_emotion(self) -> str:
+        return self.agent.current_emotion
+
+    @current_emotion.setter
+    def current_emotion(self, value: str):
+        self.agent.current_emotion = value
+
+    @property
+    def brain(self):
+        return self.agent.brain
+
+    @brain.setter
+    def brain(self, value):
+        self.agent.brain = value
+
+    @property
+    def message_queue(self) -> List[Dict]:
+        return self.agent.message_queue
+
+    @property
+    def square(self) -> int:
+        """Square index (row * 8 + col)"""
+        return self.row * 8 + self.col
+
+    def copy(self) -> 'BasePiece':
+        """
+        Copy of the engine core; the copy shares this piece's agent state
+
+        A piece whose agent record does not exist yet is copied without
+        one, and each copy creates its own if it ever needs agent data.
+        """
+        clone = object.__new__(type(self))
+        for slot in BasePiece.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        return clone
+
     @abstractmethod
+    def get_move_mask(self, board) -> int:
+        """
+        Get the bitboard of pseudo-legal destination squares for this piece
+        Must be implemented by subclasses (one lookup in chess_engine.attack_tables)
+
+        Returns:
+            64-bit mask with one bit per destination square (square = row * 8 + col)
+        """
+        pass
+
     def get_possible_moves(self, board) -> List[Tuple[int, int]]:
         """
         Get all possible moves for this piece (before checking legality)
-        Must be implemented by subclasses
 
         Returns:
             List of (row, col) tuples representing possible destination squares
         """
-        pass
+        return to_coords(self.get_move_mask(board))
 
     def get_legal_moves(self, board, game_state) -> List[Tuple[int, int]]:
         """
         Get all legal moves (possible moves that don't leave king in check)
 
+        Pins, checks, castling and en passant are resolved once per position
+        by chess_engine.movegen, so no move is played out to test it.
+
         Returns:
             List of (row, col) tuples representing legal moves
         """
-        possible_moves = self.get_possible_moves(board)
-        legal_moves = []
-
-        # Filter out moves that would leave own king in check
-        for move in possible_moves:
-            if self._is_move_legal(board, game_state, move):
-                legal_moves.append(move)
-
-        return legal_moves
+        return to_coords(board.get_legal_move_mask(self.row, self.col))
 
     def _is_move_legal(self, board, game_state, move: Tuple[int, int]) -> bool:
         """Check if a move is legal (doesn't expose king to check)"""
-        # This will be implemented with proper check detection
-        # For now, accept all possible moves as legal
-        return True
+        row, col = move
+        return bool((board.get_legal_move_mask(self.row, self.col) >> (row * 8 + col)) & 1)
 
     def suggest_move(self, board, game_state) -> Optional[Dict]:
         """
@@ -0,0 +1,41 @@
+"""
+Piece Factory
+Creates piece objects from a type name (used for promotion and FEN setup)
+and keeps a game's piece list in step with the board after a promotion
+"""
+
+from pieces.pawn import Pawn
+from pieces.knight import Knight
+from pieces.bishop import Bishop
+from pieces.rook import Rook
+from pieces.queen import Queen
+from pieces.king import King
+
+PIECE_CLASSES = {
+    'pawn': Pawn,
+    'knight': Knight,
+    'bishop': Bishop,
+    'rook': Rook,
+    'queen': Queen,
+    'king': King
+}
+
+
+def create_piece(piece_type: str, color: str, row: int, col: int):
+    """Create a new piece of the given type at (row, col)"""
+    return PIECE_CLASSES[piece_type](color, row, col)
+
+
+def sync_promotion(board, pieces: list, piece, row: int, col: int):
+    """
+    Piece now standing on (row, col) after piece moved there
+
+    If piece was a pawn that promoted, the promoted piece replaces it in
+    pieces and the pawn's agent record is released.
+    """
+    placed = board.get_piece_at(row, col)
+    if placed is not None and placed is not piece and piece in pieces:
+        pieces[pieces.index(piece)] = placed
+        piece.release_agent()
+        return placed
+    return piece
@@ -10,6 +10,7 @@ from pieces.bishop import Bishop
 from pieces.rook import Rook
 from pieces.queen import Queen
 from pieces.king import King
+from pieces.factory import PIECE_CLASSES, create_piece, sync_promotion
 
 __all__ = [
     'BasePiece',
@@ -18,5 +19,8 @@ __all__ = [
     'Bishop',
     'Rook',
     'Queen',
-    'King'
+    'King',
+    'PIECE_CLASSES',
+    'create_piece',
+    'sync_promotion'
 ]
\ No newline at end of file
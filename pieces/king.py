@@ -1,24 +1,27 @@
 from .base_piece import BasePiece
+from chess_engine.attack_tables import KING_ATTACKS
+from chess_engine.bitboard import COLOR_INDEX
 
 
 class King(BasePiece):
+    __slots__ = ()
+
     def __init__(self, color, row, col):
         super().__init__(color, row, col, 'king')
-        self.veto_count = 0
 
-    def get_possible_moves(self, board):
-        moves = []
+    @property
+    def veto_count(self):
+        # Vetoes used so far (agent state, shared by board copies)
+        return self.agent.veto_count
+
+    @veto_count.setter
+    def veto_count(self, value):
+        self.agent.veto_count = value
+
+    def get_move_mask(self, board):
         # One square in any direction
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                new_row, new_col = self.row + dr, self.col + dc
-                if board.is_valid_position(new_row, new_col):
-                    target = board.get_piece_at(new_row, new_col)
-                    if target is None or self.is_enemy(target):
-                        moves.append((new_row, new_col))
-        return moves
+        own = board.color_bb[COLOR_INDEX[self.color]]
+        return KING_ATTACKS[self.row * 8 + self.col] & ~own
 
     def validate_queen_decision(self, queen_move, board, game_state):
         # King's approval/veto logic
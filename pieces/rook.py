@@ -1,30 +1,15 @@
 from .base_piece import BasePiece
+from chess_engine.attack_tables import rook_attacks
+from chess_engine.bitboard import COLOR_INDEX
 
 
 class Rook(BasePiece):
+    __slots__ = ()
+
     def __init__(self, color, row, col):
         super().__init__(color, row, col, 'rook')
 
-    def get_possible_moves(self, board):
-        moves = []
-        # Horizontal and vertical moves
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-        for dr, dc in directions:
-            for dist in range(1, 8):
-                new_row = self.row + dr * dist
-                new_col = self.col + dc * dist
-
-                if not board.is_valid_position(new_row, new_col):
-                    break
-
-                target = board.get_piece_at(new_row, new_col)
-                if target is None:
-                    moves.append((new_row, new_col))
-                elif self.is_enemy(target):
-                    moves.append((new_row, new_col))
-                    break
-                else:
-                    break
-
-        return moves
\ No newline at end of file
+    def get_move_mask(self, board):
+        # Horizontal and vertical rays from the precomputed slider table
+        own = board.color_bb[COLOR_INDEX[self.color]]
+        return rook_attacks(self.row * 8 + self.col, board.occupied) & ~own
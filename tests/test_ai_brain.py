@@ -0,0 +1,351 @@
+"""
+AI brain tests
+Alpha-beta search, transposition table and move ordering
+"""
+
+import time
+
+import pytest
+
+import config
+from ai_brain.move_ordering import MoveOrdering
+from ai_brain.search import MATE_SCORE, AlphaBetaSearch
+from ai_brain.transposition import EXACT, LOWER, UPPER, TranspositionTable
+from chess_engine.board import Board
+from chess_engine.move import move_from_uci, move_to_san, move_to_uci
+from chess_engine.perft import STANDARD_POSITIONS, START_FEN
+
+
+def _board(fen):
+    board = Board()
+    board.load_fen(fen)
+    return board
+
+
+@pytest.mark.parametrize('fen,san', [
+    ("7k/8/6K1/8/8/8/8/Q7 w - - 0 1", {'Qa8#', 'Qg7#'}),
+    ("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1", {'Rd8#'}),
+    ("r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4", {'Qxf7#'}),
+])
+def test_search_finds_mate_in_one(fen, san):
+    board = _board(fen)
+    result = AlphaBetaSearch().search(board, max_depth=3)
+    assert move_to_san(board, result.best_move) in san
+    assert result.is_mate and result.score == MATE_SCORE - 1
+    assert board.to_fen() == fen
+
+
+def test_quiescence_sees_recapture():
+    # At depth 1 Qxd5 wins a pawn unless the search looks at cxd5
+    board = _board("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1")
+    result = AlphaBetaSearch().search(board, max_depth=1)
+    assert move_to_uci(result.best_move) != 'd1d5'
+
+
+def test_search_without_moves():
+    board = _board("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")   # stalemate
+    result = AlphaBetaSearch().search(board, max_depth=2)
+    assert result.best_move == 0 and result.score == 0
+
+
+@pytest.mark.parametrize('fen', [START_FEN, STANDARD_POSITIONS[1][1]])
+def test_search_respects_time_limit(fen):
+    board = _board(fen)
+    key = board.zobrist_key
+    start = time.perf_counter()
+    result = AlphaBetaSearch().search(board, time_limit_ms=300)
+    assert time.perf_counter() - start < 1.0
+    assert result.depth >= 1 and result.pv[0] == result.best_move
+    assert board.to_fen() == fen and board.zobrist_key == key
+
+
+def test_search_scores_repetition_as_draw():
+    board = _board("k7/8/8/8/8/8/8/K2q3R w - - 0 1")
+    search = AlphaBetaSearch()
+    assert search.search(board, max_depth=3).score > 400
+
+    # Rxd1 wins the queen, unless the resulting position was already played
+    undo = board.make_move(board.pack_move(7, 7, 7, 3))
+    seen = board.zobrist_key
+    board.unmake_move(undo)
+    assert search.search(board, max_depth=3, history=[seen]).score == 0
+
+
+def test_tt_size_follows_budget():
+    tt = TranspositionTable(size_mb=1)
+    assert len(tt) * 16 == 1 << 20
+    assert tt.fill_rate == 0.0 and tt.hit_rate == 0.0
+
+
+def test_tt_store_and_probe():
+    tt = TranspositionTable(size_mb=1)
+    key = (1 << 63) | 12345
+    assert tt.probe(key) is None
+    tt.store(key, 7, LOWER, -29990, 0xC1F4)
+    assert tt.probe(key) == (0xC1F4, -29990, 7, LOWER)
+    assert tt.probe(key ^ (1 << 40)) is None
+    assert tt.hit_rate == 1 / 3
+    assert tt.fill_rate == 1 / len(tt)
+
+
+def test_tt_bucket_replacement():
+    tt = TranspositionTable(size_mb=1)
+    deep, shallow, other = 5, 5 + tt.bucket_count, 5 + 2 * tt.bucket_count   # one bucket
+    tt.store(deep, 8, EXACT, 10, 1)
+    tt.store(shallow, 2, UPPER, 20, 2)
+    tt.store(other, 3, LOWER, 30, 3)
+    # The deep entry keeps its slot; the always-replace slot holds the latest
+    assert tt.probe(deep) == (1, 10, 8, EXACT)
+    assert tt.probe(shallow) is None
+    assert tt.probe(other) == (3, 30, 3, LOWER)
+
+    tt.new_search()
+    tt.store(shallow, 1, UPPER, 20, 2)      # entries from older searches give way
+    assert tt.probe(deep) is None
+    assert tt.probe(shallow) == (2, 20, 1, UPPER)
+
+
+def test_search_reuses_table():
+    board = _board(STANDARD_POSITIONS[1][1])
+    search = AlphaBetaSearch(tt=TranspositionTable(size_mb=1))
+    first = search.search(board, max_depth=3)
+    second = search.search(board, max_depth=3)
+    assert second.best_move == first.best_move and second.score == first.score
+    assert second.nodes < first.nodes
+    assert search.tt.hit_rate > 0 and search.tt.fill_rate > 0
+
+
+def test_ordering_stages():
+    # Pawn takes queen or rook, queen takes rook (wins after dxe5), rook takes a defended knight
+    board = _board("4k3/8/8/1pq1r3/n2P4/8/8/R3QK2 w - - 0 1")
+    ordering = MoveOrdering()
+    codes = board.get_legal_move_codes('white')
+    hash_move = move_from_uci('a1a2', board)
+    killer = move_from_uci('f1g1', board)
+    ordering.record_cutoff('white', killer, 3, 0)
+
+    order = [move_to_uci(code) for code in ordering.ordered(board, codes, 0, hash_move)]
+    assert sorted(order) == sorted(move_to_uci(code) for code in codes)
+    assert order[:5] == ['a1a2', 'd4c5', 'd4e5', 'e1e5', 'f1g1']
+    assert order[-1] == 'a1a4'
+
+
+def test_ordering_learns_from_cutoffs():
+    ordering = MoveOrdering()
+    board = _board(START_FEN)
+    e4, d4, nf3 = (move_from_uci(text, board) for text in ('e2e4', 'd2d4', 'g1f3'))
+    ordering.record_cutoff('white', nf3, 4, 2, prev_move=e4, tried=[d4])
+    assert ordering.killers[2][0] == nf3
+    assert ordering.countermoves[e4 & 0xFFF] == nf3
+    assert ordering.history[nf3 & 0xFFF] > 0 > ordering.history[d4 & 0xFFF]
+    assert ordering.history[4096 + (nf3 & 0xFFF)] == 0
+
+    quiets = [move_to_uci(c) for c in ordering.ordered(board, board.get_legal_move_codes('white'), 5)]
+    assert quiets[0] == 'g1f3' and quiets[-1] == 'd2d4'
+
+    ordering.new_search()
+    assert ordering.killers[2] == [0, 0]
+
+
+def test_evaluation_terms_follow_their_pieces():
+    from ai_brain.move_evaluator import MoveEvaluator
+
+    board = _board(STANDARD_POSITIONS[1][1])
+    for cache in (MoveEvaluator.pawn_cache, MoveEvaluator.king_cache, MoveEvaluator.activity_cache):
+        cache.clear()
+    before = MoveEvaluator.evaluate_board(board, 'white')
+    assert MoveEvaluator.evaluate_board(board, 'white') == before
+    assert MoveEvaluator.activity_cache.hits == 1
+
+    # A knight move leaves both pawn structures alone
+    undo = board.make_move(move_from_uci('e5d3', board))
+    MoveEvaluator.evaluate_board(board, 'white')
+    assert MoveEvaluator.pawn_cache.misses == 1 and MoveEvaluator.activity_cache.misses == 2
+    board.unmake_move(undo)
+    assert MoveEvaluator.evaluate_board(board, 'white') == before
+
+
+def test_evaluator_shared_context():
+    from ai_brain.enhanced_strategy import EnhancedMoveEvaluator
+    from chess_engine.game_state import GameState
+
+    board = _board("4k3/8/8/b7/8/8/8/R2QK1NR w KQ - 0 1")
+    game_state = GameState()
+    context = board.get_attack_context('white')
+    scores = {}
+    for piece in board.get_all_pieces('white'):
+        for move in piece.get_legal_moves(board, game_state):
+            score = EnhancedMoveEvaluator.evaluate_move(board, piece, move, game_state, context)
+            assert score == EnhancedMoveEvaluator.evaluate_move(board, piece, move, game_state)
+            scores[(piece.piece_type, move)] = score
+    # Taking the checker beats every other way out of check
+    assert max(scores, key=scores.get) == ('rook', (3, 0))
+
+
+def test_proposal_pool_matches_serial():
+    from ai_brain.enhanced_strategy import SmartDecisionPipeline
+    from ai_brain.proposal_pool import ProposalPool
+    from chess_engine.game_state import GameState
+
+    board = _board(STANDARD_POSITIONS[1][1])
+    game_state = GameState()
+    pieces = board.get_all_pieces('white')
+    pool = ProposalPool(workers=2)
+    try:
+        pooled = pool.propose(board, game_state, pieces, timeout=30)
+    finally:
+        pool.shutdown()
+
+    pipeline = SmartDecisionPipeline()
+    for piece in pieces:
+        serial = pipeline.get_best_move_for_piece(piece, board, game_state)
+        proposal = pooled.get((piece.row, piece.col))
+        assert (proposal is None) == (serial is None)
+        if serial:
+            assert (proposal['to'], proposal['score']) == (serial['to'], serial['score'])
+
+
+def test_parallel_search_shares_table():
+    from ai_brain.parallel_search import ParallelSearch
+
+    search = ParallelSearch(workers=2, size_mb=1)
+    try:
+        board = _board("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1")
+        result = search.search(board, max_depth=3)
+        assert move_to_san(board, result.best_move) == 'Rd8#' and result.is_mate
+
+        board = _board(START_FEN)
+        result = search.search(board, max_depth=3)
+        assert [w['worker'] for w in result.workers] == [0, 1]
+        assert result.depth == 3 and result.nodes == sum(w['nodes'] for w in result.workers)
+        assert all(w['nps'] >= 0 for w in result.workers)
+        assert search.tt.fill_rate > 0
+        assert board.to_fen() == START_FEN
+    finally:
+        search.shutdown()
+
+
+def test_parallel_search_helpers_store_current_generation():
+    from ai_brain.parallel_search import ParallelSearch
+
+    search = ParallelSearch(workers=2, size_mb=1)
+    try:
+        for fen in (START_FEN, "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"):
+            result = search.search(_board(fen), max_depth=3)
+            assert result.workers[1]['nodes'] > 0
+        # Entries of the last search, the helper's included, carry the main table's generation
+        data = [int(d) for d in search.tt.data if d]
+        generations = {(d >> 42) & 63 for d in data}
+        assert search.tt.generation in generations
+        assert generations <= {search.tt.generation, search.tt.generation - 1}
+    finally:
+        search.shutdown()
+
+
+def test_batched_inference_one_pass_per_type():
+    pytest.importorskip('torch')
+    from ai_brain.batched_inference import BatchedInference, encode_position
+    from chess_engine.game_state import GameState
+
+    board = _board(START_FEN)
+    features = encode_position(board, 'white')
+    assert features.shape == (768,) and int(features.sum()) == 32
+    # Black's view of the start position is white's
+    assert (encode_position(board, 'black') == features).all()
+
+    inference = BatchedInference()
+    pieces = board.get_all_pieces('white')
+    suggestions = inference.infer(board, pieces)
+    assert inference.forward_passes == 2        # only pawns and knights can move
+    game_state = GameState()
+    for piece in pieces:
+        legal = piece.get_legal_moves(board, game_state)
+        suggestion = suggestions.get((piece.row, piece.col))
+        assert (suggestion is None) == (not legal)
+        if suggestion:
+            assert set(suggestion['probabilities']) == set(legal)
+            assert abs(sum(suggestion['probabilities'].values()) - 1.0) < 1e-5
+            assert suggestion['to'] in legal
+            assert suggestion['confidence'] == max(suggestion['probabilities'].values())
+
+
+def test_model_registry_shares_and_swaps(tmp_path):
+    torch = pytest.importorskip('torch')
+    from ai_brain.model_registry import ModelRegistry
+    from ai_brain.neural_network import NeuralNetwork
+    from ai_brain.piece_brain import PieceBrain
+    from ai_brain.batched_inference import BatchedInference
+
+    registry = ModelRegistry()
+    inference = BatchedInference(registry)
+    brains = [PieceBrain('pawn', 100, inference) for _ in range(8)]
+    assert all(brain.model is registry.get('pawn') for brain in brains)
+    assert list(registry.loaded()) == ['pawn']
+    assert not any(p.requires_grad for p in registry.get('pawn').parameters())
+
+    old = registry.get('pawn')
+    path = tmp_path / 'pawn_model.pth'
+    torch.save(NeuralNetwork(config.NN_CONFIGS['pawn']['layers']).state_dict(), path)
+    registry.swap('pawn', str(path)).join()
+    assert registry.get('pawn') is not old and brains[0].model is registry.get('pawn')
+    assert registry.versions['pawn'] == 1
+
+    # A broken checkpoint keeps the current network
+    path.write_bytes(b'not a checkpoint')
+    registry.swap('pawn', str(path), background=False)
+    assert registry.versions['pawn'] == 1
+
+
+def test_frozen_int8_model():
+    torch = pytest.importorskip('torch')
+    from ai_brain.benchmark_inference import compare, sample_positions
+    from ai_brain.neural_network import NeuralNetwork
+
+    model = NeuralNetwork(config.NN_CONFIGS['rook']['layers']).freeze(quantize=True)
+    assert not any(isinstance(layer, torch.nn.Dropout) for layer in model.layers)
+    assert not model.training
+
+    inputs = sample_positions(8)
+    assert inputs.shape == (8, config.NN_INPUT_SIZE)
+    report = compare('rook', inputs, batch=4, repeats=1)
+    assert report['top1_agreement'] > 0.5 and report['prob_mae'] < 0.05
+
+
+@pytest.mark.parametrize("name,fen", [(name, fen) for name, fen, _ in STANDARD_POSITIONS])
+def test_nnue_accumulator_follows_moves(name, fen):
+    from ai_brain.nnue import Accumulator, NNUEEvaluator, NNUENetwork
+    from chess_engine import psqt
+
+    def material_and_psqt(board):
+        score = (board.material[0] - board.material[1]) * 100 + board.psqt_mg[0] - board.psqt_mg[1]
+        for ci, sign in ((0, 1), (1, -1)):
+            if board.king_square[ci] >= 0:
+                score -= sign * psqt.PSQT_MG[ci][5][board.king_square[ci]]
+        return score
+
+    evaluator = NNUEEvaluator(NNUENetwork.bootstrap())
+    board = _board(fen)
+    for code in board.get_legal_move_codes(board.side_to_move):
+        undo = board.make_move(code)
+        assert abs(evaluator.evaluate_white(board) - material_and_psqt(board)) <= 1
+        fresh = Accumulator(evaluator.network, board).current()
+        assert abs(board.accumulator.values - fresh).max() < 1e-4
+        board.unmake_move(undo)
+    assert abs(evaluator.evaluate_white(board) - material_and_psqt(board)) <= 1
+
+
+def test_nnue_selectable_evaluator(tmp_path, monkeypatch):
+    from ai_brain.move_evaluator import MoveEvaluator
+    from ai_brain.nnue import NNUENetwork, get_evaluator
+
+    path = tmp_path / 'nnue.npz'
+    NNUENetwork.bootstrap().save(str(path))
+    loaded = NNUENetwork.load(str(path))
+    assert (loaded.ft_weight == NNUENetwork.bootstrap().ft_weight).all()
+
+    board = _board(STANDARD_POSITIONS[1][1])
+    monkeypatch.setattr(config, 'EVALUATOR', 'nnue')
+    score = get_evaluator().evaluate_white(board)
+    assert MoveEvaluator.evaluate_static(board) == score
+    assert MoveEvaluator.evaluate_board(board, 'black') == -score / 100.0
+    assert AlphaBetaSearch().search(board, max_depth=2).best_move
@@ -0,0 +1,232 @@
+"""
+Chess engine tests
+Perft node counts on the standard positions, FEN round trips, move encoding and SEE
+"""
+
+from array import array
+
+import numpy as np
+import pytest
+
+from chess_engine.board import Board
+from chess_engine.encoder import FeatureEncoder
+from chess_engine.move import (
+    FLAG_CASTLE, FLAG_EN_PASSANT, Move, decode_move, encode_move,
+    move_from_san, move_from_uci, move_to_san, move_to_uci,
+)
+from chess_engine.perft import STANDARD_POSITIONS, START_FEN, divide, perft
+from chess_engine.perft import main as perft_main
+from chess_engine.see import see, see_ge
+
+# Depth per position that keeps the whole suite to a few seconds
+SUITE_DEPTH = {
+    'startpos': 3,
+    'kiwipete': 2,
+    'position3': 3,
+    'position4': 2,
+    'position5': 2,
+    'position6': 2,
+}
+
+
+def _cases():
+    for name, fen, expected in STANDARD_POSITIONS:
+        for depth, nodes in enumerate(expected[:SUITE_DEPTH[name]], start=1):
+            yield pytest.param(fen, depth, nodes, id=f"{name}-d{depth}")
+
+
+@pytest.mark.parametrize('fen,depth,nodes', list(_cases()))
+def test_perft_standard_positions(fen, depth, nodes):
+    board = Board()
+    board.load_fen(fen)
+    assert perft(board, depth) == nodes
+
+
+@pytest.mark.parametrize('name,fen', [(name, fen) for name, fen, _ in STANDARD_POSITIONS])
+def test_perft_restores_position(name, fen):
+    board = Board()
+    board.load_fen(fen)
+    key = board.zobrist_key
+    perft(board, 2)
+    assert board.to_fen() == fen
+    assert board.zobrist_key == key == board.compute_zobrist_key()
+
+
+def test_divide_startpos():
+    board = Board()
+    board.load_fen(START_FEN)
+    counts = divide(board, 2)
+    assert len(counts) == 20
+    assert counts['e2e4'] == 20
+    assert sum(counts.values()) == 400
+
+
+def test_perft_cli_arguments(capsys):
+    # A lone integer is the suite depth
+    assert perft_main(['1']) == 0
+    assert 'depth 2' not in capsys.readouterr().out
+    with pytest.raises(SystemExit) as exc:
+        perft_main(['not-a-fen', '2'])
+    assert exc.value.code == 2
+    assert 'Invalid FEN' in capsys.readouterr().err
+
+
+def test_load_fen_rejects_malformed():
+    board = Board()
+    with pytest.raises(ValueError):
+        board.load_fen("8/8/8 w - - 0 1")
+    with pytest.raises(ValueError):
+        board.load_fen("rnbqkbnr/ppppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+
+
+def test_move_encoding_round_trip():
+    code = encode_move(12, 4, promotion='knight')
+    assert code < 1 << 16
+    assert decode_move(code) == (12, 4, 1, 'knight')
+    assert move_to_uci(code) == 'e7e8n'
+    assert move_from_uci('e7e8n') == code
+
+    move = Move((6, 4), (4, 4), 'pawn')
+    assert (move.from_pos, move.to_pos, move.promotion) == ((6, 4), (4, 4), None)
+    assert Move.from_code(move.code) == move
+    assert move.to_algebraic() == 'e2e4'
+
+
+def test_legal_move_codes_flags():
+    board = Board()
+    board.load_fen(STANDARD_POSITIONS[1][1])  # kiwipete
+    codes = board.get_legal_move_codes('white')
+    assert isinstance(codes, array) and codes.typecode == 'H'
+    castles = sorted(move_to_uci(c) for c in codes if c >> 14 == FLAG_CASTLE)
+    assert castles == ['e1c1', 'e1g1']
+
+    board.load_fen("8/8/8/3pP3/8/8/8/k6K w - d6 0 2")
+    code = move_from_uci('e5d6', board)
+    assert code >> 14 == FLAG_EN_PASSANT
+    undo = board.make_move(code)
+    assert board.get_piece_at(3, 3) is None
+    board.unmake_move(undo)
+
+
+@pytest.mark.parametrize('fen,uci,san', [
+    (START_FEN, 'g1f3', 'Nf3'),
+    (STANDARD_POSITIONS[1][1], 'e1c1', 'O-O-O'),
+    (STANDARD_POSITIONS[4][1], 'd7c8q', 'dxc8=Q'),
+    (STANDARD_POSITIONS[4][1], 'b1c3', 'Nbc3'),
+    (STANDARD_POSITIONS[5][1], 'a1b1', 'Rab1'),
+    (STANDARD_POSITIONS[5][1], 'c4f7', 'Bxf7+'),
+    ("7k/8/6K1/8/8/8/8/Q7 w - - 0 1", 'a1a8', 'Qa8#'),
+])
+def test_san(fen, uci, san):
+    board = Board()
+    board.load_fen(fen)
+    code = move_from_uci(uci, board)
+    assert move_to_san(board, code) == san
+    assert move_from_san(san, board) == code
+    assert board.to_fen() == fen
+
+
+def _assert_index_matches_bitboards(board):
+    for index, pieces in enumerate(board.piece_index):
+        assert sum(1 << sq for sq in pieces) == board.piece_bb[index]
+        for sq, piece in pieces.items():
+            assert board.grid[sq >> 3][sq & 7] is piece
+    for color, ci in (('white', 0), ('black', 1)):
+        king = board.find_king(color)
+        assert king is not None and king.row * 8 + king.col == board.king_square[ci]
+
+
+@pytest.mark.parametrize('name,fen', [(name, fen) for name, fen, _ in STANDARD_POSITIONS])
+def test_piece_index_follows_moves(name, fen):
+    board = Board()
+    board.load_fen(fen)
+    for code in board.get_legal_move_codes(board.side_to_move):
+        undo = board.make_move(code)
+        _assert_index_matches_bitboards(board)
+        board.unmake_move(undo)
+    _assert_index_matches_bitboards(board)
+    assert board.count_pieces() == len(board.get_all_pieces())
+
+
+@pytest.mark.parametrize('fen,uci,value', [
+    ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", 'e1e5', 100),
+    ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", 'd3e5', -200),
+    ("4k3/8/2p5/3p4/4P3/8/8/4K3 w - - 0 1", 'e4d5', 0),
+    ("3rk3/3r4/8/3p4/8/8/3R4/3QK3 w - - 0 1", 'd2d5', -400),
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2", 'e5d6', 100),
+    ("1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1", 'a7a8q', -100),
+    ("4k3/8/8/8/8/8/4p3/3K4 w - - 0 1", 'd1e2', 100),
+])
+def test_static_exchange_evaluation(fen, uci, value):
+    board = Board()
+    board.load_fen(fen)
+    code = move_from_uci(uci, board)
+    assert see(board, code) == value
+    assert see_ge(board, code, value) and not see_ge(board, code, value + 1)
+    assert board.to_fen() == fen
+
+
+def test_attack_context_check_lines():
+    board = Board()
+    board.load_fen("4k3/8/8/b7/8/8/8/R2QK1NR w KQ - 0 1")
+    context = board.get_attack_context('white')
+    assert context.in_check
+    # a5 checker plus b4, c3, d2 between it and e1
+    squares = {3 * 8 + 0, 4 * 8 + 1, 5 * 8 + 2, 6 * 8 + 3}
+    assert all(context.blocks_check(sq) for sq in squares)
+    assert not context.blocks_check(6 * 8 + 4)
+    assert context.is_attacked(4 * 8 + 1) and context.is_defended(6 * 8 + 3)
+    assert board.get_attack_context('white') is context
+    assert not board.get_attack_context('black').in_check
+
+
+@pytest.mark.parametrize("name,fen", [(name, fen) for name, fen, _ in STANDARD_POSITIONS])
+def test_encoder_follows_moves(name, fen):
+    board = Board()
+    encoder = board.attach_encoder()
+    board.load_fen(fen)
+    start = encoder.buffer.copy()
+    assert (start == FeatureEncoder(board).buffer).all()
+    assert start[0].sum() == bin(board.occupied).count('1')
+
+    for code in board.get_legal_move_codes(board.side_to_move):
+        undo = board.make_move(code)
+        assert (encoder.buffer == FeatureEncoder(board).buffer).all()
+        board.unmake_move(undo)
+    assert (encoder.buffer == start).all()
+
+    view = encoder.array('black')
+    assert not view.flags.writeable and view.base is not None
+    sample = np.zeros_like(view)
+    encoder.write_sample(sample, 'black')
+    assert (sample == view).all()
+
+
+def test_engine_pieces_register_no_agents():
+    from pieces.agent_state import AGENTS
+
+    before = len(AGENTS)
+    board = Board()
+    for _, fen, _ in STANDARD_POSITIONS:
+        board.load_fen(fen)
+        perft(board, 2)
+        board.clone()
+    assert len(AGENTS) == before
+
+    # Agent data is created on first use and shared by copies made after that
+    piece = board.get_piece_at(board.king_square[0] >> 3, board.king_square[0] & 7)
+    piece.current_emotion = 'ANGRY'
+    assert len(AGENTS) == before + 1
+    assert piece.copy().current_emotion == 'ANGRY'
+
+
+def test_agent_id_names_the_starting_square():
+    board = Board()
+    board.load_fen(START_FEN)
+    knight = board.get_piece_at(7, 6)
+    board.move_piece(7, 6, 5, 5)
+    assert knight.agent_id is None
+    # Registered only after moving, still named after g1
+    assert knight.id == 'white_knight_7_6'
+    assert knight.copy().id == knight.id
+    knight.release_agent()
@@ -0,0 +1,110 @@
+"""
+Game logic tests
+Stage deadlines and their enforcement, proposal ranking, agent lifetime
+"""
+
+import time
+
+from ai_brain.enhanced_strategy import SmartDecisionPipeline
+from ai_brain.search import AlphaBetaSearch
+from chess_engine.board import Board
+from chess_engine.game_state import GameState
+from chess_engine.perft import STANDARD_POSITIONS, START_FEN
+from game_logic.decision_pipeline import rank_proposals
+from game_logic.game_manager import GameManager
+from game_logic.time_manager import MIN_BUDGET_FRACTION, TimeManager
+from pieces.agent_state import AGENTS
+
+
+def _board(fen):
+    board = Board()
+    board.load_fen(fen)
+    return board
+
+
+def test_budgets_follow_phase_and_headroom():
+    manager = TimeManager(move_cap=300)
+    limit = manager.limits['synthesis']
+    opening = manager.budget('synthesis', _board(START_FEN), 0)
+    middlegame = manager.budget('synthesis', _board("r4rk1/pp1b1ppp/2p5/8/8/2P2N2/PP3PPP/R4RK1 w - - 0 1"), 0)
+    endgame = manager.budget('synthesis', _board("8/8/4k3/8/8/3K4/8/8 w - - 0 1"), 0)
+    assert middlegame <= limit
+    assert opening < middlegame and endgame < middlegame
+    assert manager.budget('synthesis', None, 280) == limit / 2
+    assert manager.budget('synthesis', None, 299) == limit * MIN_BUDGET_FRACTION
+    assert manager.budget('proposals', None, 400) == manager.limits['proposals'] * MIN_BUDGET_FRACTION
+
+
+def test_call_returns_default_when_late():
+    manager = TimeManager()
+    manager.limits['validation'] = 0.05
+    deadline = manager.start('validation')
+    assert manager.call(deadline, lambda x: x * 2, 21) == 42
+    assert manager.call(deadline, time.sleep, 1, default='late') == 'late'
+    assert deadline.expired()
+    manager.finish(deadline)
+    assert manager.overruns['validation'] == 1
+
+
+def test_late_call_result_is_dropped():
+    manager = TimeManager()
+    manager.limits['synthesis'] = 0.05
+    late = manager.call(manager.start('synthesis'), lambda: time.sleep(0.2) or 'stale', default=None)
+    assert late is None
+    # The abandoned call finishing later never leaks into the next one
+    manager.limits['synthesis'] = 1.0
+    assert manager.call(manager.start('synthesis'), lambda: 'fresh') == 'fresh'
+    time.sleep(0.25)
+    assert manager.call(manager.start('synthesis'), lambda: None, default='x') is None
+
+
+def test_call_swallows_errors():
+    def fail():
+        raise RuntimeError("no network")
+
+    manager = TimeManager()
+    assert manager.call(manager.start('validation'), fail, default={'approved': True}) == {'approved': True}
+
+
+def test_search_stops_at_stage_deadline():
+    manager = TimeManager()
+    manager.limits['synthesis'] = 0.2
+    board = _board(STANDARD_POSITIONS[1][1])
+    deadline = manager.start('synthesis')
+    result = AlphaBetaSearch().search(board, time_limit_ms=deadline.remaining_ms())
+    assert result.best_move and result.depth >= 1
+    assert deadline.elapsed() < 0.6
+
+
+def test_search_move_wins_over_heuristic_argmax():
+    # Back-rank mate: the one-ply heuristics prefer a pawn push to Ra8#
+    board = _board("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+    pipeline = SmartDecisionPipeline()
+    suggestions = [pipeline.get_best_move_for_piece(piece, board, GameState())
+                   for piece in board.get_all_pieces('white')]
+    suggestions = rank_proposals([s for s in suggestions if s])
+
+    result = AlphaBetaSearch().search(board, max_depth=2)
+    from_sq, to_sq = result.best_move & 63, (result.best_move >> 6) & 63
+    piece = board.get_piece_at(from_sq >> 3, from_sq & 7)
+    searched = {'from': (piece.row, piece.col), 'to': (to_sq >> 3, to_sq & 7),
+                'score': pipeline.evaluator.evaluate_move(board, piece, (to_sq >> 3, to_sq & 7), GameState())}
+    assert result.is_mate and searched['to'] == (0, 0)
+    assert suggestions[0]['to'] != searched['to']
+
+    ranked = rank_proposals(suggestions, searched)
+    assert (ranked[0]['from'], ranked[0]['to']) == ((7, 0), (0, 0))
+    # A vetoed search move only keeps its heuristic score
+    assert rank_proposals(suggestions, searched, vetoed=True)[0] is suggestions[0]
+
+
+def test_consecutive_games_release_their_agents():
+    before = len(AGENTS)
+    for _ in range(2):
+        manager = GameManager()
+        manager.initialize_game()
+        assert len(AGENTS) == before + 32
+        manager.reset_game()
+        assert len(AGENTS) == before + 32
+        manager.cleanup()
+        assert len(AGENTS) == before